@@ -0,0 +1,516 @@
+"""
+Local b-CAP server standing in for an RC8 (benchmarks and manual tests, no robot needed).
+
+Not part of the installed package. Run from the repository root as a separate
+process, e.g. to run the SiLA server offline:
+
+    python -m benchmarks.bcap_simulator --port 5007 --task Pro1=2.0
+"""
+import argparse
+import collections
+import logging
+import queue
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from denso_rc8_server.feature_implementations.driver.pybcapclient.bcapclient import BCAPCodec
+from denso_rc8_server.feature_implementations.driver.pybcapclient.orinexception import HResult, ORiNException
+
+# ---- DENSO @STATUS codes ----
+STATUS_NON_EXISTENT = 0
+STATUS_HOLD_STOPPED = 1
+STATUS_STOPPED = 2
+STATUS_RUNNING = 3
+STATUS_STEP_STOPPED = 4
+
+
+@dataclass
+class SimTask:
+    """PAC task in the simulator; @STATUS is derived from the elapsed run time when read."""
+
+    name: str
+    duration: float = 1.0
+    step_duration: float = 0.1
+    status: int = STATUS_STOPPED
+    running_until: Optional[float] = None
+    end_status: int = STATUS_STOPPED
+    # (code, message) is pushed onto the error stack when the program ends
+    fail_with: Optional[Tuple[int, str]] = None
+
+    def current_status(self, errors: List[list]) -> int:
+        if self.status == STATUS_RUNNING and self.running_until is not None:
+            if time.monotonic() >= self.running_until:
+                self.status = self.end_status
+                self.running_until = None
+                if self.fail_with is not None:
+                    code, msg = self.fail_with
+                    errors.append([code, msg, 0, "", self.name, 1, 0])
+        return self.status
+
+
+@dataclass
+class _Fault:
+    # hresult=None -> request is swallowed (no reply -> timeout in the client)
+    hresult: Optional[int]
+    remaining: int = 1
+
+
+@dataclass
+class _Connection:
+    sock: socket.socket
+    handles: List[int] = field(default_factory=list)
+
+
+class BCAPSimulator:
+    """
+    Pure-Python b-CAP server with the function IDs the driver uses.
+
+    - Same framing as BCAPClient (same codec for requests and responses).
+    - Handles per connection; they are discarded when the connection drops.
+    - @STATUS transitions: task_start -> RUNNING, after `duration` -> STOPPED
+      (step_forward -> STEP_STOPPED), task_stop -> STOPPED / STEP_STOPPED.
+    - Error stack for GetCurErrorCount / GetCurErrorInfo / ClearError.
+    - Latency: `latency` for all calls, `latency_by_funcid` per function ID.
+      Replies are delayed like a network RTT (the connection keeps reading).
+    - Fault injection: inject_fault(), drop_connections(), go_silent(), SimTask.fail_with.
+    """
+
+    ERROR_DESCRIPTIONS: Dict[int, str] = {
+        HResult.E_HANDLE: "Invalid handle.",
+        HResult.E_INVALIDARG: "Invalid argument.",
+        HResult.E_TIMEOUT: "Timeout.",
+        HResult.E_CAO_OBJECT_NOTFOUND: "Object not found.",
+        HResult.E_NOTIMPL: "Not implemented.",
+    }
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_by_funcid: Dict[int, float] = {}
+
+        # controller variables (name -> value); unknown I/F/S/P/J/V/IO are created on access
+        self.variables: Dict[str, Any] = {}
+        self.tasks: Dict[str, SimTask] = {}
+        self.position: List[float] = [0.0] * 7
+        # error stack: [code, message, subcode, fileIdLine, programName, lineNo, fileId]
+        self.errors: List[list] = []
+
+        # calls per function ID (e.g. to count round trips in benchmarks)
+        self.call_counts: "collections.Counter[int]" = collections.Counter()
+
+        self._codec = BCAPCodec()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._handles: Dict[int, Tuple[str, Any]] = {}
+        self._next_handle = 100
+        self._faults: Dict[int, _Fault] = {}
+
+        self._server_sock: Optional[socket.socket] = None
+        self._threads: List[threading.Thread] = []
+        self._conns: List[_Connection] = []
+        self._running = False
+        # new connections are refused until this time (monotonic)
+        self._refuse_until = 0.0
+        # no request is answered until this time (monotonic)
+        self._silent_until = 0.0
+
+        self._handlers: Dict[int, Callable[[list], list]] = {
+            1: self._service_start,
+            2: self._service_stop,
+            3: self._controller_connect,
+            4: self._controller_disconnect,
+            7: self._controller_getrobot,
+            8: self._controller_gettask,
+            9: self._controller_getvariable,
+            14: self._controller_gettasknames,
+            17: self._controller_execute,
+            62: self._robot_getvariable,
+            70: self._robot_halt,
+            84: self._release,
+            85: self._task_getvariable,
+            88: self._task_start,
+            89: self._task_stop,
+            99: self._release,
+            101: self._variable_getvalue,
+            102: self._variable_putvalue,
+            111: self._release,
+        }
+
+    # ---------------------- Configuration ----------------------
+
+    def add_task(self, name: str, duration: float = 1.0, step_duration: float = 0.1) -> SimTask:
+        with self._lock:
+            task = SimTask(name=name, duration=duration, step_duration=step_duration)
+            self.tasks[name] = task
+            return task
+
+    def inject_fault(self, funcid: int, hresult: Optional[int], count: int = 1):
+        """The next `count` calls of `funcid` return `hresult` (None = no reply)."""
+        with self._lock:
+            self._faults[funcid] = _Fault(hresult=hresult, remaining=count)
+
+    def push_error(self, code: int, message: str, program: str = "", line: int = 0):
+        with self._lock:
+            self.errors.append([code, message, 0, "", program, line, 0])
+
+    def drop_connections(self, refuse_for: float = 0.0):
+        """
+        Closes all open client connections (the server keeps listening).
+        refuse_for: close new connections immediately for this long (controller "gone").
+        """
+        self._refuse_until = time.monotonic() + refuse_for
+        for conn in list(self._conns):
+            self._close(conn)
+
+    def go_silent(self, duration: float):
+        """
+        The controller answers no request for `duration` seconds
+        (connections stay open, like a powered-off RC8 behind a switch).
+        """
+        self._silent_until = time.monotonic() + duration
+
+    # ---------------------- Lifecycle ----------------------
+
+    def start(self) -> int:
+        """Starts the server thread and returns the bound port."""
+        self._server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server_sock.bind((self.host, self.port))
+        self._server_sock.listen()
+        self.port = self._server_sock.getsockname()[1]
+        self._running = True
+        self._spawn(self._accept_loop, "bcap-sim-accept")
+        logging.info("b-CAP simulator listening on %s:%d", self.host, self.port)
+        return self.port
+
+    def stop(self):
+        self._running = False
+        if self._server_sock is not None:
+            try:
+                self._server_sock.close()
+            except OSError:
+                pass
+            self._server_sock = None
+        self.drop_connections()
+        for t in self._threads:
+            t.join(timeout=1.0)
+        self._threads.clear()
+
+    def __enter__(self) -> "BCAPSimulator":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # ---------------------- Connections ----------------------
+
+    def _spawn(self, target, name: str, *args) -> threading.Thread:
+        t = threading.Thread(target=target, args=args, name=name, daemon=True)
+        self._threads = [x for x in self._threads if x.is_alive()]
+        self._threads.append(t)
+        t.start()
+        return t
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                sock, _ = self._server_sock.accept()
+            except OSError:
+                break
+            if time.monotonic() < self._refuse_until:
+                sock.close()
+                continue
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn = _Connection(sock=sock)
+            self._conns.append(conn)
+            self._spawn(self._serve_connection, "bcap-sim-conn", conn)
+
+    def _close(self, conn: _Connection):
+        try:
+            conn.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        conn.sock.close()
+        if conn in self._conns:
+            self._conns.remove(conn)
+        with self._lock:
+            # the controller releases the handles of a closed connection
+            for handle in conn.handles:
+                self._handles.pop(handle, None)
+            conn.handles.clear()
+
+    def _serve_connection(self, conn: _Connection):
+        self._local.conn = conn
+        out: "queue.Queue[Optional[Tuple[float, bytes]]]" = queue.Queue()
+        writer = self._spawn(self._write_loop, "bcap-sim-writer", conn.sock, out)
+        try:
+            while self._running:
+                frame = self._recv_frame(conn.sock)
+                if frame is None:
+                    break
+                (serial, version, funcid, args) = self._codec._deserialize(frame)
+                if time.monotonic() < self._silent_until:
+                    continue
+                due = time.monotonic() + self.latency_by_funcid.get(funcid, self.latency)
+                result = self._dispatch(funcid, args)
+                if result is None:
+                    continue
+                (hresult, retvals) = result
+                out.put((due, self._codec._serialize(serial, version, hresult, retvals)))
+        except OSError:
+            pass
+        finally:
+            out.put(None)
+            writer.join(timeout=1.0)
+            self._close(conn)
+
+    def _write_loop(self, sock: socket.socket, out: "queue.Queue[Optional[Tuple[float, bytes]]]"):
+        while True:
+            item = out.get()
+            if item is None:
+                return
+            (due, buf) = item
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                sock.sendall(buf)
+            except OSError:
+                return
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, n: int) -> Optional[bytes]:
+        chunks = []
+        while n > 0:
+            chunk = sock.recv(n)
+            if not chunk:
+                return None
+            chunks.append(chunk)
+            n -= len(chunk)
+        return b"".join(chunks)
+
+    def _recv_frame(self, sock: socket.socket) -> Optional[bytes]:
+        head = self._recv_exact(sock, 5)
+        if head is None:
+            return None
+        (len_frame,) = struct.unpack_from("<I", head, 1)
+        rest = self._recv_exact(sock, len_frame - 5)
+        if rest is None:
+            return None
+        return head + rest
+
+    # ---------------------- Dispatch ----------------------
+
+    def _dispatch(self, funcid: int, args: list) -> Optional[Tuple[int, list]]:
+        with self._lock:
+            self.call_counts[funcid] += 1
+            fault = self._faults.get(funcid)
+            if fault is not None:
+                fault.remaining -= 1
+                if fault.remaining <= 0:
+                    del self._faults[funcid]
+                if fault.hresult is None:
+                    return None
+                return fault.hresult, []
+
+            handler = self._handlers.get(funcid)
+            if handler is None:
+                return HResult.E_NOTIMPL, []
+            try:
+                return HResult.S_OK, handler(args)
+            except ORiNException as e:
+                return e.hresult, []
+            except Exception:
+                logging.exception("b-CAP simulator: funcid %d failed", funcid)
+                return HResult.E_FAIL, []
+
+    def _new_handle(self, kind: str, payload: Any) -> int:
+        handle = self._next_handle
+        self._next_handle += 1
+        self._handles[handle] = (kind, payload)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.handles.append(handle)
+        return handle
+
+    def _lookup(self, handle: Any, *kinds: str) -> Tuple[str, Any]:
+        entry = self._handles.get(handle)
+        if entry is None or entry[0] not in kinds:
+            raise ORiNException(HResult.E_HANDLE)
+        return entry
+
+    def _task(self, name: str) -> SimTask:
+        task = self.tasks.get(name)
+        if task is None:
+            raise ORiNException(HResult.E_CAO_OBJECT_NOTFOUND)
+        return task
+
+    @staticmethod
+    def _default_value(name: str) -> Any:
+        for prefix, value in (("IO", 0), ("I", 0), ("F", 0.0), ("S", ""),
+                              ("P", [0.0] * 7), ("J", [0.0] * 8), ("V", [0.0] * 3)):
+            if name.startswith(prefix) and name[len(prefix):].isdigit():
+                return value
+        raise ORiNException(HResult.E_CAO_OBJECT_NOTFOUND)
+
+    # ---------------------- Function IDs: service / controller ----------------------
+
+    def _service_start(self, args: list) -> list:
+        return []
+
+    def _service_stop(self, args: list) -> list:
+        return []
+
+    def _controller_connect(self, args: list) -> list:
+        return [self._new_handle("controller", None)]
+
+    def _controller_disconnect(self, args: list) -> list:
+        return self._release(args)
+
+    def _controller_getrobot(self, args: list) -> list:
+        self._lookup(args[0], "controller")
+        return [self._new_handle("robot", args[1])]
+
+    def _controller_gettask(self, args: list) -> list:
+        self._lookup(args[0], "controller")
+        return [self._new_handle("task", self._task(args[1]).name)]
+
+    def _controller_getvariable(self, args: list) -> list:
+        self._lookup(args[0], "controller")
+        name = args[1]
+        if name not in ("@ERROR_CODE", "@ERROR_DESCRIPTION") and name not in self.variables:
+            self.variables[name] = self._default_value(name)
+        return [self._new_handle("variable", name)]
+
+    def _controller_gettasknames(self, args: list) -> list:
+        self._lookup(args[0], "controller")
+        return [list(self.tasks.keys())]
+
+    def _controller_execute(self, args: list) -> list:
+        self._lookup(args[0], "controller")
+        command, param = args[1], args[2]
+        for task in self.tasks.values():
+            task.current_status(self.errors)
+
+        if command == "GetCurErrorCount":
+            return [len(self.errors)]
+        if command == "GetCurErrorInfo":
+            index = int(param or 0)
+            if index >= len(self.errors):
+                raise ORiNException(HResult.E_INVALIDARG)
+            return [list(self.errors[index])]
+        if command == "ClearError":
+            self.errors.clear()
+            return []
+        if command == "GetErrorDescription":
+            return [self.ERROR_DESCRIPTIONS.get(int(param), f"Error 0x{int(param) & 0xFFFFFFFF:08X}")]
+        raise ORiNException(HResult.E_INVALID_CMD_NAME)
+
+    # ---------------------- Function IDs: robot / task ----------------------
+
+    def _robot_getvariable(self, args: list) -> list:
+        self._lookup(args[0], "robot")
+        if args[1] != "@CURRENT_POSITION":
+            raise ORiNException(HResult.E_CAO_OBJECT_NOTFOUND)
+        return [self._new_handle("robot_variable", args[1])]
+
+    def _robot_halt(self, args: list) -> list:
+        self._lookup(args[0], "robot")
+        for task in self.tasks.values():
+            if task.current_status(self.errors) == STATUS_RUNNING:
+                task.status = STATUS_HOLD_STOPPED
+                task.running_until = None
+        return []
+
+    def _task_getvariable(self, args: list) -> list:
+        (_, name) = self._lookup(args[0], "task")
+        if args[1] != "@STATUS":
+            raise ORiNException(HResult.E_CAO_OBJECT_NOTFOUND)
+        return [self._new_handle("task_status", name)]
+
+    def _task_start(self, args: list) -> list:
+        (_, name) = self._lookup(args[0], "task")
+        task = self._task(name)
+        mode = int(args[1])
+        task.status = STATUS_RUNNING
+        if mode == 2:  # continuous
+            task.running_until = None
+            task.end_status = STATUS_STOPPED
+        elif mode == 3:  # step_forward
+            task.running_until = time.monotonic() + task.step_duration
+            task.end_status = STATUS_STEP_STOPPED
+        else:  # one_cycle
+            task.running_until = time.monotonic() + task.duration
+            task.end_status = STATUS_STOPPED
+        return []
+
+    def _task_stop(self, args: list) -> list:
+        (_, name) = self._lookup(args[0], "task")
+        task = self._task(name)
+        if task.current_status(self.errors) == STATUS_RUNNING:
+            task.status = STATUS_STEP_STOPPED if int(args[1]) == 2 else STATUS_STOPPED
+            task.running_until = None
+        return []
+
+    # ---------------------- Function IDs: variable ----------------------
+
+    def _variable_getvalue(self, args: list) -> list:
+        (kind, name) = self._lookup(args[0], "variable", "task_status", "robot_variable")
+        if kind == "task_status":
+            return [self._task(name).current_status(self.errors)]
+        if kind == "robot_variable":
+            return [list(self.position)]
+        if name == "@ERROR_CODE":
+            return [self.errors[-1][0] if self.errors else 0]
+        if name == "@ERROR_DESCRIPTION":
+            return [self.errors[-1][1] if self.errors else ""]
+        return [self.variables[name]]
+
+    def _variable_putvalue(self, args: list) -> list:
+        (kind, name) = self._lookup(args[0], "variable")
+        if name.startswith("@"):
+            raise ORiNException(HResult.E_CAO_NOT_WRITABLE)
+        self.variables[name] = args[1]
+        return []
+
+    def _release(self, args: list) -> list:
+        if self._handles.pop(args[0], None) is None:
+            raise ORiNException(HResult.E_HANDLE)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and args[0] in conn.handles:
+            conn.handles.remove(args[0])
+        return []
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local b-CAP controller simulator (RC8 stand-in)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=5007)
+    ap.add_argument("--latency", type=float, default=0.0, help="response delay per call [s]")
+    ap.add_argument("--task", action="append", default=[], help="NAME[=DURATION_S], can be repeated")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sim = BCAPSimulator(host=args.host, port=args.port, latency=args.latency)
+    for spec in args.task or ["Pro1", "Pro2"]:
+        name, _, duration = spec.partition("=")
+        sim.add_task(name, duration=float(duration) if duration else 1.0)
+
+    sim.start()
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: how long callers stay blocked behind a slow controller call, with
+and without a per-call deadline.
+
+Starts the local simulator with --slow seconds latency for Variable_GetValue,
+lets --threads threads call get_I_value() on one b-CAP session at the same
+time and prints how long each caller was blocked. With --deadline every call
+runs inside bcapclient.call_deadline(now + deadline), as the SiLA handlers do
+with the gRPC deadline of the client.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_call_deadline
+    python -m benchmarks.bench_call_deadline --slow 2.0 --deadline 0.25
+"""
+import argparse
+import threading
+import time
+from typing import List, Optional
+
+from benchmarks.bcap_simulator import BCAPSimulator
+from denso_rc8_server.feature_implementations.driver.denso_rc8_controller import DensoRC8Controller
+from denso_rc8_server.feature_implementations.driver.pybcapclient.bcapclient import call_deadline
+
+_FUNC_VARIABLE_GETVALUE = 101
+
+
+def _run(sim: BCAPSimulator, threads: int, slow: float, deadline: Optional[float], timeout: int) -> List[float]:
+    ctrl = DensoRC8Controller(sessions=1)
+    ctrl.configure_connection("127.0.0.1", sim.port, timeout)
+    ctrl.start()
+    blocked: List[float] = []
+    lock = threading.Lock()
+
+    def _call(index: int):
+        t0 = time.monotonic()
+        try:
+            with call_deadline(t0 + deadline if deadline is not None else None):
+                ctrl.get_I_value(index)
+        except Exception:
+            pass
+        with lock:
+            blocked.append(time.monotonic() - t0)
+
+    try:
+        # Variablen-Handles vorab holen, danach ist nur Variable_GetValue langsam
+        for i in range(threads):
+            ctrl.get_I_value(i)
+        sim.latency_by_funcid[_FUNC_VARIABLE_GETVALUE] = slow
+        workers = [threading.Thread(target=_call, args=(i,)) for i in range(threads)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        return sorted(blocked)
+    finally:
+        ctrl.stop()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Per-call deadlines (local simulator)")
+    ap.add_argument("--threads", type=int, default=8, help="concurrent callers on one session")
+    ap.add_argument("--slow", type=float, default=0.5, help="latency of Variable_GetValue [s]")
+    ap.add_argument("--deadline", type=float, default=0.2, help="per-call deadline [s]")
+    ap.add_argument("--timeout", type=int, default=5, help="b-CAP timeout [s]")
+    args = ap.parse_args()
+
+    print(f"{'mode':<12}{'p50 [s]':>10}{'max [s]':>10}{'total [thread-s]':>18}")
+    for label, deadline in (("no deadline", None), ("deadline", args.deadline)):
+        with BCAPSimulator() as sim:
+            blocked = _run(sim, args.threads, args.slow, deadline, args.timeout)
+        print(f"{label:<12}{blocked[len(blocked) // 2]:10.2f}{blocked[-1]:10.2f}{sum(blocked):18.2f}")
+
+
+if __name__ == "__main__":
+    main()
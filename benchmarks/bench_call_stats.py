@@ -0,0 +1,94 @@
+"""
+Benchmark: cost of the per-call statistics in BCAPClient and what they show.
+
+Starts the local simulator and lets --threads threads read variables over one
+BCAPClient, once with statistics disabled and once with enable_stats(), for
+the sequential and the pipelined client. Prints the time per call in both
+modes and the per-function-ID table of the enabled runs (count, errors, bytes,
+latency percentiles and how the time splits into lock wait, codec and RTT).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_call_stats
+    python -m benchmarks.bench_call_stats --latency 0.002 --requests 2000
+"""
+import argparse
+import threading
+import time
+from typing import Optional
+
+from benchmarks.bcap_simulator import BCAPSimulator
+from denso_rc8_server.feature_implementations.driver.pybcapclient.bcapclient import BCAPClient
+from denso_rc8_server.feature_implementations.driver.pybcapclient.callstats import BCAPCallStats
+
+
+def _run(port: int, requests: int, threads: int, stats: Optional[BCAPCallStats], window: Optional[int]) -> float:
+    bcap = BCAPClient(host="127.0.0.1", port=port, timeout=5)
+    bcap.service_start("")
+    h_ctrl = bcap.controller_connect("", "CaoProv.DENSO.VRC", "localhost", "")
+    handles = [bcap.controller_getvariable(h_ctrl, f"I{i}", "") for i in range(threads)]
+    if stats is not None:
+        bcap.enable_stats(stats)
+    if window is not None:
+        bcap.start_pipeline(window=window)
+    per_thread = requests // threads
+
+    def _load(index: int):
+        for _ in range(per_thread):
+            bcap.variable_getvalue(handles[index])
+
+    workers = [threading.Thread(target=_load, args=(i,)) for i in range(threads)]
+    try:
+        t0 = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        return (time.perf_counter() - t0) / (per_thread * threads)
+    finally:
+        if window is not None:
+            bcap.stop_pipeline()
+        for h in handles:
+            bcap.variable_release(h)
+        bcap.controller_disconnect(h_ctrl)
+        bcap.service_stop()
+
+
+def _print_table(snapshot: dict) -> None:
+    print(f"{'function':<22}{'count':>7}{'err':>5}{'tx [B]':>9}{'rx [B]':>9}"
+          f"{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}{'lock':>8}{'codec':>8}{'rtt':>8}  [ms]")
+    for funcid, row in sorted(snapshot.items()):
+        lat = row["latency_ms"]
+        # lock_wait_ms/encode_ms/decode_ms are totals; shown per call here
+        lock = row["lock_wait_ms"] / row["count"]
+        codec = (row["encode_ms"] + row["decode_ms"]) / row["count"]
+        print(f"{row['name']:<22}{row['count']:>7}{row['errors']:>5}{row['bytes_sent']:>9}{row['bytes_received']:>9}"
+              f"{lat['p50_ms']:8.3f}{lat['p90_ms']:8.3f}{lat['p99_ms']:8.3f}{lat['max_ms']:8.3f}"
+              f"{lock:8.3f}{codec:8.3f}{row['rtt_ms']['mean_ms']:8.3f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Per-call statistics overhead (local simulator)")
+    ap.add_argument("--latency", type=float, default=0.0, help="simulated RTT per request [s]")
+    ap.add_argument("--requests", type=int, default=5000, help="variable reads per run")
+    ap.add_argument("--threads", type=int, default=4, help="concurrent callers")
+    ap.add_argument("--window", type=int, default=16, help="pipeline window")
+    args = ap.parse_args()
+
+    print(f"{'client':<12}{'off [us/call]':>15}{'on [us/call]':>15}{'overhead':>10}")
+    tables = {}
+    for label, window in (("sequential", None), ("pipelined", args.window)):
+        stats = BCAPCallStats()
+        with BCAPSimulator(latency=args.latency) as sim:
+            off = _run(sim.port, args.requests, args.threads, None, window)
+            on = _run(sim.port, args.requests, args.threads, stats, window)
+        tables[label] = stats.snapshot()
+        print(f"{label:<12}{off * 1e6:15.1f}{on * 1e6:15.1f}{(on / off - 1) * 100:9.1f}%")
+
+    for label, snapshot in tables.items():
+        print(f"\n{label}:")
+        _print_table(snapshot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: caller threads during a controller outage, with and without the
+circuit breaker.
+
+Starts the local simulator, lets --load-threads threads (standing in for gRPC
+workers) call get_I_value() and then makes the simulator stop answering for
+--outage seconds (connections stay open, like a powered-off RC8). Every call
+is timed, successful or not. Prints per mode, for the calls that overlap the
+outage window, how many took longer than 50 ms ("slow", whether they waited
+for the b-CAP timeout or for the session lock held by such a call) and how
+many returned sooner, the thread time spent inside calls during the outage
+(sum over all calls of their wall time clipped to the window; at most
+threads x outage) and how long it took after the outage until calls
+succeeded again.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_circuit_breaker
+    python -m benchmarks.bench_circuit_breaker --outage 10 --timeout 2
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.bcap_simulator import BCAPSimulator
+from denso_rc8_server.feature_implementations.driver.denso_rc8_controller import DensoRC8Controller
+
+_FAST_S = 0.05
+
+
+def _run(port: int, sim: BCAPSimulator, breaker: bool, load_threads: int, outage: float, timeout: int) -> dict:
+    ctrl = DensoRC8Controller(sessions=2, auto_reconnect=breaker)
+    ctrl.configure_connection("127.0.0.1", port, timeout)
+    ctrl.start()
+    done = threading.Event()
+    lock = threading.Lock()
+    calls = []  # (start, end, ok) of every call
+    recovered = threading.Event()
+    outage_end = [float("inf")]
+
+    def _load(index: int):
+        while not done.is_set():
+            t0 = time.monotonic()
+            try:
+                ctrl.get_I_value(index)
+                ok = True
+            except Exception:
+                ok = False
+            t1 = time.monotonic()
+            with lock:
+                calls.append((t0, t1, ok))
+            if ok and t0 >= outage_end[0]:
+                recovered.set()
+            if not ok:
+                time.sleep(0.01)
+
+    workers = [threading.Thread(target=_load, args=(i,), daemon=True) for i in range(load_threads)]
+    for w in workers:
+        w.start()
+    try:
+        time.sleep(0.5)
+        outage_start = time.monotonic()
+        sim.go_silent(outage)
+        outage_end[0] = outage_start + outage
+        recovered.wait(outage + 30)
+    finally:
+        done.set()
+        for w in workers:
+            w.join(timeout=timeout + 1)
+        ctrl.stop()
+
+    # evaluate after the join so that calls running past the end of the outage count too
+    stats = {"fast": 0, "slow": 0, "blocked_s": 0.0, "first_ok_after_outage": None}
+    for t0, t1, ok in calls:
+        if ok and t0 >= outage_end[0]:
+            after = t1 - outage_end[0]
+            if stats["first_ok_after_outage"] is None or after < stats["first_ok_after_outage"]:
+                stats["first_ok_after_outage"] = after
+        if t1 <= outage_start or t0 >= outage_end[0]:
+            continue
+        stats["blocked_s"] += min(t1, outage_end[0]) - max(t0, outage_start)
+        stats["slow" if t1 - t0 >= _FAST_S else "fast"] += 1
+    return stats
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Circuit breaker during a controller outage (local simulator)")
+    ap.add_argument("--latency", type=float, default=0.001, help="simulated RTT per request [s]")
+    ap.add_argument("--load-threads", type=int, default=8, help="threads reading variables")
+    ap.add_argument("--outage", type=float, default=5.0, help="simulator silent for [s]")
+    ap.add_argument("--timeout", type=int, default=1, help="b-CAP timeout [s]")
+    args = ap.parse_args()
+
+    print(f"{'mode':<10}{'slow':>6}{'fast':>8}{'in calls [thread-s]':>21}{'recovered after [s]':>21}")
+    for label, breaker in (("off", False), ("breaker", True)):
+        with BCAPSimulator(latency=args.latency) as sim:
+            st = _run(sim.port, sim, breaker, args.load_threads, args.outage, args.timeout)
+        rec = st["first_ok_after_outage"]
+        rec_s = f"{rec:.2f}" if rec is not None else "never"
+        print(f"{label:<10}{st['slow']:>6}{st['fast']:>8}{st['blocked_s']:21.1f}{rec_s:>21}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: offset-based memoryview decoder vs. the previous copy-per-value decoder.
+
+Builds b-CAP response frames from 10 B up to 10 MB for a few typical payload
+shapes (VT_VARIANT arrays like GetCurErrorInfo, BSTR arrays, VT_R8 arrays,
+raw VT_UI1 byte arrays), decodes them with both implementations and checks that
+the results are identical.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_deserialize
+    python -m benchmarks.bench_deserialize --legacy-limit 1000000
+
+The legacy decoder (benchmarks/legacy_decoder.py, taken unchanged from the
+baseline commit) copies the remaining buffer for every value (O(n^2)), so it is
+only run up to --legacy-limit bytes per frame.
+"""
+import argparse
+import time
+from typing import Callable, List, Tuple
+
+from benchmarks.legacy_decoder import LegacyCodec
+from denso_rc8_server.feature_implementations.driver.pybcapclient.bcapclient import BCAPCodec
+from denso_rc8_server.feature_implementations.driver.pybcapclient.orinexception import HResult
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+
+# ---------------------- Payloads ----------------------
+
+def _error_info_like(n_bytes: int) -> list:
+    # [code, message, subcode, fileIdLine, programName, lineNo, fileId], repeated
+    item = [-2147483132, "Object not found", 0, "pro1.pcs", "Pro1", 12, 3]
+    approx = 6 + 7 * 20 + 40
+    return item * max(1, n_bytes // approx)
+
+
+def _bstr_array(n_bytes: int) -> list:
+    return ["I%d" % i for i in range(max(1, n_bytes // 12))]
+
+
+def _r8_array(n_bytes: int) -> list:
+    return [float(i) * 0.5 for i in range(max(1, n_bytes // 8))]
+
+
+def _ui1_array(n_bytes: int) -> bytes:
+    return bytes(i & 0xFF for i in range(max(1, n_bytes)))
+
+
+PAYLOADS: List[Tuple[str, Callable[[int], object]]] = [
+    ("variant_array", _error_info_like),
+    ("bstr_array", _bstr_array),
+    ("r8_array", _r8_array),
+    ("ui1_array", _ui1_array),
+]
+
+
+def _frame(codec: BCAPCodec, value) -> bytes:
+    # response frame: the HRESULT (S_OK) takes the place of the function ID
+    return codec._serialize(1, 0, HResult.S_OK, [value])
+
+
+def _time(fn: Callable[[], object], min_time: float = 0.2) -> float:
+    loops = 0
+    t0 = time.perf_counter()
+    while True:
+        fn()
+        loops += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time:
+            return elapsed / loops
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="b-CAP decoder benchmark (memoryview vs. legacy)")
+    ap.add_argument("--legacy-limit", type=int, default=100_000, help="max. frame size for the legacy decoder")
+    ap.add_argument("--min-time", type=float, default=0.2, help="min. measuring time per case [s]")
+    args = ap.parse_args()
+
+    codec = BCAPCodec()
+    legacy = LegacyCodec()
+    print(f"{'payload':<14}{'target':>10}{'frame':>11}{'new [ms]':>12}{'legacy [ms]':>13}{'speedup':>9}")
+    for name, make in PAYLOADS:
+        for size in SIZES:
+            frame = _frame(codec, make(size))
+            t_new = _time(lambda: codec._deserialize(frame), args.min_time)
+
+            if len(frame) <= args.legacy_limit:
+                if legacy._deserialize(frame) != codec._deserialize(frame):
+                    raise SystemExit(f"Decoder mismatch for {name}/{size}")
+                t_old = _time(lambda: legacy._deserialize(frame), args.min_time)
+                legacy_txt = f"{t_old * 1e3:13.3f}"
+                speedup_txt = f"{t_old / t_new:8.1f}x"
+            else:
+                legacy_txt = f"{'skipped':>13}"
+                speedup_txt = f"{'-':>9}"
+
+            print(f"{name:<14}{size:>10}{len(frame):>11}{t_new * 1e3:12.3f}{legacy_txt}{speedup_txt}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: sequential vs. pipelined b-CAP requests against the local simulator.
+
+Reads N variable handles once with one request in flight at a time, then with
+BCAPClient.start_pipeline(window) and submit() for several window sizes. The
+simulator answers every request after --latency seconds, like a network RTT.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --latency 0.005 --requests 500
+"""
+import argparse
+import time
+
+from benchmarks.bcap_simulator import BCAPSimulator
+from denso_rc8_server.feature_implementations.driver.pybcapclient.bcapclient import BCAPClient
+
+_FUNC_VARIABLE_GETVALUE = 101
+
+
+def _connect(port: int) -> BCAPClient:
+    bcap = BCAPClient(host="127.0.0.1", port=port, timeout=5)
+    bcap.service_start("")
+    return bcap
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="b-CAP pipelining benchmark (local simulator)")
+    ap.add_argument("--latency", type=float, default=0.002, help="simulated RTT per request [s]")
+    ap.add_argument("--requests", type=int, default=200, help="variable reads per run")
+    ap.add_argument("--windows", type=str, default="1,4,16,64", help="comma separated window sizes")
+    args = ap.parse_args()
+
+    with BCAPSimulator(latency=args.latency) as sim:
+        bcap = _connect(sim.port)
+        h_ctrl = bcap.controller_connect("", "CaoProv.DENSO.VRC", "localhost", "")
+        handles = [bcap.controller_getvariable(h_ctrl, f"I{i}", "") for i in range(args.requests)]
+        for i, h in enumerate(handles):
+            bcap.variable_putvalue(h, i)
+
+        t0 = time.perf_counter()
+        seq = [bcap.variable_getvalue(h) for h in handles]
+        t_seq = time.perf_counter() - t0
+        print(f"{'mode':<16}{'total [ms]':>12}{'per call [us]':>15}{'speedup':>9}")
+        print(f"{'sequential':<16}{t_seq * 1e3:12.1f}{t_seq / len(handles) * 1e6:15.1f}{1.0:8.1f}x")
+
+        for window in (int(w) for w in args.windows.split(",")):
+            bcap.start_pipeline(window=window)
+            try:
+                t0 = time.perf_counter()
+                futures = [bcap.submit(_FUNC_VARIABLE_GETVALUE, [h]) for h in handles]
+                values = [f.result()[0] for f in futures]
+                t_pipe = time.perf_counter() - t0
+            finally:
+                bcap.stop_pipeline()
+            if values != seq:
+                raise SystemExit(f"pipelined results differ for window={window}")
+            print(
+                f"{'window=' + str(window):<16}{t_pipe * 1e3:12.1f}"
+                f"{t_pipe / len(handles) * 1e6:15.1f}{t_seq / t_pipe:8.1f}x"
+            )
+
+        for h in handles:
+            bcap.variable_release(h)
+        bcap.service_stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: recovery after the controller connection drops.
+
+Starts the local simulator, lets --load-threads threads call get_I_value()
+and then repeatedly drops all b-CAP connections (new connections are refused
+for --outage seconds). For every outage it prints how long the controller
+needed to reconnect and how the callers failed in the meantime: fast
+ReconnectingError rejections vs. slow failures (timeouts, closed sockets).
+After each reconnect the rehydrated task and @STATUS handles are checked by
+starting Pro1 and waiting for the status hub to report it. The exit code is 1
+if a handle check fails or the controller does not reconnect within
+--outage + 30 s.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_reconnect
+    python -m benchmarks.bench_reconnect --outage 2.0 --drops 3
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.bcap_simulator import BCAPSimulator
+from denso_rc8_server.feature_implementations.driver.denso_rc8_controller import (
+    DensoRC8Controller,
+    ReconnectingError,
+)
+
+_FAST_S = 0.05
+
+
+def _verify_handles(ctrl: DensoRC8Controller, timeout: float) -> bool:
+    seq, _ = ctrl.status_hub.latest("Pro1")
+    ctrl.start_program("Pro1", "one_cycle")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        sample = ctrl.status_hub.wait_for("Pro1", seq, timeout=deadline - time.monotonic())
+        if sample is None:
+            return False
+        seq, status = sample
+        if status == 3:
+            return True
+    return False
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Reconnect after connection loss (local simulator)")
+    ap.add_argument("--latency", type=float, default=0.001, help="simulated RTT per request [s]")
+    ap.add_argument("--load-threads", type=int, default=4, help="threads reading variables")
+    ap.add_argument("--drops", type=int, default=5, help="number of connection drops")
+    ap.add_argument("--outage", type=float, default=1.0, help="refuse new connections for [s]")
+    ap.add_argument("--timeout", type=int, default=5, help="b-CAP timeout [s]")
+    args = ap.parse_args()
+
+    with BCAPSimulator(latency=args.latency) as sim:
+        sim.add_task("Pro1", duration=0.2)
+        ctrl = DensoRC8Controller(sessions=2)
+        ctrl.configure_connection("127.0.0.1", sim.port, args.timeout)
+        ctrl.start()
+        ctrl.get_program("Pro1")
+
+        done = threading.Event()
+        lock = threading.Lock()
+        counts = {"ok": 0, "fast": 0, "slow": 0}
+
+        def _load(index: int):
+            while not done.is_set():
+                t0 = time.perf_counter()
+                try:
+                    ctrl.get_I_value(index)
+                    key = "ok"
+                except ReconnectingError:
+                    key = "fast" if time.perf_counter() - t0 < _FAST_S else "slow"
+                    time.sleep(0.01)
+                except Exception as e:
+                    ctrl.note_failure(e)
+                    key = "slow"
+                with lock:
+                    counts[key] += 1
+
+        workers = [threading.Thread(target=_load, args=(i,), daemon=True) for i in range(args.load_threads)]
+        for w in workers:
+            w.start()
+
+        failures = []
+        print(f"{'drop':>4}{'recovery [s]':>14}{'attempts':>10}{'fast':>8}{'slow':>8}{'handles':>9}")
+        try:
+            for i in range(args.drops):
+                time.sleep(0.3)
+                with lock:
+                    for key in counts:
+                        counts[key] = 0
+                before = ctrl.reconnects
+                t0 = time.perf_counter()
+                sim.drop_connections(refuse_for=args.outage)
+                while ctrl.reconnects == before and time.perf_counter() - t0 < args.outage + 30:
+                    time.sleep(0.005)
+                recovery = time.perf_counter() - t0
+                if ctrl.reconnects == before:
+                    failures.append(f"drop {i + 1}: no reconnect within {recovery:.0f} s")
+                    print(f"{i + 1:>4}{'-':>14}{ctrl.reconnect_stats()['attempts']:>10}{'-':>8}{'-':>8}{'-':>9}")
+                    break
+                attempts = ctrl.reconnect_stats()["attempts"]
+                with lock:
+                    fast, slow = counts["fast"], counts["slow"]
+                ok = _verify_handles(ctrl, timeout=args.timeout)
+                if not ok:
+                    failures.append(f"drop {i + 1}: Pro1 not reported RUNNING after reconnect")
+                print(f"{i + 1:>4}{recovery:14.2f}{attempts:>10}{fast:>8}{slow:>8}{'ok' if ok else 'FAIL':>9}")
+        finally:
+            done.set()
+            for w in workers:
+                w.join()
+            ctrl.stop()
+
+    if failures:
+        raise SystemExit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: concurrent variable reads through DensoRC8Controller with 1..N b-CAP sessions.
+
+Starts the local simulator with a per-request latency, connects a controller
+with --sessions parallel b-CAP sessions and lets --threads reader threads call
+get_I_value() concurrently (like several SiLA clients polling a dashboard).
+With one session every call queues behind the same socket lock; with more
+sessions the reads are routed to the least-loaded connection.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_session_pool
+    python -m benchmarks.bench_session_pool --latency 0.005 --threads 16 --sessions 1,2,4,8
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.bcap_simulator import BCAPSimulator
+from denso_rc8_server.feature_implementations.driver.denso_rc8_controller import DensoRC8Controller
+
+
+def _run(port: int, sessions: int, threads: int, reads: int) -> float:
+    ctrl = DensoRC8Controller(sessions=sessions)
+    ctrl.configure_connection("127.0.0.1", port, 5)
+    ctrl.start()
+    try:
+        barrier = threading.Barrier(threads + 1)
+
+        def _reader(index: int):
+            barrier.wait()
+            for _ in range(reads):
+                ctrl.get_I_value(index)
+
+        workers = [threading.Thread(target=_reader, args=(i,)) for i in range(threads)]
+        for w in workers:
+            w.start()
+        barrier.wait()
+        t0 = time.perf_counter()
+        for w in workers:
+            w.join()
+        return time.perf_counter() - t0
+    finally:
+        ctrl.stop()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="b-CAP session pool benchmark (local simulator)")
+    ap.add_argument("--latency", type=float, default=0.002, help="simulated RTT per request [s]")
+    ap.add_argument("--threads", type=int, default=8, help="concurrent reader threads")
+    ap.add_argument("--reads", type=int, default=25, help="get_I_value() calls per thread")
+    ap.add_argument("--sessions", type=str, default="1,2,4,8", help="comma separated pool sizes")
+    args = ap.parse_args()
+
+    total = args.threads * args.reads
+    with BCAPSimulator(latency=args.latency) as sim:
+        print(f"{'sessions':<10}{'total [ms]':>12}{'reads/s':>10}{'speedup':>9}")
+        t_first = None
+        for sessions in (int(s) for s in args.sessions.split(",")):
+            elapsed = _run(sim.port, sessions, args.threads, args.reads)
+            t_first = t_first or elapsed
+            print(f"{sessions:<10}{elapsed * 1e3:12.1f}{total / elapsed:10.0f}{t_first / elapsed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
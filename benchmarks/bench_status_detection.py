@@ -0,0 +1,101 @@
+"""
+Benchmark: how fast the task status hub notices a finished program.
+
+Runs a short program (random length) on the local simulator several times and
+measures the time from the simulated program end to the first hub sample that
+shows the end state ("first") and to the third one ("confirmed", what
+StartProgram waits for). Compares a fixed 100 ms poll interval (the former
+behaviour) with the adaptive scheduler, and counts @STATUS reads while nothing
+is running.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_status_detection
+    python -m benchmarks.bench_status_detection --duration 0.5 --runs 20
+"""
+import argparse
+import random
+import time
+
+from benchmarks.bcap_simulator import BCAPSimulator
+from denso_rc8_server.feature_implementations.driver.denso_rc8_controller import DensoRC8Controller
+from denso_rc8_server.feature_implementations.driver.task_status_hub import TaskStatusHub
+
+_FUNC_VARIABLE_GETVALUE = 101
+STATUS_RUNNING = 3
+CONFIRM_SAMPLES = 3
+
+
+def _run(sim: BCAPSimulator, hub_kwargs: dict, duration: float, runs: int, idle: float, seed: int) -> dict:
+    ctrl = DensoRC8Controller(sessions=1)
+    ctrl.status_hub = TaskStatusHub(ctrl, **hub_kwargs)
+    ctrl.configure_connection("127.0.0.1", sim.port, 5)
+    ctrl.start()
+    try:
+        ctrl.get_program("Pro1")
+        hub = ctrl.status_hub
+        rng = random.Random(seed)
+        first, confirmed = [], []
+        for _ in range(runs):
+            run_duration = duration * (1.0 + rng.random())
+            sim.tasks["Pro1"].duration = run_duration
+            seq, _ = hub.latest("Pro1")
+            ctrl.start_program("Pro1", "one_cycle")
+            t_end = time.monotonic() + run_duration
+            end_samples = 0
+            while end_samples < CONFIRM_SAMPLES:
+                sample = hub.wait_for("Pro1", seq, timeout=5.0)
+                if sample is None:
+                    raise SystemExit("status hub stopped delivering samples")
+                seq, status = sample
+                if status == STATUS_RUNNING or time.monotonic() < t_end:
+                    continue
+                end_samples += 1
+                if end_samples == 1:
+                    first.append(time.monotonic() - t_end)
+            confirmed.append(time.monotonic() - t_end)
+
+        # Last im Leerlauf
+        time.sleep(idle / 2)
+        before = sim.call_counts[_FUNC_VARIABLE_GETVALUE]
+        time.sleep(idle)
+        idle_reads = (sim.call_counts[_FUNC_VARIABLE_GETVALUE] - before) / idle
+    finally:
+        ctrl.stop()
+
+    first.sort()
+    confirmed.sort()
+    return {
+        "first_p50_ms": first[len(first) // 2] * 1e3,
+        "first_max_ms": first[-1] * 1e3,
+        "confirmed_p50_ms": confirmed[len(confirmed) // 2] * 1e3,
+        "idle_reads_per_s": idle_reads,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Task status detection latency (local simulator)")
+    ap.add_argument("--latency", type=float, default=0.001, help="simulated RTT per request [s]")
+    ap.add_argument("--duration", type=float, default=0.3, help="min. program duration, up to 2x [s]")
+    ap.add_argument("--runs", type=int, default=20, help="program runs per mode")
+    ap.add_argument("--idle", type=float, default=3.0, help="idle measuring time [s]")
+    ap.add_argument("--seed", type=int, default=1, help="seed for the program durations")
+    args = ap.parse_args()
+
+    modes = [
+        ("fixed 100 ms", dict(fast_interval=0.1, busy_interval=0.1, idle_interval=0.1, fast_cycles=0)),
+        ("adaptive", dict()),
+    ]
+    with BCAPSimulator(latency=args.latency) as sim:
+        sim.add_task("Pro1", duration=args.duration)
+        print(f"{'mode':<14}{'first p50':>10}{'first max':>10}{'confirmed p50':>15}{'idle reads/s':>14}")
+        for label, hub_kwargs in modes:
+            st = _run(sim, hub_kwargs, args.duration, args.runs, args.idle, args.seed)
+            print(
+                f"{label:<14}{st['first_p50_ms']:8.1f}ms{st['first_max_ms']:8.1f}ms"
+                f"{st['confirmed_p50_ms']:13.1f}ms{st['idle_reads_per_s']:14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: StopProgram latency while the controller is busy with other calls.
+
+Starts the local simulator with a per-request latency, lets --load-threads
+threads hammer get_I_value() on a single b-CAP session and issues
+stop_program() every --interval seconds. Runs once with the reserved stop
+session (priority lane) and once without it, and prints the latency figures
+from DensoRC8Controller.stop_latency_stats().
+
+Run from the repository root:
+
+    python -m benchmarks.bench_stop_latency
+    python -m benchmarks.bench_stop_latency --latency 0.005 --load-threads 16
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.bcap_simulator import BCAPSimulator
+from denso_rc8_server.feature_implementations.driver.denso_rc8_controller import DensoRC8Controller
+
+
+def _run(port: int, stop_session: bool, load_threads: int, stops: int, interval: float) -> dict:
+    ctrl = DensoRC8Controller(sessions=1, stop_session=stop_session)
+    ctrl.configure_connection("127.0.0.1", port, 5)
+    ctrl.start()
+    ctrl.get_program("Pro1")
+    done = threading.Event()
+
+    def _load(index: int):
+        while not done.is_set():
+            ctrl.get_I_value(index)
+
+    workers = [threading.Thread(target=_load, args=(i,), daemon=True) for i in range(load_threads)]
+    for w in workers:
+        w.start()
+    try:
+        time.sleep(interval)
+        for _ in range(stops):
+            ctrl.start_program("Pro1", "continuous")
+            ctrl.stop_program("Pro1", "instant_stop")
+            time.sleep(interval)
+        return ctrl.stop_latency_stats()
+    finally:
+        done.set()
+        for w in workers:
+            w.join()
+        ctrl.stop()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Stop latency under load (local simulator)")
+    ap.add_argument("--latency", type=float, default=0.002, help="simulated RTT per request [s]")
+    ap.add_argument("--load-threads", type=int, default=8, help="threads reading variables")
+    ap.add_argument("--stops", type=int, default=30, help="stop_program() calls per run")
+    ap.add_argument("--interval", type=float, default=0.02, help="pause between stops [s]")
+    args = ap.parse_args()
+
+    with BCAPSimulator(latency=args.latency) as sim:
+        sim.add_task("Pro1", duration=60.0)
+        print(f"{'mode':<14}{'count':>6}{'p50 [ms]':>10}{'p99 [ms]':>10}{'max [ms]':>10}")
+        for label, stop_session in (("shared", False), ("stop lane", True)):
+            st = _run(sim.port, stop_session, args.load_threads, args.stops, args.interval)
+            print(f"{label:<14}{st['count']:>6}{st['p50_ms']:10.1f}{st['p99_ms']:10.1f}{st['max_ms']:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Reference decoder for benchmarks/bench_deserialize.py: BCAPClient._deserialize,
+_deserialize_args and _deserialize_arg copied unchanged from the baseline commit
+7398008, before the memoryview decoder. Source:
+
+    git show 7398008:denso_rc8_server/feature_implementations/driver/pybcapclient/bcapclient.py
+
+Kept as a fixture so the benchmark can check the current decoder against it;
+do not edit. Original code: Copyright (c) 2017 DENSO WAVE INCORPORATED (MIT License).
+"""
+import struct
+
+from denso_rc8_server.feature_implementations.driver.pybcapclient.bcapclient import BCAPClient, BCAPCodec
+from denso_rc8_server.feature_implementations.driver.pybcapclient.orinexception import HResult, ORiNException
+from denso_rc8_server.feature_implementations.driver.pybcapclient.variant import VarType
+
+
+class LegacyCodec(BCAPCodec):
+  # copy-per-value decoder: every value slices the remaining buffer (O(n^2))
+
+  def _deserialize(self, buf):
+    format = "<bIHhiH%dsb" % (len(buf) - 16)
+    (soh, len_buf, serial, version, hresult, len_args, buf_args, eot) \
+      = struct.unpack(format, buf)
+
+    if (soh != BCAPClient._BCAP_SOH) or (eot != BCAPClient._BCAP_EOT):
+      raise ORiNException(HResult.E_INVALIDPACKET)
+
+    (retvals, buf_args) = self._deserialize_args(buf_args, len_args, True)
+
+    return (serial, version, hresult, retvals)
+
+  def _deserialize_args(self, buf, len_args, first = False):
+    retvals = []
+
+    for i in range(len_args):
+      if first:
+        buf = buf[4:]
+      (retval, buf) = self._deserialize_arg(buf)
+      retvals.append(retval)
+
+    return (retvals, buf)
+
+  def _deserialize_arg(self, buf):
+    retval = None
+
+    format = "<HI%ds" % (len(buf) - 6)
+    (vt, len_arg, buf) = struct.unpack(format, buf)
+
+    if (vt & VarType.VT_ARRAY) != 0:
+      vt = vt ^ VarType.VT_ARRAY
+      if vt == VarType.VT_VARIANT:
+        (retval, buf) = self._deserialize_args(buf, len_arg)
+
+      elif vt == VarType.VT_UI1:
+        format = "<%ds%ds" % (len_arg, len(buf) - len_arg)
+        (retval, buf) = struct.unpack(format, buf)
+
+      elif vt in BCAPClient._DICT_VT2TYPE:
+        (fmt, len_val) = BCAPClient._DICT_VT2TYPE[vt]
+
+        if vt == VarType.VT_BSTR:
+          retval = []
+          for i in range(len_arg):
+            format = "<I%ds" % (len(buf) - 4)
+            (len_str, buf) = struct.unpack(format, buf)
+            format = "<%ds%ds" % (len_str, len(buf) - len_str)
+            (ret_tmp, buf) = struct.unpack(format, buf)
+            retval.append(ret_tmp.decode("utf-16le"))
+
+        else:
+          format = "<%s%ds" % (fmt * len_arg, len(buf) - (len_val * len_arg))
+          unpacked_arg = struct.unpack(format, buf)
+          retval   = list(unpacked_arg[:-1])
+          buf      = unpacked_arg[-1]
+
+          if vt == VarType.VT_DATE:
+            for i in range(len(retval)):
+              retval[i] = BCAPClient.vntdate2datetime(retval[i])
+
+          elif vt == VarType.VT_BOOL:
+            for i in range(len(retval)):
+              retval[i] = (retval[i] != 0)
+
+      else:
+        raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
+
+    else:
+      if vt in [ VarType.VT_EMPTY, VarType.VT_NULL ]:
+        pass
+      elif vt in BCAPClient._DICT_VT2TYPE:
+        (fmt, len_val) = BCAPClient._DICT_VT2TYPE[vt]
+        
+        if vt == VarType.VT_BSTR:
+          format = "<I%ds" % (len(buf) - 4)
+          (len_str, buf) = struct.unpack(format, buf)
+          format = "<%ds%ds" % (len_str, len(buf) - len_str)
+          (retval , buf) = struct.unpack(format, buf)
+          retval = retval.decode("utf-16le")
+
+        else:
+          format = "<%s%ds" % (fmt, (len(buf) - len_val))
+          (retval, buf) = struct.unpack(format, buf)
+
+          if vt == VarType.VT_DATE:
+            retval = BCAPClient.vntdate2datetime(retval)
+
+          elif vt == VarType.VT_BOOL:
+            retval = (retval != 0)
+
+      else:
+        raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
+
+    return (retval, buf)
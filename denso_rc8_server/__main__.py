@@ -10,6 +10,7 @@ import typer
 from sila2.framework.utils import running_in_docker
 from typer import BadParameter, Option
 
+from .metrics import MetricsExporter
 from .server import Server
 
 logger = logging.getLogger(__name__)
@@ -79,6 +80,19 @@ def main(
     ca_export_file: Optional[str] = Option(
         None, help="When using a self-signed certificate, write the generated CA to this file"
     ),
+    bcap_sessions: int = Option(
+        1, "--bcap-sessions", min=1, help="Number of parallel b-CAP sessions to the RC8 controller"
+    ),
+    metrics_port: Optional[int] = Option(
+        None, "--metrics-port", min=0, help="Serve Prometheus metrics on http://<metrics-address>:<port>/metrics"
+    ),
+    metrics_address: str = Option("127.0.0.1", "--metrics-address", help="Bind address of the metrics endpoint"),
+    metrics_textfile: Optional[str] = Option(
+        None, "--metrics-textfile", help="Write Prometheus metrics to this file (node_exporter textfile collector)"
+    ),
+    metrics_interval: float = Option(
+        15.0, "--metrics-interval", min=0.1, help="Seconds between writes of --metrics-textfile"
+    ),
     quiet: bool = Option(False, "--quiet", help="Only log errors"),
     verbose: bool = Option(False, "--verbose", help="Enable verbose logging"),
     debug: bool = Option(False, "--debug", help="Enable debug logging"),
@@ -120,7 +134,12 @@ def main(
     ca_for_discovery = Path(ca_file_for_discovery).read_bytes() if ca_file_for_discovery is not None else None
 
     # run server
-    server = Server(server_uuid=parsed_server_uuid, name=server_name, description=server_description)
+    server = Server(
+        server_uuid=parsed_server_uuid,
+        name=server_name,
+        description=server_description,
+        bcap_sessions=bcap_sessions,
+    )
 
     def start_server():
         # Versuche, den tatsächlich gebundenen Port von start_*/start zurückzubekommen
@@ -170,10 +189,25 @@ def main(
         return bound_port
 
 
+    # optionaler Metrik-Export (Prometheus)
+    exporter: Optional[MetricsExporter] = None
+    if metrics_port is not None or metrics_textfile is not None:
+        exporter = MetricsExporter(
+            server.densorc8control,
+            address=metrics_address,
+            port=metrics_port,
+            textfile=metrics_textfile,
+            interval=metrics_interval,
+        )
+
     try:
         start_server()
+        if exporter is not None:
+            exporter.start()
     except Exception:
         logger.exception("Server startup failed, shutting down")
+        if exporter is not None:
+            exporter.stop()
         if server.running:
             server.stop()
         logger.info("Server shutdown complete")
@@ -185,6 +219,8 @@ def main(
     with contextlib.suppress(KeyboardInterrupt):
         server.grpc_server.wait_for_termination()
 
+    if exporter is not None:
+        exporter.stop()
     server.stop()
     logger.info("Server shutdown complete")
 
@@ -1,10 +1,13 @@
 # Generated by sila2.code_generator; adapted to legacy controller
 from __future__ import annotations
 
+import itertools
 import logging
+import threading
 import time
+from collections import OrderedDict
 from datetime import timedelta
-from typing import TYPE_CHECKING, List, Optional, Tuple, Callable, Any, TypeVar, cast
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Callable, Any, TypeVar, cast
 from functools import wraps
 
 from sila2.server import MetadataDict, ObservableCommandInstance
@@ -32,7 +35,10 @@ def _is_orin_exception(exc: BaseException) -> bool:
     return exc.__class__.__name__ == "ORiNException"
 
 
-from .driver.denso_rc8_controller import DensoRC8Controller
+from .driver.denso_rc8_controller import DensoRC8Controller, ReconnectingError
+from .driver.pybcapclient.bcapclient import DeadlineExceeded, call_deadline
+from ..request_deadline import request_deadline
+from ..metrics import CommandMetrics
 
 from ..generated.densorc8control import (
     ConfigureConnection_Responses,
@@ -57,6 +63,24 @@ from ..generated.densorc8control import (
     StopProgram_Responses,
     ClearError_Responses,
     GetTaskNames_Responses,
+    GetIValues_Responses,
+    GetFValues_Responses,
+    GetSValues_Responses,
+    GetIOValues_Responses,
+    GetPValues_Responses,
+    GetJValues_Responses,
+    GetVValues_Responses,
+    SetIValues_Responses,
+    SetFValues_Responses,
+    SetSValues_Responses,
+    SetIOValues_Responses,
+    SetPValues_Responses,
+    SetJValues_Responses,
+    SetVValues_Responses,
+    ExecuteBatch_Responses,
+    CancelProgram_Responses,
+    GetErrorDetails_Responses,
+    SetStatusPollInterval_Responses,
 )
 
 if TYPE_CHECKING:
@@ -70,6 +94,21 @@ STATUS_RUNNING = 3
 STATUS_STEP_STOPPED = 4
 END_STATES = {STATUS_HOLD_STOPPED, STATUS_STOPPED, STATUS_STEP_STOPPED}
 
+# StartProgram: ein Endzustand ohne vorheriges RUNNING gilt erst nach dieser
+# Zeit ab dem Start (Task, der noch nicht angelaufen ist, vs. Zyklus kürzer als ein Poll)
+_END_STATE_MIN_WINDOW_S = 0.3
+
+# ExecuteBatch: Variablentyp -> (Feld in BatchOperation/BatchResult, Getter, Setter des Controllers)
+_BATCH_VARIABLES = {
+    "I": ("IntegerValue", "get_I_value", "set_I_value"),
+    "IO": ("IntegerValue", "get_IO_value", "set_IO_value"),
+    "F": ("RealValue", "get_F_value", "set_F_value"),
+    "S": ("StringValue", "get_s_value", "set_s_value"),
+    "P": ("RealValues", "get_P_value", "set_P_value"),
+    "J": ("RealValues", "get_J_value", "set_J_value"),
+    "V": ("RealValues", "get_V_value", "set_V_value"),
+}
+
 F = TypeVar("F", bound=Callable[..., Any])
 
 
@@ -77,59 +116,109 @@ def catch_orin(ctx: str) -> Callable[[F], F]:
     """
     Dekorator: fängt JEDE Exception, erkennt ORiNException (egal aus welchem Modulpfad),
     übersetzt sie andernfalls unverändert weiter.
+    b-CAP-Aufrufe im Handler geben spätestens zur gRPC-Deadline des Clients auf.
+    Anzahl, Fehler und Dauer jedes Aufrufs landen in `command_metrics` (Label = ctx).
     """
 
     def decorator(fn: F) -> F:
         @wraps(fn)
         def wrapper(self: "DensoRC8ControlImpl", *args, **kwargs):
+            started = time.perf_counter()
+            failed = True
             try:
-                return fn(self, *args, **kwargs)
-            except Exception as e:  # breit, um alle ORiN-Pfade zu erwischen
-                if _is_orin_exception(e):
-                    raise UndefinedExecutionError(self._format_orin_error(ctx, e))
-                raise
+                try:
+                    with call_deadline(request_deadline()):
+                        result = fn(self, *args, **kwargs)
+                except DeadlineExceeded as e:
+                    # Client hat bereits aufgegeben; kein Verbindungsfehler
+                    raise UndefinedExecutionError(f"{ctx} failed: {e} (client deadline)")
+                except Exception as e:  # breit, um alle ORiN-Pfade zu erwischen
+                    # Verbindungsfehler -> Circuit Breaker / Reconnect im Hintergrund
+                    self.controller.note_failure(e)
+                    if isinstance(e, ReconnectingError):
+                        raise UndefinedExecutionError(f"{ctx} failed: {e}")
+                    if self.controller.reconnecting and not _is_orin_exception(e) and self.controller.is_transport_error(e):
+                        # blockierter Aufruf wurde beim Öffnen des Breakers abgebrochen
+                        raise UndefinedExecutionError(f"{ctx} failed: {self.controller.reconnect_message()}")
+                    if _is_orin_exception(e):
+                        raise UndefinedExecutionError(self._format_orin_error(ctx, e))
+                    raise
+                self.controller.note_success()
+                failed = False
+                return result
+            finally:
+                self.command_metrics.record(ctx, time.perf_counter() - started, failed)
 
         return cast(F, wrapper)
 
     return decorator
 
 
+class _ProgramRun:
+    """Laufende StartProgram-Ausführung; CancelProgram weckt sie über `cancel`."""
+
+    def __init__(self, program_name: str):
+        self.program_name = program_name
+        self.cancel = threading.Event()
+        # time.perf_counter() des ersten Cancel-Requests
+        self.requested_at: Optional[float] = None
+        # gesetzt, sobald die Ausführung beendet ist (Task ggf. gestoppt)
+        self.stopped = threading.Event()
+        # Cancel bis task_stop fertig [s]
+        self.stop_latency: Optional[float] = None
+
+    def request_cancel(self, requested_at: float):
+        if self.requested_at is None:
+            self.requested_at = requested_at
+        self.cancel.set()
+
+
 class DensoRC8ControlImpl(DensoRC8ControlBase):
     """
     - STATUS-Observable mit aktivem Push
     - StartProgram: kein internes Timeout; @STATUS wird überwacht, bis Endzustand
     - JEDE ORiNException wird zentral in Klartext übersetzt (HRESULT + GetErrorDescription + RC8-ErrorStack)
     - Bei Abbruch (Exception/Cancel) wird der RC8-Task automatisch gestoppt
+    - CancelProgram weckt die Überwachung sofort (Event) und stoppt über die Stop-Lane
     """
 
-    def __init__(self, parent_server: Server) -> None:
+    # max. Wartezeit von CancelProgram auf das Ende der abgebrochenen Ausführungen [s]
+    _CANCEL_WAIT_S = 10.0
+    # gemerkte Fehler für GetErrorDetails; max. Wartezeit auf den Fehlerstack [s]
+    _ERRORS_KEPT = 256
+    _ERROR_DETAILS_WAIT_S = 1.0
+
+    def __init__(self, parent_server: Server, bcap_sessions: int = 1) -> None:
         super().__init__(parent_server=parent_server)
-        self.controller = DensoRC8Controller()
+        self.controller = DensoRC8Controller(sessions=bcap_sessions)
+        # Anzahl/Fehler/Dauer je SiLA-Aufruf (catch_orin), exportiert über metrics.MetricsExporter
+        self.command_metrics = CommandMetrics()
 
         # Lebensdauer der Observable-Instanz großzügig setzen (hier: 365 Tage)
         self.StartProgram_default_lifetime_of_execution = timedelta(days=365)
 
+        # ErrorId -> (Zeitpunkt monotonic, Fehlermeldung) für GetErrorDetails
+        self._errors: "OrderedDict[int, Tuple[float, str]]" = OrderedDict()
+        self._error_ids = itertools.count(1)
+        self._errors_lock = threading.Lock()
+
+        # laufende StartProgram-Ausführungen (für CancelProgram)
+        self._runs: Dict[str, List[_ProgramRun]] = {}
+        self._runs_lock = threading.Lock()
+
+        # max. @STATUS Poll-Intervall laufender StartProgram-Aufrufe [ms], 0 = adaptiv (SetStatusPollInterval)
+        self._status_poll_interval_ms = 0
+
         # last published STATUS (for initial push)
         self._last_status: Optional[int] = None
 
-        def _poll_status() -> None:
+        def _on_status(prog: str, cur: int) -> None:
             """
-            Read & push only – NO get_program() here!
+            Push only – gelesen wird im Status-Hub des Controllers (ein Poller für alle).
             Handles must be configured in GetProgram/StartProgram beforehand.
             """
-            prog = getattr(self.controller, "current_program_name", None)
-            if not prog:
-                return
-            task_vars = getattr(self.controller, "task_status_vars", {})
-            var_handle = task_vars.get(prog)
-            if not var_handle:
-                return
-            try:
-                cur = int(self.controller.bcap.variable_getvalue(var_handle))
-            except Exception as e:
-                logging.debug("STATUS poll read failed: %r", e)
+            if prog != getattr(self.controller, "current_program_name", None):
                 return
-
             if self._last_status is None or cur != self._last_status:
                 self._last_status = cur
                 try:
@@ -137,8 +226,16 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
                 except Exception as e:
                     logging.debug("update_STATUS failed: %r", e)
 
-        # Polling alle 200ms
-        self.run_periodically(_poll_status, delay_seconds=0.2)
+        def _on_task_statuses(changed: Dict[str, int]) -> None:
+            # Liste aller Tasks, nur veröffentlicht wenn sich mind. ein Task geändert hat
+            statuses = self.controller.status_hub.statuses()
+            try:
+                self.update_TaskStatuses([{"TaskName": name, "Status": statuses[name]} for name in sorted(statuses)])
+            except Exception as e:
+                logging.debug("update_TaskStatuses failed: %r", e)
+
+        self.controller.status_hub.add_listener(_on_status)
+        self.controller.status_hub.add_change_listener(_on_task_statuses)
 
     # ---------------------- Connection / Lifecycle ----------------------
 
@@ -238,6 +335,144 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
         value = self.controller.get_V_value(Index=Index)
         return GetVValue_Responses(Value=value)
 
+    # ---------------------- Bulk reads ----------------------
+
+    @catch_orin("GetIValues")
+    def GetIValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetIValues_Responses:
+        values = self.controller.get_values("I", StartIndex, Count)
+        return GetIValues_Responses(Values=values)
+
+    @catch_orin("GetFValues")
+    def GetFValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetFValues_Responses:
+        values = self.controller.get_values("F", StartIndex, Count)
+        return GetFValues_Responses(Values=values)
+
+    @catch_orin("GetSValues")
+    def GetSValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetSValues_Responses:
+        values = self.controller.get_values("S", StartIndex, Count)
+        return GetSValues_Responses(Values=values)
+
+    @catch_orin("GetIOValues")
+    def GetIOValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetIOValues_Responses:
+        values = self.controller.get_values("IO", StartIndex, Count)
+        return GetIOValues_Responses(Values=values)
+
+    @catch_orin("GetPValues")
+    def GetPValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetPValues_Responses:
+        # RealVector ist eine Struktur mit genau einem Element -> Liste direkt übergeben
+        values = self.controller.get_values("P", StartIndex, Count)
+        return GetPValues_Responses(Values=[list(v) for v in values])
+
+    @catch_orin("GetJValues")
+    def GetJValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetJValues_Responses:
+        values = self.controller.get_values("J", StartIndex, Count)
+        return GetJValues_Responses(Values=[list(v) for v in values])
+
+    @catch_orin("GetVValues")
+    def GetVValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetVValues_Responses:
+        values = self.controller.get_values("V", StartIndex, Count)
+        return GetVValues_Responses(Values=[list(v) for v in values])
+
+    # ---------------------- Bulk writes ----------------------
+
+    @staticmethod
+    def _real_vectors(values: List[Any]) -> List[List[float]]:
+        # RealVector kommt als Struktur (Values=[...]) an
+        return [list(getattr(v, "Values", v)) for v in values]
+
+    @catch_orin("SetIValues")
+    def SetIValues(self, Indices: List[int], Values: List[int], *, metadata: MetadataDict) -> SetIValues_Responses:
+        errors = self.controller.set_values("I", Indices, Values)
+        return SetIValues_Responses(Errors=errors)
+
+    @catch_orin("SetFValues")
+    def SetFValues(self, Indices: List[int], Values: List[float], *, metadata: MetadataDict) -> SetFValues_Responses:
+        errors = self.controller.set_values("F", Indices, Values)
+        return SetFValues_Responses(Errors=errors)
+
+    @catch_orin("SetSValues")
+    def SetSValues(self, Indices: List[int], Values: List[str], *, metadata: MetadataDict) -> SetSValues_Responses:
+        errors = self.controller.set_values("S", Indices, Values)
+        return SetSValues_Responses(Errors=errors)
+
+    @catch_orin("SetIOValues")
+    def SetIOValues(self, Indices: List[int], Values: List[int], *, metadata: MetadataDict) -> SetIOValues_Responses:
+        errors = self.controller.set_values("IO", Indices, Values)
+        return SetIOValues_Responses(Errors=errors)
+
+    @catch_orin("SetPValues")
+    def SetPValues(self, Indices: List[int], Values: List[Any], *, metadata: MetadataDict) -> SetPValues_Responses:
+        errors = self.controller.set_values("P", Indices, self._real_vectors(Values))
+        return SetPValues_Responses(Errors=errors)
+
+    @catch_orin("SetJValues")
+    def SetJValues(self, Indices: List[int], Values: List[Any], *, metadata: MetadataDict) -> SetJValues_Responses:
+        errors = self.controller.set_values("J", Indices, self._real_vectors(Values))
+        return SetJValues_Responses(Errors=errors)
+
+    @catch_orin("SetVValues")
+    def SetVValues(self, Indices: List[int], Values: List[Any], *, metadata: MetadataDict) -> SetVValues_Responses:
+        errors = self.controller.set_values("V", Indices, self._real_vectors(Values))
+        return SetVValues_Responses(Errors=errors)
+
+    # ---------------------- Batch ----------------------
+
+    @catch_orin("ExecuteBatch")
+    def ExecuteBatch(
+        self, Operations: List[Any], StopOnError: bool, *, metadata: MetadataDict
+    ) -> ExecuteBatch_Responses:
+        """
+        Führt die Operationen nacheinander serverseitig aus (ein gRPC-Round-Trip).
+        Fehler werden pro Operation gemeldet; mit StopOnError endet die Liste
+        bei der ersten fehlgeschlagenen Operation.
+        """
+        results = []
+        for op in Operations:
+            result = {
+                "Operation": op.Operation,
+                "Success": True,
+                "Error": "",
+                "IntegerValue": 0,
+                "RealValue": 0.0,
+                "StringValue": "",
+                "RealValues": [],
+            }
+            try:
+                self._run_batch_operation(op, result)
+            except Exception as e:
+                result["Success"] = False
+                if _is_orin_exception(e):
+                    result["Error"] = self._format_orin_error(op.Operation, e)
+                else:
+                    result["Error"] = f"{op.Operation} failed: {e}"
+            results.append(result)
+            if StopOnError and not result["Success"]:
+                break
+        return ExecuteBatch_Responses(Results=results)
+
+    def _run_batch_operation(self, op: Any, result: dict) -> None:
+        name = op.Operation
+        if name == "GetPos":
+            result["RealValues"] = list(self.controller.get_pos_value())
+        elif name == "StartProgram":
+            # startet nur; Überwachung bis zum Ende bietet das Observable StartProgram
+            self.controller.get_program(program_name=op.ProgramName)
+            self.controller.start_program(program_name=op.ProgramName, mode=op.Mode)
+        elif name == "StopProgram":
+            self.controller.stop_program(program_name=op.ProgramName, mode=op.Mode)
+        elif name == "ClearError":
+            self.controller.clear_error()
+        elif name[:3] in ("Get", "Set") and name[3:] in _BATCH_VARIABLES:
+            field, getter, setter = _BATCH_VARIABLES[name[3:]]
+            if name.startswith("Get"):
+                value = getattr(self.controller, getter)(Index=op.Index)
+                result[field] = list(value) if field == "RealValues" else value
+            else:
+                value = getattr(op, field)
+                getattr(self.controller, setter)(Index=op.Index, value=list(value) if field == "RealValues" else value)
+        else:
+            raise ValueError(f"Unknown operation '{name}'")
+
     # ---------------------- Position ----------------------
 
     @catch_orin("GetPosValue")
@@ -267,7 +502,7 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
 
     @catch_orin("ClearError")
     def ClearError(self, *, metadata: MetadataDict) -> ClearError_Responses:
-        self.controller.bcap.controller_execute(self.controller.h_ctrl, "ClearError")
+        self.controller.clear_error()
         return ClearError_Responses()
 
     @catch_orin("StartProgram")
@@ -292,18 +527,40 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
         # Handle & Status-Var holen (ORiN wird zentral gefangen)
         self.controller.get_program(program_name=ProgramName)
         task_handle = self.controller.task_handles[ProgramName]
-        status_handle = self.controller.task_status_vars[ProgramName]
+        hub = self.controller.status_hub
 
         setattr(self.controller, "current_program_name", ProgramName)
 
-        # Start
-        self.controller.start_program(program_name=ProgramName, mode=Mode)
+        # Poll-Intervall begrenzen, falls per SetStatusPollInterval vorgegeben (0 = adaptiv)
+        poll_ms = self._status_poll_interval_ms
+        poll_token = hub.request_interval(poll_ms / 1000.0) if poll_ms > 0 else None
 
-        # Monitoring-Loop (ohne hartes Timeout, ohne Progress-Prozent)
-        poll_dt = 0.1
-        confirm_needed = 3
+        # für CancelProgram registrieren
+        run = _ProgramRun(ProgramName)
+        with self._runs_lock:
+            self._runs.setdefault(ProgramName, []).append(run)
+
+        # Start
+        try:
+            self.controller.start_program(program_name=ProgramName, mode=Mode)
+            started_at = time.monotonic()
+        except BaseException:
+            if poll_token is not None:
+                hub.release_interval(poll_token)
+            self._unregister_run(run)
+            raise
+
+        # Monitoring über den Status-Hub (ohne hartes Timeout, ohne Progress-Prozent):
+        # nur Messwerte nach dem Start zählen
+        seq, _ = hub.latest(ProgramName)
+
+        wait_dt = 1.0
+        # Endzustand bestätigen, solange der Hub nach dem Statuswechsel schnell pollt
+        confirm_needed = max(1, hub.fast_cycles)
         confirm_count = 0
         last_cur: Optional[int] = None
+        # Endzustand erst nach einem RUNNING-Messwert oder nach _END_STATE_MIN_WINDOW_S
+        seen_running = False
 
         def _read_error_description_once() -> str:
             """
@@ -313,15 +570,17 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
             Alle verwendeten Controller-Variablenhandles werden wieder freigegeben.
             """
             try:
+                pool = self.controller.pool
                 # 1) Erst @ERROR_CODE prüfen
-                h_code = self.controller.bcap.controller_getvariable(self.controller.h_ctrl, "@ERROR_CODE", "")
-                try:
-                    code_val = self.controller.bcap.variable_getvalue(h_code)
-                finally:
+                with pool.acquire(pool.primary, report=False) as session:
+                    h_code = session.bcap.controller_getvariable(session.h_ctrl, "@ERROR_CODE", "")
                     try:
-                        self.controller.bcap.variable_release(h_code)
-                    except Exception:
-                        pass
+                        code_val = session.bcap.variable_getvalue(h_code)
+                    finally:
+                        try:
+                            session.bcap.variable_release(h_code)
+                        except Exception:
+                            pass
 
                 if code_val is None:
                     return ""
@@ -336,14 +595,15 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
                     return ""
 
                 # 2) Beschreibungstext holen (@ERROR_DESCRIPTION)
-                h_desc = self.controller.bcap.controller_getvariable(self.controller.h_ctrl, "@ERROR_DESCRIPTION", "")
-                try:
-                    desc_val = self.controller.bcap.variable_getvalue(h_desc)
-                finally:
+                with pool.acquire(pool.primary, report=False) as session:
+                    h_desc = session.bcap.controller_getvariable(session.h_ctrl, "@ERROR_DESCRIPTION", "")
                     try:
-                        self.controller.bcap.variable_release(h_desc)
-                    except Exception:
-                        pass
+                        desc_val = session.bcap.variable_getvalue(h_desc)
+                    finally:
+                        try:
+                            session.bcap.variable_release(h_desc)
+                        except Exception:
+                            pass
 
                 desc = (str(desc_val).strip() if desc_val is not None else "")
 
@@ -355,34 +615,22 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
                 # Wenn wir hier scheitern, lieber still bleiben als einen Fake-Fehler zu erzeugen
                 return ""
 
-        # Helper: optional Cancel-Erkennung (best effort; je nach Server vorhanden)
-        def _is_cancelled(inst: ObservableCommandInstance) -> bool:
-            for attr in ("is_cancelled", "is_canceled", "cancelled", "canceled", "is_cancel_requested"):
-                if hasattr(inst, attr):
-                    try:
-                        if bool(getattr(inst, attr)):
-                            return True
-                    except Exception:
-                        pass
-            return False
-
         completed_ok = False
         try:
             while True:
-                # Falls Server/Client den Observable abbricht
-                if _is_cancelled(instance):
+                # CancelProgram setzt run.cancel und weckt wait_for() sofort
+                sample = hub.wait_for(ProgramName, seq, timeout=wait_dt, cancel=run.cancel)
+                if run.cancel.is_set():
                     raise UndefinedExecutionError(f"StartProgram '{ProgramName}' cancelled by client")
-
-                try:
-                    cur = int(self.controller.bcap.variable_getvalue(status_handle))
-                except Exception:
-                    time.sleep(poll_dt)
+                if sample is None:
                     continue
+                seq, cur = sample
 
                 if cur == STATUS_RUNNING:
                     # kein Progress-Update mehr
                     confirm_count = 0
                     last_cur = cur
+                    seen_running = True
 
                 elif cur in END_STATES:
                     if cur == last_cur:
@@ -391,7 +639,9 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
                         confirm_count = 1
                         last_cur = cur
 
-                    if confirm_count >= confirm_needed:
+                    if confirm_count >= confirm_needed and (
+                        seen_running or time.monotonic() - started_at >= _END_STATE_MIN_WINDOW_S
+                    ):
                         # (A) Controller-Fehlerzustand prüfen
                         err_txt = _read_error_description_once()
                         if err_txt:
@@ -416,15 +666,69 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
                 else:
                     confirm_count = 0
                     last_cur = cur
-
-                time.sleep(poll_dt)
         finally:
+            if poll_token is not None:
+                hub.release_interval(poll_token)
+            self._unregister_run(run)
             # Task stoppen, wenn nicht regulär beendet (Fehler/Cancel/Abbruch)
             if not completed_ok:
                 try:
-                    self.controller.stop_program(program_name=ProgramName, mode="default_stop")
+                    self.controller.stop_program(
+                        program_name=ProgramName, mode="default_stop", requested_at=run.requested_at
+                    )
+                    if run.requested_at is not None:
+                        run.stop_latency = time.perf_counter() - run.requested_at
+                        logging.info("StartProgram '%s' cancelled, task stopped after %.1f ms",
+                                     ProgramName, run.stop_latency * 1e3)
                 except Exception:
                     pass
+            run.stopped.set()
+
+    def _unregister_run(self, run: _ProgramRun):
+        with self._runs_lock:
+            runs = self._runs.get(run.program_name, [])
+            if run in runs:
+                runs.remove(run)
+            if not runs:
+                self._runs.pop(run.program_name, None)
+
+    def active_program_runs(self) -> int:
+        """Anzahl laufender StartProgram-Ausführungen (Observable-Command-Instanzen)."""
+        with self._runs_lock:
+            return sum(len(runs) for runs in self._runs.values())
+
+    @catch_orin("SetStatusPollInterval")
+    def SetStatusPollInterval(self, Interval: int, *, metadata: MetadataDict) -> SetStatusPollInterval_Responses:
+        """
+        Max. @STATUS Poll-Intervall [ms] für danach gestartete StartProgram-Aufrufe (0 = adaptiv).
+        Der Hub hebt Werte unter seinem schnellen Intervall darauf an.
+        """
+        self._status_poll_interval_ms = max(0, int(Interval))
+        return SetStatusPollInterval_Responses()
+
+    @catch_orin("CancelProgram")
+    def CancelProgram(self, ProgramName: str, *, metadata: MetadataDict) -> CancelProgram_Responses:
+        """
+        Bricht alle laufenden StartProgram-Ausführungen des Programms ab und wartet,
+        bis deren Task gestoppt ist. StopLatency = Cancel bis task_stop fertig (max. über alle).
+        """
+        requested_at = time.perf_counter()
+        with self._runs_lock:
+            runs = list(self._runs.get(ProgramName, []))
+        for run in runs:
+            run.request_cancel(requested_at)
+        self.controller.status_hub.wake_waiters()
+
+        latencies = []
+        for run in runs:
+            if not run.stopped.wait(timeout=self._CANCEL_WAIT_S):
+                logging.warning("CancelProgram '%s': execution did not stop within %.0f s", ProgramName, self._CANCEL_WAIT_S)
+            elif run.stop_latency is not None:
+                latencies.append(run.stop_latency)
+        return CancelProgram_Responses(
+            CancelledExecutions=len(runs),
+            StopLatency=max(latencies) * 1e3 if latencies else 0.0,
+        )
 
     # ---------------------- Observable Property Hook ----------------------
 
@@ -438,12 +742,13 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
 
     # ---------------------- Zentrale Fehlerübersetzung ----------------------
 
-    def _format_orin_error(self, ctx: str, exc: BaseException, *, retries: int = 6, sleep_s: float = 0.08) -> str:
+    def _format_orin_error(self, ctx: str, exc: BaseException) -> str:
         """
-        Liefert eine aussagekräftige Fehlermeldung:
+        Liefert sofort eine aussagekräftige Fehlermeldung (ohne Warten auf den Controller):
           - HRESULT dec/hex (falls verfügbar)
-          - GetErrorDescription(HRESULT)
-          - ggf. RC8 ErrorStack (GetCurErrorInfo) oder @ERROR_CODE/@ERROR_DESCRIPTION
+          - GetErrorDescription(HRESULT) aus dem Cache des Controllers
+          - letzter bekannter RC8 ErrorStack aus dem Hintergrund-Collector
+          - ErrorId für GetErrorDetails (Fehlerstack, der nach dem Fehler gelesen wurde)
         """
         # HRESULT
         hr_int = None
@@ -452,72 +757,72 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
         except Exception:
             hr_int = None
         hr_hex = f"0x{hr_int & 0xFFFFFFFF:08X}" if isinstance(hr_int, int) else "n/a"
+        base = f"{ctx} failed: ORiN {hr_int if hr_int is not None else 'n/a'} ({hr_hex})"
 
-        # kurze Wartezeit, damit RC8 ggf. den Fehlerstack setzt
-        has_err, stack_msg = False, ""
-        for _ in range(retries):
-            has_err, stack_msg = self._read_rc8_error_stack()
-            if has_err:
-                break
-            time.sleep(sleep_s)
-        if not has_err:
-            has_err, stack_msg = self._read_rc8_error_stack()
-
-        # Zusatz: @ERROR_CODE/@ERROR_DESCRIPTION falls kein Stack
-        if not has_err:
-            try:
-                h_code = self.controller.bcap.controller_getvariable(self.controller.h_ctrl, "@ERROR_CODE", "")
-                try:
-                    code_val = self.controller.bcap.variable_getvalue(h_code)
-                finally:
-                    try:
-                        self.controller.bcap.variable_release(h_code)
-                    except Exception:
-                        pass
-
-                if code_val is not None and int(code_val) != 0:
-                    h_desc = self.controller.bcap.controller_getvariable(self.controller.h_ctrl, "@ERROR_DESCRIPTION", "")
-                    try:
-                        desc_val = self.controller.bcap.variable_getvalue(h_desc)
-                    finally:
-                        try:
-                            self.controller.bcap.variable_release(h_desc)
-                        except Exception:
-                            pass
+        # Transportfehler (Timeout): Controller nicht erreichbar -> keine weiteren Anfragen
+        if self.controller.is_transport_error(exc):
+            breaker = self.controller.breaker.stats()
+            return (
+                f"{base} — controller not reachable (circuit {breaker['state']}, "
+                f"{breaker['consecutive_failures']}/{breaker['threshold']} transport failures in a row)"
+            )
 
-                    desc = (str(desc_val) if desc_val is not None else "").strip()
-                    has_err, stack_msg = True, f"RC8 error {int(code_val)}: {desc or 'No description'}"
-            except Exception:
-                pass
+        # Collector liest den Fehlerstack jetzt im Burst nach; hier nur der letzte Stand
+        collector = self.controller.error_collector
+        since = collector.request_refresh()
+        snap = collector.snapshot()
 
-        # Klartext zum HRESULT
+        # Klartext zum HRESULT (gecacht im Controller, vorbefüllt bei Start())
         hr_text = ""
         if isinstance(hr_int, int):
-            try:
-                hr_text = self.controller.bcap.controller_execute(
-                    self.controller.h_ctrl, "GetErrorDescription", int(hr_int)
-                )
-                hr_text = (str(hr_text) if hr_text is not None else "").strip()
-            except Exception:
-                hr_text = ""
+            hr_text = self.controller.error_description(hr_int)
 
-        base = f"{ctx} failed: ORiN {hr_int if hr_int is not None else 'n/a'} ({hr_hex})"
         parts = [base]
         if hr_text:
             parts.append(hr_text)
-        if has_err and stack_msg:
-            parts.append(stack_msg)
+        error_id = self._remember_error(since, " — ".join(parts))
+        if snap is not None and snap.has_error:
+            parts.append(snap.message())
+        parts.append(f"ErrorId {error_id} (GetErrorDetails)")
         return " — ".join(parts)
 
+    def _remember_error(self, since: float, text: str) -> int:
+        with self._errors_lock:
+            error_id = next(self._error_ids)
+            self._errors[error_id] = (since, text)
+            while len(self._errors) > self._ERRORS_KEPT:
+                self._errors.popitem(last=False)
+        return error_id
+
+    @catch_orin("GetErrorDetails")
+    def GetErrorDetails(self, ErrorId: int, *, metadata: MetadataDict) -> GetErrorDetails_Responses:
+        """
+        Fehlermeldung von ErrorId inkl. RC8-Fehlerstack, der nach dem Fehler gelesen wurde
+        (wartet höchstens _ERROR_DETAILS_WAIT_S auf den Collector).
+        """
+        with self._errors_lock:
+            entry = self._errors.get(ErrorId)
+        if entry is None:
+            raise ValueError(f"Unknown ErrorId {ErrorId} (only the last {self._ERRORS_KEPT} errors are kept)")
+        since, text = entry
+        snap = self.controller.error_collector.wait_for(since, timeout=self._ERROR_DETAILS_WAIT_S)
+        if snap is not None and snap.taken_at >= since and snap.has_error:
+            text = f"{text} — {snap.message()}"
+        return GetErrorDetails_Responses(Details=text)
+
     def _read_rc8_error_stack(self) -> Tuple[bool, str]:
         """
         (has_error, message) – Controller-Fehlerstack:
           GetCurErrorCount / GetCurErrorInfo(0)
         """
         try:
-            cnt = self.controller.bcap.controller_execute(self.controller.h_ctrl, "GetCurErrorCount", "")
-            if cnt and int(cnt) > 0:
-                info = self.controller.bcap.controller_execute(self.controller.h_ctrl, "GetCurErrorInfo", 0)
+            pool = self.controller.pool
+            with pool.acquire(pool.primary, report=False) as session:
+                cnt = session.bcap.controller_execute(session.h_ctrl, "GetCurErrorCount", "")
+                info = None
+                if cnt and int(cnt) > 0:
+                    info = session.bcap.controller_execute(session.h_ctrl, "GetCurErrorInfo", 0)
+            if info is not None:
                 # info: [code, message, subcode, fileIdLine, programName, lineNo, fileId]
                 code = info[0] if len(info) > 0 else None
                 msg = info[1] if len(info) > 1 else ""
@@ -539,4 +844,8 @@ class DensoRC8ControlImpl(DensoRC8ControlBase):
 
     def stop(self):
         print("🔴 Feature DensoRC8 stopped")
+        try:
+            self.controller.stop()
+        except Exception as e:
+            logging.debug("controller.stop() failed: %r", e)
         super().stop()
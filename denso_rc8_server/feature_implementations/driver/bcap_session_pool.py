@@ -0,0 +1,222 @@
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+try:
+    from .pybcapclient import bcapclient
+except ImportError:
+    import pybcapclient.bcapclient as bcapclient
+
+
+class BCAPSession:
+    """
+    Eine b-CAP Verbindung zum Controller mit eigenem service_start + controller_connect.
+    Handles gelten nur innerhalb der Session, in der sie geholt wurden.
+    """
+
+    def __init__(self, index: int, bcap: bcapclient.BCAPClient, h_ctrl: Any):
+        self.index = index
+        self.bcap = bcap
+        self.h_ctrl = h_ctrl
+
+        # Last-Zähler für das Routing (nur unter dem Pool-Lock ändern)
+        self.inflight = 0
+        self.calls = 0
+
+        # offene Handles dieser Session (werden beim Schließen freigegeben)
+        self.handles: Set[Any] = set()
+        # gecachte Variablen-Handles (Name -> Handle), LRU-Reihenfolge; verwaltet vom Controller
+        self.variables: "OrderedDict[str, Any]" = OrderedDict()
+
+    def track(self, handle: Any):
+        self.handles.add(handle)
+
+    def untrack(self, handle: Any):
+        self.handles.discard(handle)
+
+    def __repr__(self) -> str:
+        return f"<BCAPSession #{self.index} inflight={self.inflight} handles={len(self.handles)}>"
+
+
+class BCAPSessionPool:
+    """
+    N parallele b-CAP Sessions zum selben Controller.
+
+    - acquire() ohne Argument liefert die Session mit der geringsten Last
+      (laufende Aufrufe, danach Gesamtanzahl Aufrufe).
+    - acquire(session) bleibt bei der angegebenen Session (Handle-Affinität):
+      alles, was ein Handle benutzt, muss über die Session laufen, die es geholt hat.
+    - Session 0 ist die primäre Session (Robot-/Task-Handles des Controllers).
+    - Optional eine reservierte Stop-Session (stop_session), die nie geroutet
+      wird: Stop/Halt wartet so nicht hinter Lese-Aufrufen anderer Clients.
+    - on_success()/on_failure(exc) werden nach jedem acquire()-Block aufgerufen
+      (Circuit Breaker des Controllers).
+    - call_stats: gemeinsames BCAPCallStats aller Sessions (None = keine Statistik).
+    """
+
+    def __init__(
+        self,
+        ip: str,
+        port: int,
+        timeout: int,
+        size: int = 1,
+        provider: str = "CaoProv.DENSO.VRC",
+        machine: str = "localhost",
+        stop_session: bool = False,
+        on_success: Optional[Callable[[], None]] = None,
+        on_failure: Optional[Callable[[BaseException], None]] = None,
+        call_stats: Any = None,
+    ):
+        if size < 1:
+            raise ValueError("Session pool size must be >= 1")
+        self.ip = ip
+        self.port = port
+        self.timeout = timeout
+        self.size = size
+        self.provider = provider
+        self.machine = machine
+        self.reserve_stop_session = stop_session
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.call_stats = call_stats
+
+        self.sessions: List[BCAPSession] = []
+        self.stop_session: Optional[BCAPSession] = None
+        self._lock = threading.Lock()
+
+    # ---------------------- Lifecycle ----------------------
+
+    def _connect(self, index: int) -> BCAPSession:
+        bcap = bcapclient.BCAPClient(host=self.ip, port=self.port, timeout=self.timeout)
+        if self.call_stats is not None:
+            bcap.enable_stats(self.call_stats)
+        try:
+            bcap.service_start("")
+            h_ctrl = bcap.controller_connect(name="", provider=self.provider, machine=self.machine, option="")
+        except Exception:
+            bcap.close()
+            raise
+        return BCAPSession(index, bcap, h_ctrl)
+
+    def open(self):
+        sessions: List[BCAPSession] = []
+        try:
+            for index in range(self.size):
+                sessions.append(self._connect(index))
+            stop_session = self._connect(self.size) if self.reserve_stop_session else None
+        except Exception:
+            for session in sessions:
+                self._close_session(session)
+            raise
+        with self._lock:
+            self.sessions = sessions
+            self.stop_session = stop_session
+        logging.info("b-CAP session pool opened (%d session(s) to %s:%s).", self.size, self.ip, self.port)
+
+    def close(self):
+        with self._lock:
+            sessions, self.sessions = self.sessions, []
+            if self.stop_session is not None:
+                sessions.append(self.stop_session)
+                self.stop_session = None
+        for session in sessions:
+            self._close_session(session)
+
+    def interrupt(self):
+        """
+        Verbindung verloren: blockierte Aufrufe aller Sessions sofort mit
+        ConnectionError abbrechen, statt sie den b-CAP Timeout abwarten zu lassen.
+        """
+        with self._lock:
+            sessions = list(self.sessions)
+            if self.stop_session is not None:
+                sessions.append(self.stop_session)
+        for session in sessions:
+            session.bcap.shutdown()
+
+    def abandon(self):
+        """
+        Sessions einer verlorenen Verbindung verwerfen: nur die Sockets schließen,
+        ohne Handles freizugeben oder controller_disconnect zu senden.
+        """
+        with self._lock:
+            sessions, self.sessions = self.sessions, []
+            if self.stop_session is not None:
+                sessions.append(self.stop_session)
+                self.stop_session = None
+        for session in sessions:
+            session.handles.clear()
+            session.variables.clear()
+            session.bcap.close()
+
+    @staticmethod
+    def _close_session(session: BCAPSession):
+        for handle in list(session.handles):
+            try:
+                session.bcap.variable_release(handle)
+            except Exception as e:
+                logging.debug("variable_release(%r) on session #%d failed: %r", handle, session.index, e)
+        session.handles.clear()
+        session.variables.clear()
+        try:
+            session.bcap.controller_disconnect(session.h_ctrl)
+            session.bcap.service_stop()
+        except Exception as e:
+            logging.debug("Closing b-CAP session #%d failed: %r", session.index, e)
+        session.bcap.close()
+
+    # ---------------------- Routing ----------------------
+
+    def set_call_stats(self, stats: Any):
+        """BCAPCallStats für alle (auch künftige) Sessions setzen; None schaltet die Statistik ab."""
+        self.call_stats = stats
+        sessions = list(self.sessions)
+        if self.stop_session is not None:
+            sessions.append(self.stop_session)
+        for session in sessions:
+            if stats is None:
+                session.bcap.disable_stats()
+            else:
+                session.bcap.enable_stats(stats)
+
+    @property
+    def primary(self) -> BCAPSession:
+        if not self.sessions:
+            raise RuntimeError("Session pool not open.")
+        return self.sessions[0]
+
+    @contextmanager
+    def acquire(self, session: Optional[BCAPSession] = None, report: bool = True) -> Iterator[BCAPSession]:
+        """
+        Session für einen Aufruf belegen (ohne Angabe die am wenigsten belastete).
+        report=False: on_success/on_failure nicht aufrufen, z. B. wenn der Aufrufer
+        Teilergebnisse eines call_many selbst an den Circuit Breaker meldet.
+        """
+        with self._lock:
+            if session is None:
+                if not self.sessions:
+                    raise RuntimeError("Session pool not open.")
+                session = min(self.sessions, key=lambda s: (s.inflight, s.calls))
+            session.inflight += 1
+            session.calls += 1
+        try:
+            yield session
+        except Exception as e:
+            if report and self.on_failure is not None:
+                self.on_failure(e)
+            raise
+        else:
+            if report and self.on_success is not None:
+                self.on_success()
+        finally:
+            with self._lock:
+                session.inflight -= 1
+
+    def stats(self) -> List[Dict[str, int]]:
+        with self._lock:
+            return [
+                {"session": s.index, "inflight": s.inflight, "calls": s.calls, "handles": len(s.handles)}
+                for s in self.sessions
+            ]
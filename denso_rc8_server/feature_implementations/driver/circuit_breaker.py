@@ -0,0 +1,95 @@
+import threading
+import time
+from typing import Any, Dict
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker für die Verbindung zum Controller.
+
+    - closed:    Aufrufe laufen normal; aufeinanderfolgende Transportfehler
+                 (Timeout, Socket zu) werden gezählt, jeder Erfolg setzt zurück.
+    - open:      nach `threshold` Fehlern in Folge (bzw. sofort bei einem
+                 fatalen Fehler wie "Verbindung vom Peer geschlossen").
+                 Aufrufe werden sofort abgewiesen, statt den b-CAP Timeout abzuwarten.
+    - half_open: ein Wiederherstellungsversuch (Probe) läuft; Aufrufe werden
+                 weiter abgewiesen. Erfolg -> closed, Fehlschlag -> open.
+    Die Probe selbst führt der Besitzer aus (DensoRC8Controller: Reconnect-Thread).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int = 3):
+        self.threshold = max(1, int(threshold))
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.last_error = ""
+        # Anzahl Übergänge closed -> open / open -> closed
+        self.trips = 0
+        self.recoveries = 0
+
+    @property
+    def closed(self) -> bool:
+        return self.state == self.CLOSED
+
+    def record_success(self):
+        """Controller hat geantwortet (auch eine ORiN-Fehlerantwort zählt)."""
+        if self.consecutive_failures == 0:
+            return
+        with self._lock:
+            if self.state == self.CLOSED:
+                self.consecutive_failures = 0
+
+    def record_failure(self, error: str, fatal: bool = False) -> bool:
+        """Transportfehler zählen. True, wenn der Breaker dadurch öffnet."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                return False
+            self.consecutive_failures += 1
+            self.last_error = error
+            if not fatal and self.consecutive_failures < self.threshold:
+                return False
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.trips += 1
+            return True
+
+    def half_open(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                self.state = self.HALF_OPEN
+
+    def probe_failed(self, error: str):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+            self.last_error = error
+
+    def close(self):
+        """Probe erfolgreich (oder Controller gestoppt): wieder normal arbeiten."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                self.recoveries += 1
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+
+    def reset(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "threshold": self.threshold,
+                "consecutive_failures": self.consecutive_failures,
+                "open_for_s": time.monotonic() - self.opened_at if self.state != self.CLOSED else 0.0,
+                "trips": self.trips,
+                "recoveries": self.recoveries,
+                "last_error": self.last_error,
+            }
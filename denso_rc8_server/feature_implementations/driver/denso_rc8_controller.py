@@ -1,13 +1,37 @@
 import logging
 import threading
-from typing import List, Dict, Optional, Any
+import time
+from collections import OrderedDict, deque
+from typing import List, Dict, Optional, Any, Callable, Deque, Tuple
 
 try:
     from .pybcapclient import bcapclient
-    from .pybcapclient.orinexception import ORiNException
+    from .pybcapclient.orinexception import HResult, ORiNException
+    from .pybcapclient.callstats import BCAPCallStats
+    from .bcap_session_pool import BCAPSession, BCAPSessionPool
+    from .task_status_hub import TaskStatusHub
+    from .error_stack_collector import ErrorStackCollector
+    from .circuit_breaker import CircuitBreaker
 except ImportError:
     import pybcapclient.bcapclient as bcapclient
-    from pybcapclient.orinexception import ORiNException
+    from pybcapclient.orinexception import HResult, ORiNException
+    from pybcapclient.callstats import BCAPCallStats
+    from bcap_session_pool import BCAPSession, BCAPSessionPool
+    from task_status_hub import TaskStatusHub
+    from error_stack_collector import ErrorStackCollector
+    from circuit_breaker import CircuitBreaker
+
+
+# b-CAP Funktions-IDs für Sammelaufrufe (BCAPClient.call_many)
+_FUNC_CONTROLLER_GETVARIABLE = 9
+_FUNC_CONTROLLER_EXECUTE = 17
+_FUNC_VARIABLE_GETVALUE = 101
+_FUNC_VARIABLE_PUTVALUE = 102
+_FUNC_VARIABLE_RELEASE = 111
+
+
+class ReconnectingError(RuntimeError):
+    """Circuit Breaker offen: Controller nicht erreichbar, Reconnect läuft (Aufruf sofort abgewiesen)."""
 
 
 class DensoRC8Controller:
@@ -16,14 +40,50 @@ class DensoRC8Controller:
     _ERR_CODE_VAR = "@ERROR_CODE"
     _ERR_DESC_VAR = "@ERROR_DESCRIPTION"
     _CUR_POS_VAR = "@CURRENT_POSITION"
-
-    def __init__(self):
+    _STOP_MODES = {"default_stop": 0, "instant_stop": 1, "step_stop": 2, "cycle_stop": 3}
+    _STOP_LATENCY_SAMPLES = 1000
+    # HRESULTs, nach denen ein gecachtes Variablen-Handle verworfen wird
+    _STALE_HANDLE_ERRORS = (HResult.E_HANDLE, HResult.E_CAO_OBJECT_NOTFOUND)
+    _VARIABLE_PREFIXES = ("I", "F", "S", "IO", "P", "J", "V")
+    # max. Variablen pro Bulk-Aufruf
+    _BULK_MAX = 10000
+    # Cache HRESULT -> GetErrorDescription-Text (Texte hängen nur von der Firmware ab)
+    _ERROR_DESC_CACHE_SIZE = 256
+    _ERROR_DESC_TTL_S = 3600.0
+    # Reconnect: Wartezeit vor dem 1. Versuch, danach verdoppelt bis max.
+    _RECONNECT_INITIAL_DELAY_S = 0.2
+    _RECONNECT_MAX_DELAY_S = 10.0
+
+    def __init__(
+        self,
+        sessions: int = 1,
+        stop_session: bool = True,
+        variable_cache_size: int = 64,
+        status_fast_interval: float = 0.02,
+        status_idle_interval: float = 1.0,
+        auto_reconnect: bool = True,
+        breaker_threshold: int = 3,
+        call_stats: bool = False,
+    ):
         # Verbindungs-Parameter
         self.ip: Optional[str] = None
         self.port: Optional[int] = None
         self.timeout: Optional[int] = None
+        # Anzahl paralleler b-CAP Sessions (Session 0 = self.bcap / self.h_ctrl)
+        self.sessions: int = sessions
+        # eigene b-CAP Session nur für Stop/Halt (Priority Lane)
+        self.use_stop_session: bool = stop_session
+        # max. gecachte Variablen-Handles pro Session (0 = kein Cache, Handle pro Zugriff)
+        self.variable_cache_size: int = variable_cache_size
+        # Circuit Breaker + automatischer Reconnect (mit Back-off) bei Verbindungsverlust;
+        # False = altes Verhalten (jeder Aufruf wartet ggf. den vollen Timeout ab)
+        self.auto_reconnect: bool = auto_reconnect
+
+        # Aufrufstatistik pro b-CAP Funktions-ID über alle Sessions (None = aus, kostet dann nichts)
+        self.call_stats: Optional[BCAPCallStats] = BCAPCallStats() if call_stats else None
 
         # b-CAP Objekte
+        self.pool: Optional[BCAPSessionPool] = None
         self.bcap: Optional[bcapclient.BCAPClient] = None
         self.h_ctrl: Any = None
         self.Robot: Any = None  # halten wir als einziges Handle dauerhaft
@@ -36,48 +96,117 @@ class DensoRC8Controller:
         # Thread-Schutz v. a. für Task-Handles
         self._lock = threading.RLock()
 
+        # Stop-Lane: eigene Handles auf der Stop-Session, eigener Lock
+        # (wartet nie auf self._lock bzw. die primäre Session)
+        self._stop_lock = threading.Lock()
+        self._stop_task_handles: Dict[str, Any] = {}
+        self._stop_robot: Any = None
+        # (Operation, Sekunden) der letzten Stop-Aufrufe
+        self._stop_latencies: Deque[Tuple[str, float]] = deque(maxlen=self._STOP_LATENCY_SAMPLES)
+
+        # Variablen-Handle-Cache (Inhalt liegt pro Session in session.variables)
+        self._var_lock = threading.Lock()
+        self._var_hits = 0
+        self._var_misses = 0
+
+        # Reconnect-Supervisor; der Circuit Breaker öffnet nach breaker_threshold
+        # Transportfehlern in Folge, die Reconnect-Versuche sind seine Probes
+        self.breaker = CircuitBreaker(threshold=breaker_threshold)
+        self._reconnect_stop = threading.Event()
+        self._reconnect_lock = threading.Lock()
+        self._reconnect_thread: Optional[threading.Thread] = None
+        self._reconnect_attempts = 0
+        self._reconnect_next_at = 0.0
+        self._reconnect_reason = ""
+        self.reconnects = 0
+
+        # RC8-Fehlerstack im Hintergrund (Fehlerdetails ohne Warten im Aufrufer)
+        self.error_collector = ErrorStackCollector(self)
+
+        # HRESULT -> (Ablaufzeit monotonic, Beschreibung), LRU-Reihenfolge
+        self._err_desc: "OrderedDict[int, Tuple[float, str]]" = OrderedDict()
+        self._err_desc_lock = threading.Lock()
+        self._err_desc_hits = 0
+        self._err_desc_misses = 0
+
+        # ein gemeinsamer @STATUS-Poller für StartProgram-Instanzen und die STATUS-Property
+        # (adaptiv: schnell nach Start/Statuswechsel, Back-off bis status_idle_interval)
+        self.status_hub = TaskStatusHub(
+            self, fast_interval=status_fast_interval, idle_interval=status_idle_interval
+        )
+
     # ---------------------- Verbindung ----------------------
 
-    def configure_connection(self, ip: str, port: int, timeout: int):
+    def configure_connection(self, ip: str, port: int, timeout: int, sessions: Optional[int] = None):
         self.ip = ip
         self.port = port
         self.timeout = timeout
+        if sessions is not None:
+            self.sessions = sessions
 
     def _require(self):
+        if not self.breaker.closed:
+            raise ReconnectingError(self.reconnect_message())
         if self.bcap is None or self.h_ctrl is None:
             raise RuntimeError("Controller not started. Call start() first.")
 
     def start(self):
         """
-        Baut die b-CAP Verbindung + Controller-Handle auf.
-        KEINE Variable-Handles werden global gecached; alle Variablen-Handles
-        werden bei Bedarf pro Zugriff geholt und sofort wieder freigegeben.
+        Baut die b-CAP Sessions (je service_start + controller_connect) auf.
+        Session 0 ist die primäre Session (self.bcap / self.h_ctrl) für Robot-
+        und Task-Handles; Variablenzugriffe laufen über die am wenigsten
+        belastete Session.
+        Variablen-Handles werden pro Session in einem LRU-Cache gehalten
+        (variable_cache_size); nach einem Neustart beginnen alle Caches leer.
         """
         if not all([self.ip, self.port, self.timeout]):
             raise RuntimeError("Connection not configured. Call configure_connection() first.")
         try:
-            self.bcap = bcapclient.BCAPClient(host=self.ip, port=self.port, timeout=self.timeout)
-            self.bcap.service_start('')
+            self.stop()
 
             # Provider/Machine/Option wie bisher:
-            self.h_ctrl = self.bcap.controller_connect(
-                name='',
+            self.pool = BCAPSessionPool(
+                ip=self.ip,
+                port=self.port,
+                timeout=self.timeout,
+                size=self.sessions,
                 provider='CaoProv.DENSO.VRC',
                 machine='localhost',
-                option=''
+                stop_session=self.use_stop_session,
+                on_success=self.note_success,
+                on_failure=self.note_failure,
+                call_stats=self.call_stats,
             )
+            self.pool.open()
+            self.bcap = self.pool.primary.bcap
+            self.h_ctrl = self.pool.primary.h_ctrl
 
-            logging.info("Controller connected (on-demand variable handles, no caching).")
+            logging.info("Controller connected (%d b-CAP session(s), on-demand variable handles).", self.sessions)
 
             # Robot-Handle optional lazy holen – wir machen es hier direkt,
             # behalten aber nur dieses eine Robot-Objekt.
             try:
-                self.Robot = self.bcap.controller_getrobot(self.h_ctrl, "Arm", "")
+                with self.pool.acquire(self.pool.primary) as session:
+                    self.Robot = session.bcap.controller_getrobot(session.h_ctrl, "Arm", "")
                 logging.info("Robot handle initialized.")
             except ORiNException as e:
                 logging.warning("Could not get Robot handle at startup: %r", e)
                 # Robot wird bei Bedarf in get_pos_value() nachgezogen
 
+            # Robot-Handle der Stop-Lane vorab holen -> halt_robot() braucht nur einen Round-Trip
+            if self.pool.stop_session is not None:
+                try:
+                    with self._stop_lock:
+                        self._stop_robot_handle(self.pool.stop_session)
+                except ORiNException as e:
+                    logging.warning("Could not get Robot handle for stop session: %r", e)
+
+            # Fehlertexte der bekannten HRESULTs vorab holen (ein gepipelinter Aufruf)
+            self.prefill_error_descriptions()
+
+            self.status_hub.start()
+            self.error_collector.start()
+
         except ORiNException as e:
             logging.error(f"ORiNException during startup: {e}")
             self._log_error_description()
@@ -87,25 +216,501 @@ class DensoRC8Controller:
             self._log_error_description()
             raise
 
+    def stop(self):
+        """
+        Schließt alle b-CAP Sessions (Handles werden freigegeben, Caches verworfen).
+        """
+        self._stop_reconnect()
+        self.status_hub.stop()
+        self.error_collector.stop()
+        with self._lock:
+            pool, self.pool = self.pool, None
+            self.bcap = None
+            self.h_ctrl = None
+            self.Robot = None
+            self.task_handles.clear()
+            self.task_status_vars.clear()
+        with self._stop_lock:
+            self._stop_task_handles.clear()
+            self._stop_robot = None
+        if pool is not None:
+            pool.close()
+
+    # ---------------------- Reconnect ----------------------
+
+    @property
+    def reconnecting(self) -> bool:
+        return not self.breaker.closed
+
+    @staticmethod
+    def is_transport_error(exc: BaseException) -> bool:
+        """
+        Verbindungsfehler (Socket, Peer weg, b-CAP Timeout, ungültiger Frame im Empfangsstrom)
+        – nicht: Controller meldet Fehler.
+        """
+        if isinstance(exc, ReconnectingError):
+            return False
+        if isinstance(exc, ORiNException):
+            return exc.hresult in (HResult.E_TIMEOUT, HResult.E_INVALIDPACKET)
+        return isinstance(exc, (OSError, ConnectionError))
+
+    def note_success(self):
+        """Controller hat geantwortet -> Fehlerzähler des Circuit Breakers zurücksetzen."""
+        self.breaker.record_success()
+
+    def note_failure(self, exc: BaseException):
+        """
+        Von Aufrufern/Hintergrund-Threads gemeldete Exception. Eine ORiN-Fehlerantwort
+        zählt als Lebenszeichen; Transportfehler zählen für den Circuit Breaker
+        (Socket zu/Peer weg öffnet sofort, Timeouts erst nach breaker_threshold in Folge).
+        """
+        if not self.auto_reconnect or self.pool is None or isinstance(exc, ReconnectingError):
+            return
+        # dieselbe Exception kann mehrfach gemeldet werden (Pool und SiLA-Wrapper)
+        if getattr(exc, "_breaker_counted", False):
+            return
+        try:
+            exc._breaker_counted = True
+        except AttributeError:
+            pass
+        if not self.is_transport_error(exc):
+            if isinstance(exc, ORiNException):
+                self.breaker.record_success()
+            return
+        # nach einem ungültigen Frame ist der Strom nicht mehr synchron -> sofort neu verbinden
+        fatal = not isinstance(exc, ORiNException) or exc.hresult == HResult.E_INVALIDPACKET
+        if self.breaker.record_failure(repr(exc), fatal=fatal):
+            self.connection_lost(exc)
+
+    def connection_lost(self, exc: Optional[BaseException] = None):
+        """
+        Verbindung als verloren markieren (Circuit Breaker offen): neue Aufrufe
+        scheitern sofort mit ReconnectingError, blockierte Aufrufe werden
+        abgebrochen, und ein Hintergrund-Thread verbindet mit exponentiellem
+        Back-off neu (jeder Versuch ist eine Probe; Erfolg schließt den Breaker).
+        """
+        with self._reconnect_lock:
+            if self.pool is None:
+                return
+            if self._reconnect_thread is not None:
+                return
+            if self.breaker.closed:
+                self.breaker.record_failure(repr(exc), fatal=True)
+            self._reconnect_stop.clear()
+            self._reconnect_attempts = 0
+            self._reconnect_next_at = time.monotonic() + self._RECONNECT_INITIAL_DELAY_S
+            self._reconnect_reason = repr(exc) if exc is not None else "connection lost"
+            logging.warning("b-CAP connection lost (%s) -> reconnecting.", self._reconnect_reason)
+            self.pool.interrupt()
+            self._reconnect_thread = threading.Thread(
+                target=self._reconnect_loop, name="BCAPReconnect", daemon=True
+            )
+            self._reconnect_thread.start()
+
+    def reconnect_message(self) -> str:
+        """Text für abgewiesene Aufrufe (Breaker offen)."""
+        wait = max(0.0, self._reconnect_next_at - time.monotonic())
+        return (
+            f"Controller not reachable, circuit open ({self._reconnect_reason}); reconnecting "
+            f"(attempt {self._reconnect_attempts + 1}, next in {wait:.1f} s)"
+        )
+
+    def reconnect_stats(self) -> Dict[str, Any]:
+        stats = self.breaker.stats()
+        stats.update(
+            {
+                "reconnecting": not self.breaker.closed,
+                "attempts": self._reconnect_attempts,
+                "reconnects": self.reconnects,
+                "last_reason": self._reconnect_reason,
+            }
+        )
+        return stats
+
+    def _reconnect_loop(self):
+        delay = self._RECONNECT_INITIAL_DELAY_S
+        while not self._reconnect_stop.wait(max(0.0, self._reconnect_next_at - time.monotonic())):
+            self._reconnect_attempts += 1
+            self.breaker.half_open()
+            try:
+                self._rehydrate()
+            except Exception as e:
+                self.breaker.probe_failed(repr(e))
+                delay = min(delay * 2, self._RECONNECT_MAX_DELAY_S)
+                self._reconnect_next_at = time.monotonic() + delay
+                logging.warning(
+                    "Reconnect attempt %d failed: %r (next in %.1f s)", self._reconnect_attempts, e, delay
+                )
+                continue
+            with self._reconnect_lock:
+                self._reconnect_thread = None
+                self.reconnects += 1
+                self.breaker.close()
+            logging.info("b-CAP connection restored after %d attempt(s).", self._reconnect_attempts)
+            self.status_hub.kick()
+            return
+
+    def _stop_reconnect(self):
+        self._reconnect_stop.set()
+        with self._reconnect_lock:
+            thread, self._reconnect_thread = self._reconnect_thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.timeout or 5)
+        self.breaker.reset()
+
+    def _rehydrate(self):
+        """
+        Neuen Session-Pool öffnen, Robot-, Task- und @STATUS-Handles (auch die der
+        Stop-Lane) neu holen und erst danach gemeinsam gegen die alten tauschen.
+        Variablen-Handles werden nicht neu geholt (Cache der neuen Sessions ist leer).
+        """
+        with self._lock:
+            program_names = sorted(set(self.task_handles) | set(self.task_status_vars))
+        with self._stop_lock:
+            stop_program_names = sorted(self._stop_task_handles)
+
+        pool = BCAPSessionPool(
+            ip=self.ip,
+            port=self.port,
+            timeout=self.timeout,
+            size=self.sessions,
+            provider='CaoProv.DENSO.VRC',
+            machine='localhost',
+            stop_session=self.use_stop_session,
+            on_success=self.note_success,
+            on_failure=self.note_failure,
+            call_stats=self.call_stats,
+        )
+        pool.open()
+        try:
+            primary = pool.primary
+            try:
+                robot = primary.bcap.controller_getrobot(primary.h_ctrl, "Arm", "")
+            except ORiNException as e:
+                logging.warning("Could not get Robot handle after reconnect: %r", e)
+                robot = None
+            task_handles: Dict[str, Any] = {}
+            status_vars: Dict[str, Any] = {}
+            for name in program_names:
+                h_task = primary.bcap.controller_gettask(primary.h_ctrl, name, "")
+                task_handles[name] = h_task
+                status_vars[name] = primary.bcap.task_getvariable(h_task, self._STATUS_VAR, "")
+
+            stop_robot = None
+            stop_task_handles: Dict[str, Any] = {}
+            if pool.stop_session is not None:
+                stop = pool.stop_session
+                stop_robot = stop.bcap.controller_getrobot(stop.h_ctrl, "Arm", "")
+                for name in stop_program_names:
+                    stop_task_handles[name] = stop.bcap.controller_gettask(stop.h_ctrl, name, "")
+        except Exception:
+            pool.close()
+            raise
+
+        with self._lock, self._stop_lock:
+            # stop() kam dazwischen -> neue Verbindung verwerfen
+            aborted = self._reconnect_stop.is_set() or self.pool is None
+            if not aborted:
+                old_pool, self.pool = self.pool, pool
+                self.bcap = primary.bcap
+                self.h_ctrl = primary.h_ctrl
+                self.Robot = robot
+                self.task_handles.clear()
+                self.task_handles.update(task_handles)
+                self.task_status_vars.clear()
+                self.task_status_vars.update(status_vars)
+                self._stop_task_handles.clear()
+                self._stop_task_handles.update(stop_task_handles)
+                self._stop_robot = stop_robot
+        if aborted:
+            pool.close()
+            raise RuntimeError("Reconnect aborted (controller stopped)")
+        old_pool.abandon()
+
     # ---------------------- kleine Helper für Variablen ----------------------
 
     def _with_controller_variable(self, name: str, op, log_prefix: str = ""):
         """
-        Hole einen Controller-Variablenhandle, führe Operation aus, release immer.
+        Hole einen Controller-Variablenhandle (aus dem Cache der Session oder neu),
+        führe Operation aus. Ohne Cache wird der Handle danach immer freigegeben.
 
-        op: Callable(handle) -> Any
+        op: Callable(session, handle) -> Any
+        Handle und Operation laufen auf derselben (am wenigsten belasteten) Session.
         """
         self._require()
-        h_var = None
+        with self.pool.acquire() as session:
+            if self.variable_cache_size <= 0:
+                h_var = None
+                try:
+                    h_var = session.bcap.controller_getvariable(session.h_ctrl, name, "")
+                    session.track(h_var)
+                    return op(session, h_var)
+                finally:
+                    if h_var is not None:
+                        session.untrack(h_var)
+                        try:
+                            session.bcap.variable_release(h_var)
+                        except Exception as e:
+                            logging.debug("variable_release(%s) failed: %r", name, e)
+
+            return self._with_cached_handle(
+                session, name, lambda: session.bcap.controller_getvariable(session.h_ctrl, name, ""), op
+            )
+
+    def _with_cached_handle(self, session: BCAPSession, key: str, fetch: Callable[[], Any], op):
+        """
+        op(session, handle) mit gecachtem Handle; ist der Handle ungültig geworden
+        (E_HANDLE / E_CAO_OBJECT_NOTFOUND), wird er verworfen und einmal neu geholt.
+        """
+        h_var = self._cached_handle(session, key, fetch)
         try:
-            h_var = self.bcap.controller_getvariable(self.h_ctrl, name, "")
-            return op(h_var)
-        finally:
+            return op(session, h_var)
+        except ORiNException as e:
+            if e.hresult not in self._STALE_HANDLE_ERRORS:
+                raise
+            logging.info("Cached handle for '%s' is stale (%d) -> resolve fresh", key, e.hresult)
+            self._drop_cached_handle(session, key, h_var)
+            h_var = self._cached_handle(session, key, fetch)
+            return op(session, h_var)
+
+    def _cached_handle(self, session: BCAPSession, key: str, fetch: Callable[[], Any]) -> Any:
+        with self._var_lock:
+            h_var = session.variables.get(key)
             if h_var is not None:
-                try:
-                    self.bcap.variable_release(h_var)
-                except Exception as e:
-                    logging.debug("variable_release(%s) failed: %r", name, e)
+                session.variables.move_to_end(key)
+                self._var_hits += 1
+                return h_var
+            self._var_misses += 1
+
+        h_var = fetch()
+        evicted = []
+        with self._var_lock:
+            other = session.variables.get(key)
+            if other is not None:
+                # parallel schon geholt -> eigenen Handle wieder abgeben
+                evicted.append(h_var)
+                h_var = other
+            else:
+                session.variables[key] = h_var
+                session.track(h_var)
+                while len(session.variables) > self.variable_cache_size:
+                    (_, old) = session.variables.popitem(last=False)
+                    session.untrack(old)
+                    evicted.append(old)
+
+        for old in evicted:
+            try:
+                session.bcap.variable_release(old)
+            except Exception as e:
+                logging.debug("variable_release(%r) on eviction failed: %r", old, e)
+        return h_var
+
+    def _drop_cached_handle(self, session: BCAPSession, key: str, h_var: Any):
+        # ungültige Handles nicht mehr freigeben, nur vergessen
+        with self._var_lock:
+            if session.variables.get(key) == h_var:
+                del session.variables[key]
+            session.untrack(h_var)
+
+    def _bulk_handles(self, session: BCAPSession, names: List[str]) -> Tuple[Dict[str, Any], Dict[str, Exception], List[Tuple[str, Any]]]:
+        """
+        Handles für viele Variablen auf einmal: Treffer aus dem Cache, fehlende
+        per call_many(controller_getvariable) in einem Rutsch.
+        Rückgabe: (Name -> Handle, Name -> Fehler, frisch geholte (Name, Handle)).
+        """
+        handles: Dict[str, Any] = {}
+        with self._var_lock:
+            if self.variable_cache_size > 0:
+                for name in names:
+                    h_var = session.variables.get(name)
+                    if h_var is not None:
+                        session.variables.move_to_end(name)
+                        handles[name] = h_var
+                        self._var_hits += 1
+
+        missing = [name for name in dict.fromkeys(names) if name not in handles]
+        errors: Dict[str, Exception] = {}
+        fresh: List[Tuple[str, Any]] = []
+        if missing:
+            results = session.bcap.call_many(
+                [(_FUNC_CONTROLLER_GETVARIABLE, [session.h_ctrl, name, ""]) for name in missing]
+            )
+            with self._var_lock:
+                self._var_misses += len(missing)
+                for name, result in zip(missing, results):
+                    if isinstance(result, Exception):
+                        errors[name] = result
+                    else:
+                        handles[name] = result[0]
+                        fresh.append((name, result[0]))
+                        session.track(result[0])
+        return handles, errors, fresh
+
+    def _bulk_done(self, session: BCAPSession, fresh: List[Tuple[str, Any]]):
+        """
+        Frisch geholte Handles nach einem Sammelaufruf in den Cache übernehmen
+        (LRU-Verdrängung) bzw. ohne Cache direkt wieder freigeben.
+        """
+        release: List[Any] = []
+        with self._var_lock:
+            for name, h_var in fresh:
+                if self.variable_cache_size <= 0 or name in session.variables:
+                    session.untrack(h_var)
+                    release.append(h_var)
+                    continue
+                session.variables[name] = h_var
+            while len(session.variables) > max(self.variable_cache_size, 0):
+                (_, old) = session.variables.popitem(last=False)
+                session.untrack(old)
+                release.append(old)
+        if release:
+            session.bcap.call_many([(_FUNC_VARIABLE_RELEASE, [h_var]) for h_var in release])
+
+    def _read_many(self, prefix: str, indices: List[int]) -> List[Any]:
+        """
+        Liest mehrere Variablen (z. B. I10..I19) über eine Session mit
+        gepipelineten b-CAP Requests; Handles kommen aus dem Cache.
+        """
+        self._require()
+        names = [f"{prefix}{i}" for i in indices]
+        with self.pool.acquire() as session:
+            handles, errors, fresh = self._bulk_handles(session, names)
+            try:
+                for name in names:
+                    if name in errors:
+                        raise errors[name]
+                results = session.bcap.call_many([(_FUNC_VARIABLE_GETVALUE, [handles[name]]) for name in names])
+            finally:
+                self._bulk_done(session, fresh)
+
+            values: List[Any] = []
+            fresh_handles = {h_var for _, h_var in fresh}
+            for name, result in zip(names, results):
+                if isinstance(result, ORiNException):
+                    if result.hresult in self._STALE_HANDLE_ERRORS and handles[name] not in fresh_handles:
+                        # gecachter Handle ungültig -> einzeln neu auflösen
+                        self._drop_cached_handle(session, name, handles[name])
+                        result = [self._with_cached_handle(
+                            session,
+                            name,
+                            lambda n=name: session.bcap.controller_getvariable(session.h_ctrl, n, ""),
+                            lambda s, h: s.bcap.variable_getvalue(h),
+                        )]
+                    else:
+                        raise result
+                values.append(result[0])
+
+        logging.info("%s read: %d values from index %d.", prefix, len(values), indices[0])
+        return values
+
+    def get_values(self, prefix: str, start_index: int, count: int) -> List[Any]:
+        """
+        Bulk-Read: `count` aufeinanderfolgende Variablen `prefix`[start_index] ...
+        (prefix: "I", "F", "S", "IO", "P", "J", "V").
+        """
+        if prefix not in self._VARIABLE_PREFIXES:
+            raise ValueError(f"Invalid variable type: {prefix}. allowed: {list(self._VARIABLE_PREFIXES)}")
+        if count < 0 or start_index < 0:
+            raise ValueError("StartIndex and Count must be >= 0")
+        if count > self._BULK_MAX:
+            raise ValueError(f"Count must be <= {self._BULK_MAX}")
+        if count == 0:
+            return []
+        return self._read_many(prefix, list(range(start_index, start_index + count)))
+
+    def set_values(self, prefix: str, indices: List[int], values: List[Any]) -> List[str]:
+        """
+        Bulk-Write: schreibt values[k] nach `prefix`[indices[k]] über eine Session
+        (getvariable/putvalue gepipelined, Handles aus dem Cache).
+        Rückgabe: pro Element "" bei Erfolg, sonst Fehlertext; ein Fehler stoppt die übrigen nicht.
+        Werte, die sich nicht kodieren lassen (z. B. 2**40 für I), werden nicht gesendet.
+        """
+        self._require()
+        if prefix not in self._VARIABLE_PREFIXES:
+            raise ValueError(f"Invalid variable type: {prefix}. allowed: {list(self._VARIABLE_PREFIXES)}")
+        if len(indices) != len(values):
+            raise ValueError(f"Indices ({len(indices)}) and Values ({len(values)}) must have the same length")
+        if len(indices) > self._BULK_MAX:
+            raise ValueError(f"At most {self._BULK_MAX} values per call")
+        if not indices:
+            return []
+
+        names = [f"{prefix}{i}" for i in indices]
+        errors: List[str] = [""] * len(names)
+        with self.pool.acquire() as session:
+            handles, get_errors, fresh = self._bulk_handles(session, names)
+            try:
+                todo = [k for k, name in enumerate(names) if name in handles]
+                results = session.bcap.call_many(
+                    [(_FUNC_VARIABLE_PUTVALUE, [handles[names[k]], values[k]]) for k in todo]
+                )
+            finally:
+                self._bulk_done(session, fresh)
+
+            for k, name in enumerate(names):
+                if name in get_errors:
+                    errors[k] = self._element_error(name, get_errors[name])
+            fresh_handles = {h_var for _, h_var in fresh}
+            for k, result in zip(todo, results):
+                if not isinstance(result, Exception):
+                    continue
+                name = names[k]
+                if (
+                    isinstance(result, ORiNException)
+                    and result.hresult in self._STALE_HANDLE_ERRORS
+                    and handles[name] not in fresh_handles
+                ):
+                    self._drop_cached_handle(session, name, handles[name])
+                    try:
+                        self._with_cached_handle(
+                            session,
+                            name,
+                            lambda n=name: session.bcap.controller_getvariable(session.h_ctrl, n, ""),
+                            lambda s, h, v=values[k]: s.bcap.variable_putvalue(h, v),
+                        )
+                        continue
+                    except Exception as e:
+                        result = e
+                errors[k] = self._element_error(name, result)
+
+        failed = sum(1 for e in errors if e)
+        logging.info("%s write: %d values, %d failed.", prefix, len(names), failed)
+        return errors
+
+    @staticmethod
+    def _element_error(name: str, exc: Exception) -> str:
+        hresult = getattr(exc, "hresult", None)
+        if isinstance(hresult, int):
+            return f"{name}: ORiN {hresult} (0x{hresult & 0xFFFFFFFF:08X})"
+        return f"{name}: {exc!r}"
+
+    def variable_cache_stats(self) -> Dict[str, int]:
+        with self._var_lock:
+            sessions = self.pool.sessions if self.pool is not None else []
+            return {
+                "size": sum(len(s.variables) for s in sessions),
+                "hits": self._var_hits,
+                "misses": self._var_misses,
+            }
+
+    def enable_call_stats(self) -> BCAPCallStats:
+        """Zählt ab jetzt jeden b-CAP Aufruf (Anzahl, Fehler, Bytes, Latenz-Histogramme je Funktions-ID)."""
+        if self.call_stats is None:
+            self.call_stats = BCAPCallStats()
+        if self.pool is not None:
+            self.pool.set_call_stats(self.call_stats)
+        return self.call_stats
+
+    def disable_call_stats(self):
+        self.call_stats = None
+        if self.pool is not None:
+            self.pool.set_call_stats(None)
+
+    def call_stats_snapshot(self, reset: bool = False) -> Dict[int, Dict[str, Any]]:
+        """BCAPCallStats.snapshot() (leer, wenn die Statistik aus ist)."""
+        if self.call_stats is None:
+            return {}
+        return self.call_stats.snapshot(reset=reset)
 
     # ---------------------- Position ----------------------
 
@@ -113,31 +718,44 @@ class DensoRC8Controller:
         """
         Liest @CURRENT_POSITION.
         Robot-Handle wird (falls nicht vorhanden) einmalig geholt und gehalten.
-        Positions-Variable wird pro Aufruf geholt und direkt wieder freigegeben.
+        Positions-Variable kommt aus dem Handle-Cache der primären Session.
         """
         self._require()
         # Robot-Handle lazy nachziehen, falls beim Start fehlschlug
         if self.Robot is None:
             try:
-                self.Robot = self.bcap.controller_getrobot(self.h_ctrl, "Arm", "")
+                with self.pool.acquire(self.pool.primary) as session:
+                    self.Robot = session.bcap.controller_getrobot(session.h_ctrl, "Arm", "")
                 logging.info("Robot handle resolved lazily in get_pos_value().")
             except ORiNException as e:
                 logging.error("ORiNException while getting Robot handle: %r", e)
                 self._log_error_description()
                 raise
 
-        h_pos = None
-        try:
-            h_pos = self.bcap.robot_getvariable(self.Robot, self._CUR_POS_VAR, "")
-            retval = self.bcap.variable_getvalue(h_pos)
+        # Robot-Handle gehört zur primären Session -> Affinität
+        with self.pool.acquire(self.pool.primary) as session:
+            if self.variable_cache_size <= 0:
+                h_pos = None
+                try:
+                    h_pos = session.bcap.robot_getvariable(self.Robot, self._CUR_POS_VAR, "")
+                    retval = session.bcap.variable_getvalue(h_pos)
+                    logging.info("Current position read: %s", retval)
+                    return retval
+                finally:
+                    if h_pos is not None:
+                        try:
+                            session.bcap.variable_release(h_pos)
+                        except Exception as e:
+                            logging.debug("variable_release(@CURRENT_POSITION) failed: %r", e)
+
+            retval = self._with_cached_handle(
+                session,
+                "Robot." + self._CUR_POS_VAR,
+                lambda: session.bcap.robot_getvariable(self.Robot, self._CUR_POS_VAR, ""),
+                lambda s, h: s.bcap.variable_getvalue(h),
+            )
             logging.info("Current position read: %s", retval)
             return retval
-        finally:
-            if h_pos is not None:
-                try:
-                    self.bcap.variable_release(h_pos)
-                except Exception as e:
-                    logging.debug("variable_release(@CURRENT_POSITION) failed: %r", e)
 
     # ---------------------- Task Names ----------------------
 
@@ -147,7 +765,8 @@ class DensoRC8Controller:
         StartProgram (wraps b-CAP Controller_GetTaskNames / CaoController::get_TaskNames).
         """
         self._require()
-        raw = self.bcap.controller_gettasknames(self.h_ctrl)
+        with self.pool.acquire() as session:
+            raw = session.bcap.controller_gettasknames(session.h_ctrl)
 
         if isinstance(raw, (list, tuple)):
             names = [str(x) for x in raw]
@@ -163,15 +782,15 @@ class DensoRC8Controller:
 
     def set_s_value(self, Index: int, value: str):
         name = f"S{Index}"
-        def _op(h):
-            self.bcap.variable_putvalue(h, value)
+        def _op(session, h):
+            session.bcap.variable_putvalue(h, value)
             logging.info("%s set to: %s", name, value)
         self._with_controller_variable(name, _op, log_prefix="S")
 
     def get_s_value(self, Index: int) -> str:
         name = f"S{Index}"
-        def _op(h):
-            retval = self.bcap.variable_getvalue(h)
+        def _op(session, h):
+            retval = session.bcap.variable_getvalue(h)
             logging.info("%s read: %s", name, retval)
             return retval
         return self._with_controller_variable(name, _op, log_prefix="S")
@@ -180,15 +799,15 @@ class DensoRC8Controller:
 
     def set_I_value(self, Index: int, value: int):
         name = f"I{Index}"
-        def _op(h):
-            self.bcap.variable_putvalue(h, value)
+        def _op(session, h):
+            session.bcap.variable_putvalue(h, value)
             logging.info("%s set to: %s", name, value)
         self._with_controller_variable(name, _op, log_prefix="I")
 
     def get_I_value(self, Index: int) -> int:
         name = f"I{Index}"
-        def _op(h):
-            retval = self.bcap.variable_getvalue(h)
+        def _op(session, h):
+            retval = session.bcap.variable_getvalue(h)
             logging.info("%s read: %s", name, retval)
             return retval
         return self._with_controller_variable(name, _op, log_prefix="I")
@@ -197,15 +816,15 @@ class DensoRC8Controller:
 
     def set_IO_value(self, Index: int, value: int):
         name = f"IO{Index}"
-        def _op(h):
-            self.bcap.variable_putvalue(h, value)
+        def _op(session, h):
+            session.bcap.variable_putvalue(h, value)
             logging.info("%s set to: %s", name, value)
         self._with_controller_variable(name, _op, log_prefix="IO")
 
     def get_IO_value(self, Index: int) -> int:
         name = f"IO{Index}"
-        def _op(h):
-            retval = self.bcap.variable_getvalue(h)
+        def _op(session, h):
+            retval = session.bcap.variable_getvalue(h)
             logging.info("%s read: %s", name, retval)
             return retval
         return self._with_controller_variable(name, _op, log_prefix="IO")
@@ -214,15 +833,15 @@ class DensoRC8Controller:
 
     def set_F_value(self, Index: int, value: float):
         name = f"F{Index}"
-        def _op(h):
-            self.bcap.variable_putvalue(h, value)
+        def _op(session, h):
+            session.bcap.variable_putvalue(h, value)
             logging.info("%s set to: %s", name, value)
         self._with_controller_variable(name, _op, log_prefix="F")
 
     def get_F_value(self, Index: int) -> float:
         name = f"F{Index}"
-        def _op(h):
-            retval = self.bcap.variable_getvalue(h)
+        def _op(session, h):
+            retval = session.bcap.variable_getvalue(h)
             logging.info("%s read: %s", name, retval)
             return retval
         return self._with_controller_variable(name, _op, log_prefix="F")
@@ -231,15 +850,15 @@ class DensoRC8Controller:
 
     def set_P_value(self, Index: int, value: List[float]):
         name = f"P{Index}"
-        def _op(h):
-            self.bcap.variable_putvalue(h, value)
+        def _op(session, h):
+            session.bcap.variable_putvalue(h, value)
             logging.info("%s set to: %s", name, value)
         self._with_controller_variable(name, _op, log_prefix="P")
 
     def get_P_value(self, Index: int) -> List[float]:
         name = f"P{Index}"
-        def _op(h):
-            retval = self.bcap.variable_getvalue(h)
+        def _op(session, h):
+            retval = session.bcap.variable_getvalue(h)
             logging.info("%s read: %s", name, retval)
             return retval
         return self._with_controller_variable(name, _op, log_prefix="P")
@@ -248,15 +867,15 @@ class DensoRC8Controller:
 
     def set_J_value(self, Index: int, value: List[float]):
         name = f"J{Index}"
-        def _op(h):
-            self.bcap.variable_putvalue(h, value)
+        def _op(session, h):
+            session.bcap.variable_putvalue(h, value)
             logging.info("%s set to: %s", name, value)
         self._with_controller_variable(name, _op, log_prefix="J")
 
     def get_J_value(self, Index: int) -> List[float]:
         name = f"J{Index}"
-        def _op(h):
-            retval = self.bcap.variable_getvalue(h)
+        def _op(session, h):
+            retval = session.bcap.variable_getvalue(h)
             logging.info("%s read: %s", name, retval)
             return retval
         return self._with_controller_variable(name, _op, log_prefix="J")
@@ -265,15 +884,15 @@ class DensoRC8Controller:
 
     def set_V_value(self, Index: int, value: List[float]):
         name = f"V{Index}"
-        def _op(h):
-            self.bcap.variable_putvalue(h, value)
+        def _op(session, h):
+            session.bcap.variable_putvalue(h, value)
             logging.info("%s set to: %s", name, value)
         self._with_controller_variable(name, _op, log_prefix="V")
 
     def get_V_value(self, Index: int) -> List[float]:
         name = f"V{Index}"
-        def _op(h):
-            retval = self.bcap.variable_getvalue(h)
+        def _op(session, h):
+            retval = session.bcap.variable_getvalue(h)
             logging.info("%s read: %s", name, retval)
             return retval
         return self._with_controller_variable(name, _op, log_prefix="V")
@@ -289,12 +908,13 @@ class DensoRC8Controller:
         if program_name.lower().endswith(".pcs"):
             program_name = program_name[:-4]
 
-        with self._lock:
+        # Task-Handles gehören zur primären Session -> Affinität
+        with self._lock, self.pool.acquire(self.pool.primary) as session:
             h_cached = self.task_handles.get(program_name)
             v_cached = self.task_status_vars.get(program_name)
             if h_cached and v_cached:
                 try:
-                    _ = self.bcap.variable_getvalue(v_cached)
+                    _ = session.bcap.variable_getvalue(v_cached)
                     self.current_program_name = program_name
                     logging.info("Program '%s' reused (cached).", program_name)
                     return
@@ -302,8 +922,8 @@ class DensoRC8Controller:
                     logging.info("Program '%s' cached handle stale -> resolve fresh", program_name)
 
             try:
-                h_task = self.bcap.controller_gettask(self.h_ctrl, program_name, "")
-                v_status = self.bcap.task_getvariable(h_task, self._STATUS_VAR, "")
+                h_task = session.bcap.controller_gettask(session.h_ctrl, program_name, "")
+                v_status = session.bcap.task_getvariable(h_task, self._STATUS_VAR, "")
                 if not v_status:
                     raise RuntimeError(f"Task '{program_name}' has no {self._STATUS_VAR} variable.")
 
@@ -312,6 +932,14 @@ class DensoRC8Controller:
                 self.current_program_name = program_name
                 logging.info("Program '%s' resolved fresh.", program_name)
 
+                # Task-Handle auch auf der Stop-Session vorhalten
+                if self.pool.stop_session is not None:
+                    try:
+                        with self._stop_lock:
+                            self._stop_task_handle(self.pool.stop_session, program_name)
+                    except Exception as e:
+                        logging.debug("Stop-lane task handle for '%s' not resolved: %r", program_name, e)
+
             except ORiNException as e:
                 # -2147483131: "Object already exists" -> versuchen, Cache zu nutzen
                 try:
@@ -323,7 +951,7 @@ class DensoRC8Controller:
                     v_cached = self.task_status_vars.get(program_name)
                     if h_cached and v_cached:
                         try:
-                            _ = self.bcap.variable_getvalue(v_cached)
+                            _ = session.bcap.variable_getvalue(v_cached)
                             self.current_program_name = program_name
                             logging.info("Program '%s' reused after -2147483131.", program_name)
                             return
@@ -346,49 +974,227 @@ class DensoRC8Controller:
 
         handle = self.task_handles[program_name]
         self.current_program_name = program_name
-        self.bcap.task_start(handle, mode_map[mode], "")
+        with self.pool.acquire(self.pool.primary) as session:
+            session.bcap.task_start(handle, mode_map[mode], "")
+        self.status_hub.kick()
         logging.info("Programm '%s' gestartet im Modus '%s'", program_name, mode)
 
         # @STATUS ggf. nachziehen (falls vorher nicht vorhanden)
         if program_name not in self.task_status_vars:
             try:
-                v_status = self.bcap.task_getvariable(handle, self._STATUS_VAR, "")
+                with self.pool.acquire(self.pool.primary) as session:
+                    v_status = session.bcap.task_getvariable(handle, self._STATUS_VAR, "")
                 self.task_status_vars[program_name] = v_status
             except Exception:
                 pass
 
-    def stop_program(self, program_name: str, mode: str):
+    def stop_program(self, program_name: str, mode: str, requested_at: Optional[float] = None):
+        """
+        Stoppt den Task über die Stop-Lane (eigene b-CAP Session + eigene Task-Handles).
+        Die Wartezeit ist damit nur durch andere Stop-/Halt-Aufrufe begrenzt,
+        nicht durch Variablenzugriffe, Status-Polling oder Fehler-Retries.
+        Ohne Stop-Session wird wie bisher die primäre Session benutzt.
+        requested_at (time.perf_counter()) z. B. beim Cancel: die Latenz wird dann
+        ab diesem Zeitpunkt als "cancel" gespeichert statt als "task_stop".
+        """
         self._require()
-        mode_map = {"default_stop": 0, "instant_stop": 1, "step_stop": 2, "cycle_stop": 3}
-        if mode not in mode_map:
-            raise ValueError(f"Invalid Mode: {mode}. allowed: {list(mode_map.keys())}")
-
-        if program_name not in self.task_handles:
-            self.get_program(program_name)
+        if mode not in self._STOP_MODES:
+            raise ValueError(f"Invalid Mode: {mode}. allowed: {list(self._STOP_MODES.keys())}")
+        if program_name.lower().endswith(".pcs"):
+            program_name = program_name[:-4]
 
-        handle = self.task_handles[program_name]
+        t0 = time.perf_counter() if requested_at is None else requested_at
+        session = self.pool.stop_session
+        if session is None:
+            if program_name not in self.task_handles:
+                self.get_program(program_name)
+            handle = self.task_handles[program_name]
+            with self.pool.acquire(self.pool.primary) as primary:
+                primary.bcap.task_stop(handle, self._STOP_MODES[mode], "")
+        else:
+            with self._stop_lock:
+                handle = self._stop_task_handle(session, program_name)
+                try:
+                    session.bcap.task_stop(handle, self._STOP_MODES[mode], "")
+                except ORiNException as e:
+                    if e.hresult != HResult.E_HANDLE:
+                        raise
+                    # Handle verworfen (z. B. nach Controller-Reset) -> einmal neu holen
+                    self._stop_task_handles.pop(program_name, None)
+                    handle = self._stop_task_handle(session, program_name)
+                    session.bcap.task_stop(handle, self._STOP_MODES[mode], "")
         self.current_program_name = program_name
-        self.bcap.task_stop(handle, mode_map[mode], "")
+        self._record_stop_latency("task_stop" if requested_at is None else "cancel", time.perf_counter() - t0)
+        self.status_hub.kick()
         logging.info("Programm '%s' stopped in Mode '%s'", program_name, mode)
 
+    def halt_robot(self):
+        """
+        robot_halt über die Stop-Lane (hält laufende Bewegungen an).
+        """
+        self._require()
+        t0 = time.perf_counter()
+        session = self.pool.stop_session
+        if session is None:
+            with self.pool.acquire(self.pool.primary) as session:
+                if self.Robot is None:
+                    self.Robot = session.bcap.controller_getrobot(session.h_ctrl, "Arm", "")
+                session.bcap.robot_halt(self.Robot, "")
+        else:
+            with self._stop_lock:
+                session.bcap.robot_halt(self._stop_robot_handle(session), "")
+        self._record_stop_latency("robot_halt", time.perf_counter() - t0)
+        logging.info("Robot halted.")
+
+    def _stop_task_handle(self, session: BCAPSession, program_name: str) -> Any:
+        # Aufrufer hält self._stop_lock
+        handle = self._stop_task_handles.get(program_name)
+        if handle is None:
+            handle = session.bcap.controller_gettask(session.h_ctrl, program_name, "")
+            self._stop_task_handles[program_name] = handle
+        return handle
+
+    def _stop_robot_handle(self, session: BCAPSession) -> Any:
+        # Aufrufer hält self._stop_lock
+        if self._stop_robot is None:
+            self._stop_robot = session.bcap.controller_getrobot(session.h_ctrl, "Arm", "")
+        return self._stop_robot
+
+    # ---------------------- Stop-Latenz ----------------------
+
+    def _record_stop_latency(self, op: str, seconds: float):
+        self._stop_latencies.append((op, seconds))
+        logging.debug("%s latency: %.1f ms", op, seconds * 1e3)
+
+    def stop_latency_stats(self, op: Optional[str] = None) -> Dict[str, float]:
+        """
+        Kennzahlen der letzten Stop-/Halt-Aufrufe in Millisekunden
+        (count, last_ms, p50_ms, p99_ms, max_ms); op filtert nach
+        "task_stop", "robot_halt" oder "cancel" (Cancel bis task_stop fertig).
+        """
+        recorded = [sec for name, sec in list(self._stop_latencies) if op is None or name == op]
+        samples = sorted(recorded)
+        if not samples:
+            return {"count": 0}
+        last = recorded[-1]
+
+        def _pct(p: float) -> float:
+            return samples[min(len(samples) - 1, int(p * len(samples)))] * 1e3
+
+        return {
+            "count": len(samples),
+            "last_ms": last * 1e3,
+            "p50_ms": _pct(0.50),
+            "p99_ms": _pct(0.99),
+            "max_ms": samples[-1] * 1e3,
+        }
+
     # ---------------------- Fehler-Utilities ----------------------
 
+    def clear_error(self):
+        """Controller-Fehler quittieren (ClearError über die primäre Session)."""
+        self._require()
+        with self.pool.acquire(self.pool.primary) as session:
+            session.bcap.controller_execute(session.h_ctrl, "ClearError")
+
+    @staticmethod
+    def _hresult_key(hresult: int) -> int:
+        # HRESULT als vorzeichenbehafteter 32-Bit-Wert (wie in HResult)
+        hresult = int(hresult) & 0xFFFFFFFF
+        return hresult - 0x100000000 if hresult & 0x80000000 else hresult
+
+    def _cache_error_description(self, key: int, text: str):
+        # Aufrufer hält self._err_desc_lock
+        self._err_desc[key] = (time.monotonic() + self._ERROR_DESC_TTL_S, text)
+        self._err_desc.move_to_end(key)
+        while len(self._err_desc) > self._ERROR_DESC_CACHE_SIZE:
+            self._err_desc.popitem(last=False)
+
+    def error_description(self, hresult: int) -> str:
+        """
+        Klartext zu einem HRESULT (GetErrorDescription), aus dem LRU/TTL-Cache
+        oder per Round-Trip zum Controller. "" wenn nicht verfügbar.
+        """
+        key = self._hresult_key(hresult)
+        with self._err_desc_lock:
+            entry = self._err_desc.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._err_desc.move_to_end(key)
+                self._err_desc_hits += 1
+                return entry[1]
+            self._err_desc_misses += 1
+
+        pool = self.pool
+        if pool is None or not pool.sessions:
+            return ""
+        # Best Effort, nur zur Diagnose -> nicht an den Circuit Breaker melden
+        try:
+            with pool.acquire(pool.primary, report=False) as session:
+                text = session.bcap.controller_execute(session.h_ctrl, "GetErrorDescription", key)
+        except Exception as e:
+            logging.debug("GetErrorDescription(0x%08X) failed: %r", key & 0xFFFFFFFF, e)
+            return ""
+        text = (str(text) if text is not None else "").strip()
+        with self._err_desc_lock:
+            self._cache_error_description(key, text)
+        return text
+
+    def prefill_error_descriptions(self, hresults: Optional[List[int]] = None):
+        """
+        Lädt die Beschreibungen der Fehler-HRESULTs (Default: alle aus HResult)
+        in einem gepipelinten call_many in den Cache.
+        """
+        self._require()
+        if hresults is None:
+            hresults = [
+                value for name, value in vars(HResult).items()
+                if name.isupper() and isinstance(value, int) and HResult.failed(value)
+            ]
+        keys = sorted({self._hresult_key(hr) for hr in hresults})
+        try:
+            with self.pool.acquire(self.pool.primary) as session:
+                results = session.bcap.call_many(
+                    [(_FUNC_CONTROLLER_EXECUTE, [session.h_ctrl, "GetErrorDescription", key]) for key in keys]
+                )
+        except Exception as e:
+            logging.warning("Prefilling error descriptions failed: %r", e)
+            return
+        loaded = 0
+        with self._err_desc_lock:
+            for key, result in zip(keys, results):
+                if isinstance(result, Exception):
+                    continue
+                text = result[0] if result else ""
+                self._cache_error_description(key, (str(text) if text is not None else "").strip())
+                loaded += 1
+        logging.info("Error description cache prefilled (%d of %d HRESULTs).", loaded, len(keys))
+
+    def error_description_cache_stats(self) -> Dict[str, int]:
+        with self._err_desc_lock:
+            return {"size": len(self._err_desc), "hits": self._err_desc_hits, "misses": self._err_desc_misses}
+
+    def invalidate_error_descriptions(self):
+        """Cache leeren (z. B. nach Firmware-Update des Controllers)."""
+        with self._err_desc_lock:
+            self._err_desc.clear()
+
     def _log_error_description(self):
         """
         Liest @ERROR_DESCRIPTION (Best Effort).
         """
         try:
-            if not self.h_ctrl:
+            if not self.h_ctrl or self.pool is None:
                 logging.warning("No Controller-Handle for Error Message.")
                 return
-            h_desc = self.bcap.controller_getvariable(self.h_ctrl, self._ERR_DESC_VAR, "")
-            try:
-                msg = self.bcap.variable_getvalue(h_desc)
-            finally:
+            with self.pool.acquire(self.pool.primary, report=False) as session:
+                h_desc = session.bcap.controller_getvariable(session.h_ctrl, self._ERR_DESC_VAR, "")
                 try:
-                    self.bcap.variable_release(h_desc)
-                except Exception:
-                    pass
+                    msg = session.bcap.variable_getvalue(h_desc)
+                finally:
+                    try:
+                        session.bcap.variable_release(h_desc)
+                    except Exception:
+                        pass
             if msg:
                 logging.error("RC8 %s: %s", self._ERR_DESC_VAR, msg)
             else:
@@ -400,10 +1206,21 @@ class DensoRC8Controller:
 
     def invalidate_variable_cache(self, prefix: Optional[str] = None):
         """
-        Für das neue Design ohne Variablen-Cache praktisch ein No-Op.
-        Bleibt nur drin, falls von außen aufgerufen wird.
+        Gibt gecachte Variablen-Handles frei (alle oder nur Namen mit `prefix`, z. B. "I").
         """
-        logging.info("invalidate_variable_cache(%r) called – no cached variable handles in this design.", prefix)
+        sessions = self.pool.sessions if self.pool is not None else []
+        for session in sessions:
+            with self._var_lock:
+                keys = [k for k in session.variables if prefix is None or k.startswith(prefix)]
+                handles = [session.variables.pop(k) for k in keys]
+                for h_var in handles:
+                    session.untrack(h_var)
+            for h_var in handles:
+                try:
+                    session.bcap.variable_release(h_var)
+                except Exception as e:
+                    logging.debug("variable_release(%r) failed: %r", h_var, e)
+        logging.info("Variable handle cache invalidated (prefix=%r).", prefix)
 
     def invalidate_program_cache(self, program_name: Optional[str] = None):
         with self._lock:
@@ -0,0 +1,198 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .denso_rc8_controller import DensoRC8Controller
+
+
+@dataclass(frozen=True)
+class ErrorStackSnapshot:
+    """Ein Lesevorgang des RC8-Fehlerstacks."""
+
+    version: int
+    # time.monotonic() zu Beginn des Lesevorgangs
+    taken_at: float
+    # GetCurErrorCount
+    count: int
+    # GetCurErrorInfo(0): [code, message, subcode, fileIdLine, programName, lineNo, fileId]
+    info: Optional[list] = None
+    # @ERROR_CODE/@ERROR_DESCRIPTION (nur gelesen, wenn der Stack nach einem Burst leer ist)
+    error_code: int = 0
+    error_description: str = ""
+
+    @property
+    def has_error(self) -> bool:
+        return (self.count > 0 and self.info is not None) or self.error_code != 0
+
+    def message(self) -> str:
+        if self.count > 0 and self.info is not None:
+            info = self.info
+            code = info[0] if len(info) > 0 else None
+            msg = info[1] if len(info) > 1 else ""
+            prog = info[4] if len(info) > 4 else ""
+            line = info[5] if len(info) > 5 else ""
+            details = f"RC8 error {code}: {msg}"
+            if prog or line:
+                details += f" (prog={prog}, line={line})"
+            return details
+        if self.error_code != 0:
+            return f"RC8 error {self.error_code}: {self.error_description or 'No description'}"
+        return ""
+
+
+class ErrorStackCollector:
+    """
+    Hält den RC8-Fehlerstack im Hintergrund aktuell (GetCurErrorCount /
+    GetCurErrorInfo(0) über eine Session des Pools).
+
+    - Im Leerlauf wird alle `interval` Sekunden gelesen.
+    - request_refresh() (nach einem Fehler) startet einen Burst: bis zu
+      `burst_reads` Lesevorgänge im Abstand von `burst_interval`, bis der
+      Controller einen Fehler meldet. Bleibt der Stack leer, wird am Ende
+      einmal @ERROR_CODE/@ERROR_DESCRIPTION gelesen.
+    - snapshot() liefert sofort den letzten Stand, wait_for() wartet auf den
+      ersten Stand nach einem Zeitpunkt (für nachgelieferte Fehlerdetails).
+    Kein gRPC-Handler muss dafür schlafen oder auf den Controller warten.
+    """
+
+    def __init__(
+        self,
+        controller: "DensoRC8Controller",
+        interval: float = 1.0,
+        burst_interval: float = 0.08,
+        burst_reads: int = 6,
+    ):
+        self.controller = controller
+        self.interval = interval
+        self.burst_interval = burst_interval
+        self.burst_reads = burst_reads
+
+        self._cond = threading.Condition()
+        self._snapshot: Optional[ErrorStackSnapshot] = None
+        self._version = 0
+        # verbleibende Burst-Lesevorgänge; Zeitpunkt des letzten Burst-Endes
+        self._burst_left = 0
+        self._burst_done_at = 0.0
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+
+    # ---------------------- Lifecycle ----------------------
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ErrorStackCollector", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=max(1.0, self.interval * 2))
+        with self._cond:
+            self._snapshot = None
+            self._burst_left = 0
+            self._cond.notify_all()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            with self._cond:
+                final_burst_read = self._burst_left == 1
+            try:
+                self.read_once(final_burst_read=final_burst_read)
+            except Exception as e:
+                logging.debug("Error stack read failed: %r", e)
+                self.controller.note_failure(e)
+            with self._cond:
+                if self._burst_left > 0:
+                    has_error = self._snapshot is not None and self._snapshot.has_error
+                    self._burst_left = 0 if has_error else self._burst_left - 1
+                    if self._burst_left == 0:
+                        self._burst_done_at = time.monotonic()
+                        self._cond.notify_all()
+                wait_s = self.burst_interval if self._burst_left > 0 else self.interval
+            self._wake.wait(wait_s)
+            self._wake.clear()
+
+    # ---------------------- Zugriff ----------------------
+
+    def request_refresh(self) -> float:
+        """Burst anstoßen (z. B. nach einer ORiNException). Liefert den Anfragezeitpunkt (monotonic)."""
+        requested_at = time.monotonic()
+        with self._cond:
+            self._burst_left = self.burst_reads
+        self._wake.set()
+        return requested_at
+
+    def snapshot(self) -> Optional[ErrorStackSnapshot]:
+        with self._cond:
+            return self._snapshot
+
+    def wait_for(self, since: float, timeout: float) -> Optional[ErrorStackSnapshot]:
+        """
+        Wartet auf einen Stand, der nach `since` gelesen wurde und einen Fehler
+        enthält bzw. auf das Ende des Bursts. Liefert den letzten Stand (ggf. None).
+        """
+
+        def _ready() -> bool:
+            snap = self._snapshot
+            if snap is None or snap.taken_at < since:
+                return False
+            return snap.has_error or (self._burst_left == 0 and self._burst_done_at >= since)
+
+        with self._cond:
+            self._cond.wait_for(_ready, timeout=timeout)
+            return self._snapshot
+
+    # ---------------------- Lesen ----------------------
+
+    def read_once(self, final_burst_read: bool = False) -> Optional[ErrorStackSnapshot]:
+        pool = self.controller.pool
+        if pool is None or not pool.sessions or self.controller.reconnecting:
+            return None
+        taken_at = time.monotonic()
+        with pool.acquire() as session:
+            bcap, h_ctrl = session.bcap, session.h_ctrl
+            count = int(bcap.controller_execute(h_ctrl, "GetCurErrorCount", "") or 0)
+            info = bcap.controller_execute(h_ctrl, "GetCurErrorInfo", 0) if count > 0 else None
+            error_code, error_description = 0, ""
+            if count == 0 and final_burst_read:
+                error_code, error_description = self._read_error_variables(bcap, h_ctrl)
+        self.controller.note_success()
+
+        with self._cond:
+            self._version += 1
+            snap = ErrorStackSnapshot(
+                version=self._version,
+                taken_at=taken_at,
+                count=count,
+                info=list(info) if info is not None else None,
+                error_code=error_code,
+                error_description=error_description,
+            )
+            self._snapshot = snap
+            self._cond.notify_all()
+        return snap
+
+    def _read_error_variables(self, bcap, h_ctrl):
+        # @ERROR_CODE / @ERROR_DESCRIPTION (Handles werden wieder freigegeben)
+        values = []
+        for name in (self.controller._ERR_CODE_VAR, self.controller._ERR_DESC_VAR):
+            h_var = bcap.controller_getvariable(h_ctrl, name, "")
+            try:
+                values.append(bcap.variable_getvalue(h_var))
+            finally:
+                try:
+                    bcap.variable_release(h_var)
+                except Exception:
+                    pass
+            if name == self.controller._ERR_CODE_VAR and not values[0]:
+                return 0, ""
+        return int(values[0]), (str(values[1]) if values[1] is not None else "").strip()
@@ -0,0 +1,567 @@
+# -*- coding:utf-8 -*-
+import asyncio
+import struct
+import time
+from ctypes import c_float
+from .bcapclient import BCAPCodec, DeadlineExceeded
+from .orinexception import *
+
+class AsyncBCAPClient(BCAPCodec):
+  """
+  asyncio variant of BCAPClient on top of asyncio streams.
+
+  Uses the same codec as BCAPClient. Concurrent calls on one connection are
+  written back-to-back; a reader task matches the responses by serial number.
+
+    bcap = await AsyncBCAPClient.connect(host, port, timeout)
+    await bcap.service_start("")
+    ...
+    await bcap.close()
+
+  Like BCAPClient, every call takes an optional deadline (time.monotonic()
+  value): when it passes before the response arrived, the call raises
+  DeadlineExceeded and a late response is dropped by its serial.
+  """
+
+  def __init__(self, timeout):
+    self._serial   = 1
+    self._version  = 0
+    self._timeout  = timeout
+    self._reader   = None
+    self._writer   = None
+    self._reader_task  = None
+    self._reader_error = None
+    self._pending   = {}
+    self._executing = set()
+
+  @classmethod
+  async def connect(cls, host, port, timeout):
+    self = cls(timeout)
+    (self._reader, self._writer) = await asyncio.wait_for(
+      asyncio.open_connection(host, port), timeout)
+    self._reader_task = asyncio.ensure_future(self._read_loop())
+    return self
+
+  async def close(self):
+    if not (self._reader_task is None):
+      self._reader_task.cancel()
+      try:
+        await self._reader_task
+      except (asyncio.CancelledError, Exception):
+        pass
+      self._reader_task = None
+    if not (self._writer is None):
+      self._writer.close()
+      try:
+        await self._writer.wait_closed()
+      except OSError:
+        pass
+      self._writer = None
+    self._fail_pending(ConnectionError("b-CAP connection closed"))
+
+  async def __aenter__(self):
+    return self
+
+  async def __aexit__(self, *exc_info):
+    await self.close()
+
+  def settimeout(self, timeout):
+    self._timeout = timeout
+
+  def gettimeout(self):
+    return self._timeout
+
+  async def service_start(self, option = "", deadline = None):
+    await self._send_and_recv(1, [option], deadline)
+
+  async def service_stop(self, deadline = None):
+    await self._send_and_recv(2, [], deadline)
+
+  async def controller_connect(self, name, provider, machine, option, deadline = None):
+    return (await self._send_and_recv(3, [name, provider, machine, option], deadline))[0]
+
+  async def controller_disconnect(self, handle, deadline = None):
+    await self._send_and_recv(4, [handle], deadline)
+
+  async def controller_getextension(self, handle, name, option = "", deadline = None):
+    return (await self._send_and_recv(5, [handle, name, option], deadline))[0]
+
+  async def controller_getfile(self, handle, name, option = "", deadline = None):
+    return (await self._send_and_recv(6, [handle, name, option], deadline))[0]
+
+  async def controller_getrobot(self, handle, name, option = "", deadline = None):
+    return (await self._send_and_recv(7, [handle, name, option], deadline))[0]
+
+  async def controller_gettask(self, handle, name, option = "", deadline = None):
+    return (await self._send_and_recv(8, [handle, name, option], deadline))[0]
+
+  async def controller_getvariable(self, handle, name, option = "", deadline = None):
+    return (await self._send_and_recv(9, [handle, name, option], deadline))[0]
+
+  async def controller_getcommand(self, handle, name, option = "", deadline = None):
+    return (await self._send_and_recv(10, [handle, name, option], deadline))[0]
+
+  async def controller_getextensionnames(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(11, [handle, option], deadline))[0]
+
+  async def controller_getfilenames(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(12, [handle, option], deadline))[0]
+
+  async def controller_getrobotnames(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(13, [handle, option], deadline))[0]
+
+  async def controller_gettasknames(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(14, [handle, option], deadline))[0]
+
+  async def controller_getvariablenames(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(15, [handle, option], deadline))[0]
+
+  async def controller_getcommandnames(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(16, [handle, option], deadline))[0]
+
+  async def controller_execute(self, handle, command, param = None, deadline = None):
+    return (await self._send_and_recv(17, [handle, command, param], deadline))[0]
+
+  async def controller_getmessage(self, handle, deadline = None):
+    return (await self._send_and_recv(18, [handle], deadline))[0]
+
+  async def controller_getattribute(self, handle, deadline = None):
+    return (await self._send_and_recv(19, [handle], deadline))[0]
+
+  async def controller_gethelp(self, handle, deadline = None):
+    return (await self._send_and_recv(20, [handle], deadline))[0]
+
+  async def controller_getname(self, handle, deadline = None):
+    return (await self._send_and_recv(21, [handle], deadline))[0]
+
+  async def controller_gettag(self, handle, deadline = None):
+    return (await self._send_and_recv(22, [handle], deadline))[0]
+
+  async def controller_puttag(self, handle, newval, deadline = None):
+    await self._send_and_recv(23, [handle, newval], deadline)
+
+  async def controller_getid(self, handle, deadline = None):
+    return (await self._send_and_recv(24, [handle], deadline))[0]
+
+  async def controller_putid(self, handle, newval, deadline = None):
+    await self._send_and_recv(25, [handle, newval], deadline)
+
+  async def extension_getvariable(self, handle, name, option = "", deadline = None):
+    return (await self._send_and_recv(26, [handle, name, option], deadline))[0]
+
+  async def extension_getvariablenames(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(27, [handle, option], deadline))[0]
+
+  async def extension_execute(self, handle, command, param = None, deadline = None):
+    return (await self._send_and_recv(28, [handle, command, param], deadline))[0]
+
+  async def extension_getattribute(self, handle, deadline = None):
+    return (await self._send_and_recv(29, [handle], deadline))[0]
+
+  async def extension_gethelp(self, handle, deadline = None):
+    return (await self._send_and_recv(30, [handle], deadline))[0]
+
+  async def extension_getname(self, handle, deadline = None):
+    return (await self._send_and_recv(31, [handle], deadline))[0]
+
+  async def extension_gettag(self, handle, deadline = None):
+    return (await self._send_and_recv(32, [handle], deadline))[0]
+
+  async def extension_puttag(self, handle, newval, deadline = None):
+    await self._send_and_recv(33, [handle, newval], deadline)
+
+  async def extension_getid(self, handle, deadline = None):
+    return (await self._send_and_recv(34, [handle], deadline))[0]
+
+  async def extension_putid(self, handle, newval, deadline = None):
+    await self._send_and_recv(35, [handle, newval], deadline)
+
+  async def extension_release(self, handle, deadline = None):
+    await self._send_and_recv(36, [handle], deadline)
+
+  async def file_getfile(self, handle, name, option = "", deadline = None):
+    return (await self._send_and_recv(37, [handle, name, option], deadline))[0]
+
+  async def file_getvariable(self, handle, name, option = "", deadline = None):
+    return (await self._send_and_recv(38, [handle, name, option], deadline))[0]
+
+  async def file_getfilenames(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(39, [handle, option], deadline))[0]
+
+  async def file_getvariablenames(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(40, [handle, option], deadline))[0]
+
+  async def file_execute(self, handle, command, param = None, deadline = None):
+    return (await self._send_and_recv(41, [handle, command, param], deadline))[0]
+
+  async def file_copy(self, handle, name, option = "", deadline = None):
+    await self._send_and_recv(42, [handle, name, option], deadline)
+
+  async def file_delete(self, handle, option = "", deadline = None):
+    await self._send_and_recv(43, [handle, option], deadline)
+
+  async def file_move(self, handle, name, option = "", deadline = None):
+    await self._send_and_recv(44, [handle, name, option], deadline)
+
+  async def file_run(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(45, [handle, option], deadline))[0]
+
+  async def file_getdatecreated(self, handle, deadline = None):
+    return (await self._send_and_recv(46, [handle], deadline))[0]
+
+  async def file_getdatelastaccessed(self, handle, deadline = None):
+    return (await self._send_and_recv(47, [handle], deadline))[0]
+
+  async def file_getdatelastmodified(self, handle, deadline = None):
+    return (await self._send_and_recv(48, [handle], deadline))[0]
+
+  async def file_getpath(self, handle, deadline = None):
+    return (await self._send_and_recv(49, [handle], deadline))[0]
+
+  async def file_getsize(self, handle, deadline = None):
+    return (await self._send_and_recv(50, [handle], deadline))[0]
+
+  async def file_gettype(self, handle, deadline = None):
+    return (await self._send_and_recv(51, [handle], deadline))[0]
+
+  async def file_getvalue(self, handle, deadline = None):
+    return (await self._send_and_recv(52, [handle], deadline))[0]
+
+  async def file_putvalue(self, handle, newval, deadline = None):
+    await self._send_and_recv(53, [handle, newval], deadline)
+
+  async def file_getattribute(self, handle, deadline = None):
+    return (await self._send_and_recv(54, [handle], deadline))[0]
+
+  async def file_gethelp(self, handle, deadline = None):
+    return (await self._send_and_recv(55, [handle], deadline))[0]
+
+  async def file_getname(self, handle, deadline = None):
+    return (await self._send_and_recv(56, [handle], deadline))[0]
+
+  async def file_gettag(self, handle, deadline = None):
+    return (await self._send_and_recv(57, [handle], deadline))[0]
+
+  async def file_puttag(self, handle, newval, deadline = None):
+    await self._send_and_recv(58, [handle, newval], deadline)
+
+  async def file_getid(self, handle, deadline = None):
+    return (await self._send_and_recv(59, [handle], deadline))[0]
+
+  async def file_putid(self, handle, newval, deadline = None):
+    await self._send_and_recv(60, [handle, newval], deadline)
+
+  async def file_release(self, handle, deadline = None):
+    await self._send_and_recv(61, [handle], deadline)
+
+  async def robot_getvariable(self, handle, name, option = "", deadline = None):
+    return (await self._send_and_recv(62, [handle, name, option], deadline))[0]
+
+  async def robot_getvariablenames(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(63, [handle, option], deadline))[0]
+
+  async def robot_execute(self, handle, command, param = None, deadline = None):
+    return (await self._send_and_recv(64, [handle, command, param], deadline))[0]
+
+  async def robot_accelerate(self, handle, axis, accel, decel, deadline = None):
+    await self._send_and_recv(65, [handle, axis, c_float(accel), c_float(decel)], deadline)
+
+  async def robot_change(self, handle, name, deadline = None):
+    await self._send_and_recv(66, [handle, name], deadline)
+
+  async def robot_chuck(self, handle, option = "", deadline = None):
+    await self._send_and_recv(67, [handle, option], deadline)
+
+  async def robot_drive(self, handle, axis, mov, option = "", deadline = None):
+    await self._send_and_recv(68, [handle, axis, c_float(mov), option], deadline)
+
+  async def robot_gohome(self, handle, deadline = None):
+    await self._send_and_recv(69, [handle], deadline)
+
+  async def robot_halt(self, handle, option = "", deadline = None):
+    await self._send_and_recv(70, [handle, option], deadline)
+
+  async def robot_hold(self, handle, option = "", deadline = None):
+    await self._send_and_recv(71, [handle, option], deadline)
+
+  async def robot_move(self, handle, comp, pose, option = "", deadline = None):
+    await self._send_and_recv(72, [handle, comp, pose, option], deadline)
+
+  async def robot_rotate(self, handle, rotsuf, deg, pivot, option = "", deadline = None):
+    await self._send_and_recv(73, [handle, rotsuf, c_float(deg), pivot, option], deadline)
+
+  async def robot_speed(self, handle, axis, speed, deadline = None):
+    await self._send_and_recv(74, [handle, axis, c_float(speed)], deadline)
+
+  async def robot_unchuck(self, handle, option = "", deadline = None):
+    await self._send_and_recv(75, [handle, option], deadline)
+
+  async def robot_unhold(self, handle, option = "", deadline = None):
+    await self._send_and_recv(76, [handle, option], deadline)
+
+  async def robot_getattribute(self, handle, deadline = None):
+    return (await self._send_and_recv(77, [handle], deadline))[0]
+
+  async def robot_gethelp(self, handle, deadline = None):
+    return (await self._send_and_recv(78, [handle], deadline))[0]
+
+  async def robot_getname(self, handle, deadline = None):
+    return (await self._send_and_recv(79, [handle], deadline))[0]
+
+  async def robot_gettag(self, handle, deadline = None):
+    return (await self._send_and_recv(80, [handle], deadline))[0]
+
+  async def robot_puttag(self, handle, newval, deadline = None):
+    await self._send_and_recv(81, [handle, newval], deadline)
+
+  async def robot_getid(self, handle, deadline = None):
+    return (await self._send_and_recv(82, [handle], deadline))[0]
+
+  async def robot_putid(self, handle, newval, deadline = None):
+    await self._send_and_recv(83, [handle, newval], deadline)
+
+  async def robot_release(self, handle, deadline = None):
+    await self._send_and_recv(84, [handle], deadline)
+
+  async def task_getvariable(self, handle, name, option = "", deadline = None):
+    return (await self._send_and_recv(85, [handle, name, option], deadline))[0]
+
+  async def task_getvariablenames(self, handle, option = "", deadline = None):
+    return (await self._send_and_recv(86, [handle, option], deadline))[0]
+
+  async def task_execute(self, handle, command, param = None, deadline = None):
+    return (await self._send_and_recv(87, [handle, command, param], deadline))[0]
+
+  async def task_start(self, handle, mode, option = "", deadline = None):
+    await self._send_and_recv(88, [handle, mode, option], deadline)
+
+  async def task_stop(self, handle, mode, option = "", deadline = None):
+    await self._send_and_recv(89, [handle, mode, option], deadline)
+
+  async def task_delete(self, handle, option = "", deadline = None):
+    await self._send_and_recv(90, [handle, option], deadline)
+
+  async def task_getfilename(self, handle, deadline = None):
+    return (await self._send_and_recv(91, [handle], deadline))[0]
+
+  async def task_getattribute(self, handle, deadline = None):
+    return (await self._send_and_recv(92, [handle], deadline))[0]
+
+  async def task_gethelp(self, handle, deadline = None):
+    return (await self._send_and_recv(93, [handle], deadline))[0]
+
+  async def task_getname(self, handle, deadline = None):
+    return (await self._send_and_recv(94, [handle], deadline))[0]
+
+  async def task_gettag(self, handle, deadline = None):
+    return (await self._send_and_recv(95, [handle], deadline))[0]
+
+  async def task_puttag(self, handle, newval, deadline = None):
+    await self._send_and_recv(96, [handle, newval], deadline)
+
+  async def task_getid(self, handle, deadline = None):
+    return (await self._send_and_recv(97, [handle], deadline))[0]
+
+  async def task_putid(self, handle, newval, deadline = None):
+    await self._send_and_recv(98, [handle, newval], deadline)
+
+  async def task_release(self, handle, deadline = None):
+    await self._send_and_recv(99, [handle], deadline)
+
+  async def variable_getdatetime(self, handle, deadline = None):
+    return (await self._send_and_recv(100, [handle], deadline))[0]
+
+  async def variable_getvalue(self, handle, deadline = None):
+    return (await self._send_and_recv(101, [handle], deadline))[0]
+
+  async def variable_putvalue(self, handle, newval, deadline = None):
+    await self._send_and_recv(102, [handle, newval], deadline)
+
+  async def variable_getattribute(self, handle, deadline = None):
+    return (await self._send_and_recv(103, [handle], deadline))[0]
+
+  async def variable_gethelp(self, handle, deadline = None):
+    return (await self._send_and_recv(104, [handle], deadline))[0]
+
+  async def variable_getname(self, handle, deadline = None):
+    return (await self._send_and_recv(105, [handle], deadline))[0]
+
+  async def variable_gettag(self, handle, deadline = None):
+    return (await self._send_and_recv(106, [handle], deadline))[0]
+
+  async def variable_puttag(self, handle, newval, deadline = None):
+    await self._send_and_recv(107, [handle, newval], deadline)
+
+  async def variable_getid(self, handle, deadline = None):
+    return (await self._send_and_recv(108, [handle], deadline))[0]
+
+  async def variable_putid(self, handle, newval, deadline = None):
+    await self._send_and_recv(109, [handle, newval], deadline)
+
+  async def variable_getmicrosecond(self, handle, deadline = None):
+    return (await self._send_and_recv(110, [handle], deadline))[0]
+
+  async def variable_release(self, handle, deadline = None):
+    await self._send_and_recv(111, [handle], deadline)
+
+  async def command_execute(self, handle, mode, deadline = None):
+    await self._send_and_recv(112, [handle, mode], deadline)
+
+  async def command_cancel(self, handle, deadline = None):
+    await self._send_and_recv(113, [handle], deadline)
+
+  async def command_gettimeout(self, handle, deadline = None):
+    return (await self._send_and_recv(114, [handle], deadline))[0]
+
+  async def command_puttimeout(self, handle, newval, deadline = None):
+    await self._send_and_recv(115, [handle, newval], deadline)
+
+  async def command_getstate(self, handle, deadline = None):
+    return (await self._send_and_recv(116, [handle], deadline))[0]
+
+  async def command_getparameters(self, handle, deadline = None):
+    return (await self._send_and_recv(117, [handle], deadline))[0]
+
+  async def command_putparameters(self, handle, newval, deadline = None):
+    await self._send_and_recv(118, [handle, newval], deadline)
+
+  async def command_getresult(self, handle, deadline = None):
+    return (await self._send_and_recv(119, [handle], deadline))[0]
+
+  async def command_getattribute(self, handle, deadline = None):
+    return (await self._send_and_recv(120, [handle], deadline))[0]
+
+  async def command_gethelp(self, handle, deadline = None):
+    return (await self._send_and_recv(121, [handle], deadline))[0]
+
+  async def command_getname(self, handle, deadline = None):
+    return (await self._send_and_recv(122, [handle], deadline))[0]
+
+  async def command_gettag(self, handle, deadline = None):
+    return (await self._send_and_recv(123, [handle], deadline))[0]
+
+  async def command_puttag(self, handle, newval, deadline = None):
+    await self._send_and_recv(124, [handle, newval], deadline)
+
+  async def command_getid(self, handle, deadline = None):
+    return (await self._send_and_recv(125, [handle], deadline))[0]
+
+  async def command_putid(self, handle, newval, deadline = None):
+    await self._send_and_recv(126, [handle, newval], deadline)
+
+  async def command_release(self, handle, deadline = None):
+    await self._send_and_recv(127, [handle], deadline)
+
+  async def message_reply(self, handle, data, deadline = None):
+    await self._send_and_recv(128, [handle, data], deadline)
+
+  async def message_clear(self, handle, deadline = None):
+    await self._send_and_recv(129, [handle], deadline)
+
+  async def message_getdatetime(self, handle, deadline = None):
+    return (await self._send_and_recv(130, [handle], deadline))[0]
+
+  async def message_getdescription(self, handle, deadline = None):
+    return (await self._send_and_recv(131, [handle], deadline))[0]
+
+  async def message_getdestination(self, handle, deadline = None):
+    return (await self._send_and_recv(132, [handle], deadline))[0]
+
+  async def message_getnumber(self, handle, deadline = None):
+    return (await self._send_and_recv(133, [handle], deadline))[0]
+
+  async def message_getserialnumber(self, handle, deadline = None):
+    return (await self._send_and_recv(134, [handle], deadline))[0]
+
+  async def message_getsource(self, handle, deadline = None):
+    return (await self._send_and_recv(135, [handle], deadline))[0]
+
+  async def message_getvalue(self, handle, deadline = None):
+    return (await self._send_and_recv(136, [handle], deadline))[0]
+
+  async def message_release(self, handle, deadline = None):
+    await self._send_and_recv(137, [handle], deadline)
+
+  async def _send_and_recv(self, funcid, args, deadline = None):
+    if not (self._reader_error is None):
+      raise self._reader_error
+    if self._writer is None:
+      raise ConnectionError("b-CAP connection closed")
+    if not (deadline is None) and (deadline <= time.monotonic()):
+      raise DeadlineExceeded("b-CAP call deadline exceeded before the request was sent")
+
+    serial = self._serial
+    while serial in self._pending:
+      serial = 1 if serial >= 0xFFFF else serial + 1
+    self._serial = 1 if serial >= 0xFFFF else serial + 1
+
+    future = asyncio.get_running_loop().create_future()
+    self._pending[serial] = future
+    try:
+      self._writer.write(self._serialize(serial, self._version, funcid, args))
+      await self._writer.drain()
+
+      while True:
+        # timeout for the next frame, capped by the caller's deadline
+        timeout = self._timeout
+        if not (deadline is None):
+          remaining = deadline - time.monotonic()
+          if remaining <= 0:
+            raise DeadlineExceeded("b-CAP call deadline exceeded")
+          if (timeout is None) or (remaining < timeout):
+            timeout = remaining
+        try:
+          retvals = await asyncio.wait_for(asyncio.shield(future), timeout)
+          break
+        except asyncio.TimeoutError:
+          # controller still executing the request -> wait again
+          if serial in self._executing:
+            self._executing.discard(serial)
+            continue
+          if not (deadline is None) and (deadline <= time.monotonic()):
+            raise DeadlineExceeded("b-CAP call deadline exceeded")
+          raise ORiNException(HResult.E_TIMEOUT)
+    finally:
+      self._pending.pop(serial, None)
+      self._executing.discard(serial)
+
+    if len(retvals) == 0:
+      retvals.append(None)
+
+    return retvals
+
+  async def _read_loop(self):
+    try:
+      while True:
+        buf_head = await self._reader.readexactly(5)
+        (soh, len_frame) = struct.unpack_from("<bI", buf_head, 0)
+        if (soh != BCAPCodec._BCAP_SOH) \
+           or (len_frame < BCAPCodec._HEADER.size + 1) \
+           or (len_frame > BCAPCodec._MAX_FRAME_SIZE):
+          raise ORiNException(HResult.E_INVALIDPACKET)
+        buf_body = await self._reader.readexactly(len_frame - 5)
+
+        (serial, version, hresult, retvals) = self._deserialize(buf_head + buf_body)
+
+        future = self._pending.get(serial)
+        if (future is None) or future.done():
+          continue
+
+        if hresult == HResult.S_EXECUTING:
+          self._executing.add(serial)
+        elif HResult.failed(hresult):
+          future.set_exception(ORiNException(hresult))
+        else:
+          future.set_result(retvals)
+    except asyncio.CancelledError:
+      raise
+    except asyncio.IncompleteReadError:
+      self._reader_error = ConnectionError("b-CAP connection closed by peer")
+    except Exception as e:
+      self._reader_error = e
+    self._fail_pending(self._reader_error)
+
+  def _fail_pending(self, exc):
+    for future in self._pending.values():
+      if not future.done():
+        future.set_exception(exc)
\ No newline at end of file
@@ -26,26 +26,74 @@ THE SOFTWARE.
 import select
 import socket
 import struct
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
 from ctypes import *
 from datetime import datetime
 from .orinexception import *
-from threading import Lock
+from .callstats import BCAPCallStats
+from concurrent.futures import Future
+from threading import Lock, Semaphore, Thread, TIMEOUT_MAX, local
 from .variant import VarType
 
-class BCAPClient:
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+# raised while encoding a request, before any byte is written
+# (ORiNException: VARIANT type not supported, struct.error: value out of range)
+_ENCODE_ERRORS = (ORiNException, struct.error, OverflowError, TypeError, ValueError)
+
+
+class DeadlineExceeded(Exception):
+  # The caller's deadline (deadline argument or call_deadline()) passed
+  # before the response arrived. Unlike ORiNException(E_TIMEOUT) this says
+  # nothing about the connection: a late response is dropped by its serial.
+  pass
+
+_deadline_scope = local()
+
+@contextmanager
+def call_deadline(deadline):
+  # Every BCAPClient call made by this thread inside the block gives up at
+  # `deadline` (time.monotonic() value, None = no limit). Nested scopes can
+  # only shorten the deadline.
+  outer = getattr(_deadline_scope, "deadline", None)
+  if not (outer is None) and ((deadline is None) or (outer < deadline)):
+    deadline = outer
+  _deadline_scope.deadline = deadline
+  try:
+    yield
+  finally:
+    _deadline_scope.deadline = outer
+
+class BCAPCodec:
   _BCAP_SOH = 0x1
   _BCAP_EOT = 0x4
 
+  # upper bound for the length field of a received frame; anything larger is
+  # a corrupt or desynchronised stream, not a response
+  _MAX_FRAME_SIZE = 0x1000000
+
   _TIME_DIFFERENCE = 25569.0
   _SEC_ONEDAY = 24 * 60 * 60
 
+  _HEADER = struct.Struct("<bIHhiH")
+
+  # decode mode for numeric arrays: "list" (default), "array" or "numpy"
+  _array_mode = "list"
+
   def datetime2vntdate(date):
     return date.timestamp() \
-             / BCAPClient._SEC_ONEDAY + BCAPClient._TIME_DIFFERENCE
+             / BCAPCodec._SEC_ONEDAY + BCAPCodec._TIME_DIFFERENCE
 
   def vntdate2datetime(date):
     return datetime.fromtimestamp( \
-             (date - BCAPClient._TIME_DIFFERENCE) * BCAPClient._SEC_ONEDAY)
+             (date - BCAPCodec._TIME_DIFFERENCE) * BCAPCodec._SEC_ONEDAY)
 
   _DICT_TYPE2VT  = {
     int        :(VarType.VT_I4  , "i"   , False),
@@ -85,757 +133,1373 @@ class BCAPClient:
     VarType.VT_UI8  :("Q"  , 8),
   }
 
-  def __init__(self, host, port, timeout):
-    self._serial  = 1
-    self._version = 0
-    self._timeout = timeout
-    self._sock    = None
-    self._lock    = Lock()
+  # numeric array types for the "array" / "numpy" decode mode
+  _DICT_VT2ARRAY = {
+    VarType.VT_I2   :("h", "<i2"),
+    VarType.VT_I4   :("i", "<i4"),
+    VarType.VT_R4   :("f", "<f4"),
+    VarType.VT_R8   :("d", "<f8"),
+    VarType.VT_CY   :("q", "<i8"),
+    VarType.VT_ERROR:("i", "<i4"),
+    VarType.VT_UI2  :("H", "<u2"),
+    VarType.VT_UI4  :("I", "<u4"),
+    VarType.VT_I8   :("q", "<i8"),
+    VarType.VT_UI8  :("Q", "<u8"),
+  }
 
-    try:
-      self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-      self._sock.setblocking(False)
-      self._sock.settimeout(timeout)
-      self._sock.connect((host, port))
-    except OSError as e:
-      if not (self._sock is None):
-        self._sock.close()
-        self._sock = None
-      raise e
+  # (kind, itemsize) of array.array / numpy.ndarray -> vt
+  _DICT_KIND2VT = {
+    ("i", 2):VarType.VT_I2,
+    ("i", 4):VarType.VT_I4,
+    ("i", 8):VarType.VT_I8,
+    ("u", 1):VarType.VT_UI1,
+    ("u", 2):VarType.VT_UI2,
+    ("u", 4):VarType.VT_UI4,
+    ("u", 8):VarType.VT_UI8,
+    ("f", 4):VarType.VT_R4,
+    ("f", 8):VarType.VT_R8,
+  }
 
-    self._sock.setblocking(True)
+  def set_array_mode(self, mode):
+    if mode not in ("list", "array", "numpy"):
+      raise ValueError("array mode must be 'list', 'array' or 'numpy'")
+    if (mode == "numpy") and (numpy is None):
+      raise ImportError("array mode 'numpy' requires numpy")
+    self._array_mode = mode
 
-  def __del__(self):
-    if not (self._sock is None):
-      try:
-        self._sock.shutdown(socket.SHUT_RDWR)
-      finally:
-        self._sock.close()
-        self._sock = None
+  def get_array_mode(self):
+    return self._array_mode
 
-  def settimeout(self, timeout):
-    self._timeout = timeout
+  def _serialize(self, serial, version, funcid, args):
+    format = "<bIHhiH"
+    packet_data = [BCAPCodec._BCAP_SOH, 0, serial, version, funcid, len(args)]
 
-  def gettimeout(self):
-    return self._timeout
+    packed_args = self._serialize_args(args, True)
 
-  def service_start(self, option = ""):
-    self._send_and_recv(1, [option])
+    format += "%ds" % len(packed_args)
+    packet_data.append(packed_args)
 
-  def service_stop(self):
-    self._send_and_recv(2, [])
+    format += "b"
+    packet_data.append(BCAPCodec._BCAP_EOT)
 
-  def controller_connect(self, name, provider, machine, option):
-    return self._send_and_recv(3, [name, provider, machine, option])[0]
+    buf = struct.pack(format, *packet_data)
+    buf = buf.replace(b'\0\0\0\0', struct.pack("<I", len(buf)), 1)
 
-  def controller_disconnect(self, handle):
-    self._send_and_recv(4, [handle])
+    return buf
 
-  def controller_getextension(self, handle, name, option = ""):
-    return self._send_and_recv(5, [handle, name, option])[0]
+  def _serialize_args(self, args, first = False):
+    format = "<"
+    packet_data = []
+    offset = 0
 
-  def controller_getfile(self, handle, name, option = ""):
-    return self._send_and_recv(6, [handle, name, option])[0]
+    for arg in args:
+      if first:
+        format += "I"
+        packet_data.append(0)
 
-  def controller_getrobot(self, handle, name, option = ""):
-    return self._send_and_recv(7, [handle, name, option])[0]
+      packed_arg = self._serialize_arg(arg)
+      len_arg = len(packed_arg)
+      format += "%ds" % len_arg
+      packet_data.append(packed_arg)
 
-  def controller_gettask(self, handle, name, option = ""):
-    return self._send_and_recv(8, [handle, name, option])[0]
+      if first:
+        packet_data[2*offset] = len_arg
 
-  def controller_getvariable(self, handle, name, option = ""):
-    return self._send_and_recv(9, [handle, name, option])[0]
+      offset += 1
 
-  def controller_getcommand(self, handle, name, option = ""):
-    return self._send_and_recv(10, [handle, name, option])[0]
+    if len(packet_data) > 0:
+      return struct.pack(format, *packet_data)
+    else:
+      return b''
 
-  def controller_getextensionnames(self, handle, option = ""):
-    return self._send_and_recv(11, [handle, option])[0]
+  def _serialize_arg(self, arg):
+    format = "<HI"
+    packet_data = []
 
-  def controller_getfilenames(self, handle, option = ""):
-    return self._send_and_recv(12, [handle, option])[0]
+    if arg is None:
+      packet_data = [VarType.VT_EMPTY, 1]
 
-  def controller_getrobotnames(self, handle, option = ""):
-    return self._send_and_recv(13, [handle, option])[0]
+    elif isinstance(arg, (list, tuple)):
+      len_arg = len(arg)
 
-  def controller_gettasknames(self, handle, option = ""):
-    return self._send_and_recv(14, [handle, option])[0]
+      if len_arg <= 0:
+        packet_data = [VarType.VT_EMPTY, 1]
+      else:
+        is_vntary = False
+        type_o0 = type(arg[0])
+        for o in arg:
+          if type_o0 != type(o):
+            is_vntary = True
+            break
 
-  def controller_getvariablenames(self, handle, option = ""):
-    return self._send_and_recv(15, [handle, option])[0]
+        if is_vntary:
+          packed_args = self._serialize_args(arg)
+          format += "%ds" % len(packed_args)
+          packet_data += [VarType.VT_VARIANT | VarType.VT_ARRAY, len_arg, packed_args]        
 
-  def controller_getcommandnames(self, handle, option = ""):
-    return self._send_and_recv(16, [handle, option])[0]
+        else:
+          if type_o0 in BCAPCodec._DICT_TYPE2VT:
+            (vt, fmt, is_ctype) = BCAPCodec._DICT_TYPE2VT[type_o0]
 
-  def controller_execute(self, handle, command, param = None):
-    return self._send_and_recv(17, [handle, command, param])[0]
+            if vt == VarType.VT_DATE:
+              format += fmt * len_arg
+              packet_data += [vt | VarType.VT_ARRAY, len_arg]
+              for o in arg:
+                packet_data.append(BCAPCodec.datetime2vntdate(o))
 
-  def controller_getmessage(self, handle):
-    return self._send_and_recv(18, [handle])[0]
+            elif vt == VarType.VT_BSTR:
+              packet_data += [vt | VarType.VT_ARRAY, len_arg]
+              for o in arg:
+                if is_ctype:
+                  str_tmp = o.value.encode("utf-16le")
+                else:
+                  str_tmp = o.encode("utf-16le")
+                len_str = len(str_tmp)
+                format += fmt % len_str
+                packet_data += [len_str, str_tmp]
 
-  def controller_getattribute(self, handle):
-    return self._send_and_recv(19, [handle])[0]
+            elif vt == VarType.VT_BOOL:
+              format += fmt * len_arg
+              packet_data += [vt | VarType.VT_ARRAY, len_arg]
+              for o in arg:
+                if o:
+                  packet_data.append(-1)
+                else:
+                  packet_data.append(0)
 
-  def controller_gethelp(self, handle):
-    return self._send_and_recv(20, [handle])[0]
+            else:
+              format += "%d%s" % (len_arg, fmt)
+              packet_data += [vt | VarType.VT_ARRAY, len_arg]
+              if is_ctype:
+                for o in arg:
+                  packet_data.append(o.value)
+              else:
+                packet_data += arg
 
-  def controller_getname(self, handle):
-    return self._send_and_recv(21, [handle])[0]
+          else:
+            raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
 
-  def controller_gettag(self, handle):
-    return self._send_and_recv(22, [handle])[0]
+    elif isinstance(arg, (bytes, bytearray)):
+      len_arg = len(arg)
+      format += "%ds" % len_arg
+      packet_data += [VarType.VT_ARRAY | VarType.VT_UI1, len_arg, arg]
 
-  def controller_puttag(self, handle, newval):
-    self._send_and_recv(23, [handle, newval])
+    elif isinstance(arg, array):
+      if arg.typecode in "fd":
+        kind = "f"
+      elif arg.typecode in "bhilq":
+        kind = "i"
+      else:
+        kind = "u"
+      vt = BCAPCodec._DICT_KIND2VT.get((kind, arg.itemsize))
+      if vt is None:
+        raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
+      if sys.byteorder != "little":
+        arg = array(arg.typecode, arg)
+        arg.byteswap()
+      raw = arg.tobytes()
+      format += "%ds" % len(raw)
+      packet_data += [vt | VarType.VT_ARRAY, len(arg), raw]
+
+    elif (not (numpy is None)) and isinstance(arg, numpy.ndarray):
+      vt = BCAPCodec._DICT_KIND2VT.get((arg.dtype.kind, arg.dtype.itemsize))
+      if vt is None:
+        raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
+      raw = numpy.ascontiguousarray(arg.ravel(),
+        dtype = arg.dtype.newbyteorder("<")).tobytes()
+      format += "%ds" % len(raw)
+      packet_data += [vt | VarType.VT_ARRAY, arg.size, raw]
 
-  def controller_getid(self, handle):
-    return self._send_and_recv(24, [handle])[0]
+    else:
+      type_arg = type(arg)
+      if type_arg in BCAPCodec._DICT_TYPE2VT:
+        (vt, fmt, is_ctype) = BCAPCodec._DICT_TYPE2VT[type_arg]
 
-  def controller_putid(self, handle, newval):
-    self._send_and_recv(25, [handle, newval])
+        if vt == VarType.VT_DATE:
+          format += fmt
+          date_tmp = BCAPCodec.datetime2vntdate(arg)
+          packet_data += [vt, 1, date_tmp]
 
-  def extension_getvariable(self, handle, name, option = ""):
-    return self._send_and_recv(26, [handle, name, option])[0]
+        elif vt == VarType.VT_BSTR:
+          if is_ctype:
+            str_tmp = arg.value.encode("utf-16le")
+          else:
+            str_tmp = arg.encode("utf-16le")
+          len_str = len(str_tmp)
+          format += fmt % len_str
+          packet_data += [vt, 1, len_str, str_tmp]
 
-  def extension_getvariablenames(self, handle, option = ""):
-    return self._send_and_recv(27, [handle, option])[0]
+        elif vt == VarType.VT_BOOL:
+          format += fmt
+          if arg:
+            packet_data += [vt, 1, -1]
+          else:
+            packet_data += [vt, 1,  0]
 
-  def extension_execute(self, handle, command, param = None):
-    return self._send_and_recv(28, [handle, command, param])[0]
+        else:
+          format += fmt
+          if is_ctype:
+            packet_data += [vt, 1, arg.value]
+          else:
+            packet_data += [vt, 1, arg]
 
-  def extension_getattribute(self, handle):
-    return self._send_and_recv(29, [handle])[0]
+      else:
+        raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
 
-  def extension_gethelp(self, handle):
-    return self._send_and_recv(30, [handle])[0]
+    return struct.pack(format, *packet_data)
 
-  def extension_getname(self, handle):
-    return self._send_and_recv(31, [handle])[0]
+  def _deserialize(self, buf):
+    with memoryview(buf) as view:
+      (soh, len_buf, serial, version, hresult, len_args) \
+        = BCAPCodec._HEADER.unpack_from(view, 0)
+      (eot, ) = struct.unpack_from("<b", view, len(view) - 1)
 
-  def extension_gettag(self, handle):
-    return self._send_and_recv(32, [handle])[0]
+      if (soh != BCAPCodec._BCAP_SOH) or (eot != BCAPCodec._BCAP_EOT):
+        raise ORiNException(HResult.E_INVALIDPACKET)
 
-  def extension_puttag(self, handle, newval):
-    self._send_and_recv(33, [handle, newval])
+      (retvals, offset) = self._deserialize_args_from(
+        view, BCAPCodec._HEADER.size, len_args, True)
 
-  def extension_getid(self, handle):
-    return self._send_and_recv(34, [handle])[0]
+    return (serial, version, hresult, retvals)
 
-  def extension_putid(self, handle, newval):
-    self._send_and_recv(35, [handle, newval])
+  def _deserialize_args(self, buf, len_args, first = False):
+    (retvals, offset) = self._deserialize_args_from(
+      memoryview(buf), 0, len_args, first)
 
-  def extension_release(self, handle):
-    self._send_and_recv(36, [handle])
+    return (retvals, buf[offset:])
 
-  def file_getfile(self, handle, name, option = ""):
-    return self._send_and_recv(37, [handle, name, option])[0]
+  def _deserialize_arg(self, buf):
+    (retval, offset) = self._deserialize_arg_from(memoryview(buf), 0)
 
-  def file_getvariable(self, handle, name, option = ""):
-    return self._send_and_recv(38, [handle, name, option])[0]
+    return (retval, buf[offset:])
 
-  def file_getfilenames(self, handle, option = ""):
-    return self._send_and_recv(39, [handle, option])[0]
+  def _deserialize_args_from(self, view, offset, len_args, first = False):
+    retvals = []
 
-  def file_getvariablenames(self, handle, option = ""):
-    return self._send_and_recv(40, [handle, option])[0]
+    for i in range(len_args):
+      if first:
+        offset += 4
+      (retval, offset) = self._deserialize_arg_from(view, offset)
+      retvals.append(retval)
 
-  def file_execute(self, handle, command, param = None):
-    return self._send_and_recv(41, [handle, command, param])[0]
+    return (retvals, offset)
 
-  def file_copy(self, handle, name, option = ""):
-    self._send_and_recv(42, [handle, name, option])
+  def _deserialize_arg_from(self, view, offset):
+    retval = None
 
-  def file_delete(self, handle, option = ""):
-    self._send_and_recv(43, [handle, option])
+    (vt, len_arg) = struct.unpack_from("<HI", view, offset)
+    offset += 6
 
-  def file_move(self, handle, name, option = ""):
-    self._send_and_recv(44, [handle, name, option])
+    if (vt & VarType.VT_ARRAY) != 0:
+      vt = vt ^ VarType.VT_ARRAY
+      if vt == VarType.VT_VARIANT:
+        (retval, offset) = self._deserialize_args_from(view, offset, len_arg)
 
-  def file_run(self, handle, option = ""):
-    return self._send_and_recv(45, [handle, option])[0]
+      elif vt == VarType.VT_UI1:
+        (retval, ) = struct.unpack_from("<%ds" % len_arg, view, offset)
+        offset += len_arg
 
-  def file_getdatecreated(self, handle):
-    return self._send_and_recv(46, [handle])[0]
+      elif vt in BCAPCodec._DICT_VT2TYPE:
+        (fmt, len_val) = BCAPCodec._DICT_VT2TYPE[vt]
 
-  def file_getdatelastaccessed(self, handle):
-    return self._send_and_recv(47, [handle])[0]
+        if vt == VarType.VT_BSTR:
+          retval = []
+          for i in range(len_arg):
+            (len_str, ) = struct.unpack_from("<I", view, offset)
+            offset += 4
+            (ret_tmp, ) = struct.unpack_from("<%ds" % len_str, view, offset)
+            offset += len_str
+            retval.append(ret_tmp.decode("utf-16le"))
 
-  def file_getdatelastmodified(self, handle):
-    return self._send_and_recv(48, [handle])[0]
+        elif (self._array_mode != "list") and (vt in BCAPCodec._DICT_VT2ARRAY):
+          (typecode, dtype) = BCAPCodec._DICT_VT2ARRAY[vt]
+          # copies out of the frame: the receive buffer is reused
+          if self._array_mode == "numpy":
+            retval = numpy.frombuffer(view, dtype, len_arg, offset).astype(dtype[1:])
+          else:
+            retval = array(typecode)
+            retval.frombytes(view[offset:offset + len_val * len_arg])
+            if sys.byteorder != "little":
+              retval.byteswap()
+          offset += len_val * len_arg
 
-  def file_getpath(self, handle):
-    return self._send_and_recv(49, [handle])[0]
+        else:
+          retval  = list(struct.unpack_from("<%d%s" % (len_arg, fmt), view, offset))
+          offset += len_val * len_arg
 
-  def file_getsize(self, handle):
-    return self._send_and_recv(50, [handle])[0]
+          if vt == VarType.VT_DATE:
+            for i in range(len(retval)):
+              retval[i] = BCAPCodec.vntdate2datetime(retval[i])
 
-  def file_gettype(self, handle):
-    return self._send_and_recv(51, [handle])[0]
+          elif vt == VarType.VT_BOOL:
+            for i in range(len(retval)):
+              retval[i] = (retval[i] != 0)
 
-  def file_getvalue(self, handle):
-    return self._send_and_recv(52, [handle])[0]
+      else:
+        raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
 
-  def file_putvalue(self, handle, newval):
-    self._send_and_recv(53, [handle, newval])
+    else:
+      if vt in [ VarType.VT_EMPTY, VarType.VT_NULL ]:
+        pass
+      elif vt in BCAPCodec._DICT_VT2TYPE:
+        (fmt, len_val) = BCAPCodec._DICT_VT2TYPE[vt]
 
-  def file_getattribute(self, handle):
-    return self._send_and_recv(54, [handle])[0]
+        if vt == VarType.VT_BSTR:
+          (len_str, ) = struct.unpack_from("<I", view, offset)
+          offset += 4
+          (retval, ) = struct.unpack_from("<%ds" % len_str, view, offset)
+          offset += len_str
+          retval = retval.decode("utf-16le")
 
-  def file_gethelp(self, handle):
-    return self._send_and_recv(55, [handle])[0]
+        else:
+          (retval, ) = struct.unpack_from("<" + fmt, view, offset)
+          offset += len_val
 
-  def file_getname(self, handle):
-    return self._send_and_recv(56, [handle])[0]
+          if vt == VarType.VT_DATE:
+            retval = BCAPCodec.vntdate2datetime(retval)
 
-  def file_gettag(self, handle):
-    return self._send_and_recv(57, [handle])[0]
+          elif vt == VarType.VT_BOOL:
+            retval = (retval != 0)
 
-  def file_puttag(self, handle, newval):
-    self._send_and_recv(58, [handle, newval])
+      else:
+        raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
 
-  def file_getid(self, handle):
-    return self._send_and_recv(59, [handle])[0]
+    return (retval, offset)
 
-  def file_putid(self, handle, newval):
-    self._send_and_recv(60, [handle, newval])
+class BCAPClient(BCAPCodec):
+  _RECV_BUF_SIZE = 0x10000
+  _READER_TICK   = 0.05
 
-  def file_release(self, handle):
-    self._send_and_recv(61, [handle])
+  _TEMPLATE_CACHE_SIZE = 256
+  _PATCH_SERIAL = struct.Struct("<Hh")
+  _PATCH_LEN    = struct.Struct("<I")
+  _PATCH_TYPES  = {int : struct.Struct("<i"), float : struct.Struct("<d")}
 
-  def robot_getvariable(self, handle, name, option = ""):
-    return self._send_and_recv(62, [handle, name, option])[0]
+  def __init__(self, host, port, timeout):
+    self._serial  = 1
+    self._version = 0
+    self._timeout = timeout
+    self._sock    = None
+    self._lock    = Lock()
 
-  def robot_getvariablenames(self, handle, option = ""):
-    return self._send_and_recv(63, [handle, option])[0]
+    self._rbuf       = bytearray(BCAPClient._RECV_BUF_SIZE)
+    self._rbuf_start = 0
+    self._rbuf_end   = 0
 
-  def robot_execute(self, handle, command, param = None):
-    return self._send_and_recv(64, [handle, command, param])[0]
+    self._reader       = None
+    self._reader_stop  = False
+    self._reader_error = None
+    self._pending      = {}
+    self._pending_lock = Lock()
+    self._window       = None
 
-  def robot_accelerate(self, handle, axis, accel, decel):
-    self._send_and_recv(65, [handle, axis, c_float(accel), c_float(decel)])
+    self._templates     = OrderedDict()
+    self._template_seen = OrderedDict()
 
-  def robot_change(self, handle, name):
-    self._send_and_recv(66, [handle, name])
+    # per-call statistics (enable_stats()); _tx_last/_rx_last are only
+    # written while statistics are enabled
+    self._stats   = None
+    self._tx_last = None
+    self._rx_last = None
 
-  def robot_chuck(self, handle, option = ""):
-    self._send_and_recv(67, [handle, option])
+    try:
+      self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+      self._sock.setblocking(False)
+      self._sock.settimeout(timeout)
+      self._sock.connect((host, port))
+    except OSError as e:
+      if not (self._sock is None):
+        self._sock.close()
+        self._sock = None
+      raise e
 
-  def robot_drive(self, handle, axis, mov, option = ""):
-    self._send_and_recv(68, [handle, axis, c_float(mov), option])
+    self._sock.setblocking(True)
 
-  def robot_gohome(self, handle):
-    self._send_and_recv(69, [handle])
+  def __del__(self):
+    self.close()
 
-  def robot_halt(self, handle, option = ""):
-    self._send_and_recv(70, [handle, option])
+  def close(self):
+    self.stop_pipeline()
+    if not (self._sock is None):
+      try:
+        self._sock.shutdown(socket.SHUT_RDWR)
+      except OSError:
+        pass
+      finally:
+        self._sock.close()
+        self._sock = None
 
-  def robot_hold(self, handle, option = ""):
-    self._send_and_recv(71, [handle, option])
+  def shutdown(self):
+    # Wakes up every thread blocked on this connection (they fail with
+    # ConnectionError) without releasing the socket; call close() afterwards.
+    sock = self._sock
+    if not (sock is None):
+      try:
+        sock.shutdown(socket.SHUT_RDWR)
+      except OSError:
+        pass
 
-  def robot_move(self, handle, comp, pose, option = ""):
-    self._send_and_recv(72, [handle, comp, pose, option])
+  def enable_stats(self, stats = None):
+    # Records count, errors, bytes and latency histograms per function ID
+    # for every following call. Pass the same BCAPCallStats to several
+    # clients to aggregate them. Returns the stats object.
+    if stats is None:
+      stats = BCAPCallStats()
+    self._stats = stats
+    return stats
 
-  def robot_rotate(self, handle, rotsuf, deg, pivot, option = ""):
-    self._send_and_recv(73, [handle, rotsuf, c_float(deg), pivot, option])
+  def disable_stats(self):
+    self._stats = None
 
-  def robot_speed(self, handle, axis, speed):
-    self._send_and_recv(74, [handle, axis, c_float(speed)])
+  def get_stats(self):
+    return self._stats
 
-  def robot_unchuck(self, handle, option = ""):
-    self._send_and_recv(75, [handle, option])
+  def settimeout(self, timeout):
+    self._timeout = timeout
 
-  def robot_unhold(self, handle, option = ""):
-    self._send_and_recv(76, [handle, option])
+  def gettimeout(self):
+    return self._timeout
 
-  def robot_getattribute(self, handle):
-    return self._send_and_recv(77, [handle])[0]
+  def service_start(self, option = "", deadline = None):
+    self._send_and_recv(1, [option], deadline)
 
-  def robot_gethelp(self, handle):
-    return self._send_and_recv(78, [handle])[0]
+  def service_stop(self, deadline = None):
+    self._send_and_recv(2, [], deadline)
 
-  def robot_getname(self, handle):
-    return self._send_and_recv(79, [handle])[0]
+  def controller_connect(self, name, provider, machine, option, deadline = None):
+    return self._send_and_recv(3, [name, provider, machine, option], deadline)[0]
 
-  def robot_gettag(self, handle):
-    return self._send_and_recv(80, [handle])[0]
+  def controller_disconnect(self, handle, deadline = None):
+    self._send_and_recv(4, [handle], deadline)
 
-  def robot_puttag(self, handle, newval):
-    self._send_and_recv(81, [handle, newval])
+  def controller_getextension(self, handle, name, option = "", deadline = None):
+    return self._send_and_recv(5, [handle, name, option], deadline)[0]
 
-  def robot_getid(self, handle):
-    return self._send_and_recv(82, [handle])[0]
+  def controller_getfile(self, handle, name, option = "", deadline = None):
+    return self._send_and_recv(6, [handle, name, option], deadline)[0]
 
-  def robot_putid(self, handle, newval):
-    self._send_and_recv(83, [handle, newval])
+  def controller_getrobot(self, handle, name, option = "", deadline = None):
+    return self._send_and_recv(7, [handle, name, option], deadline)[0]
 
-  def robot_release(self, handle):
-    self._send_and_recv(84, [handle])
+  def controller_gettask(self, handle, name, option = "", deadline = None):
+    return self._send_and_recv(8, [handle, name, option], deadline)[0]
 
-  def task_getvariable(self, handle, name, option = ""):
-    return self._send_and_recv(85, [handle, name, option])[0]
+  def controller_getvariable(self, handle, name, option = "", deadline = None):
+    return self._send_and_recv(9, [handle, name, option], deadline)[0]
 
-  def task_getvariablenames(self, handle, option = ""):
-    return self._send_and_recv(86, [handle, option])[0]
+  def controller_getcommand(self, handle, name, option = "", deadline = None):
+    return self._send_and_recv(10, [handle, name, option], deadline)[0]
 
-  def task_execute(self, handle, command, param = None):
-    return self._send_and_recv(87, [handle, command, param])[0]
+  def controller_getextensionnames(self, handle, option = "", deadline = None):
+    return self._send_and_recv(11, [handle, option], deadline)[0]
 
-  def task_start(self, handle, mode, option = ""):
-    self._send_and_recv(88, [handle, mode, option])
+  def controller_getfilenames(self, handle, option = "", deadline = None):
+    return self._send_and_recv(12, [handle, option], deadline)[0]
 
-  def task_stop(self, handle, mode, option = ""):
-    self._send_and_recv(89, [handle, mode, option])
+  def controller_getrobotnames(self, handle, option = "", deadline = None):
+    return self._send_and_recv(13, [handle, option], deadline)[0]
 
-  def task_delete(self, handle, option = ""):
-    self._send_and_recv(90, [handle, option])
+  def controller_gettasknames(self, handle, option = "", deadline = None):
+    return self._send_and_recv(14, [handle, option], deadline)[0]
 
-  def task_getfilename(self, handle):
-    return self._send_and_recv(91, [handle])[0]
+  def controller_getvariablenames(self, handle, option = "", deadline = None):
+    return self._send_and_recv(15, [handle, option], deadline)[0]
 
-  def task_getattribute(self, handle):
-    return self._send_and_recv(92, [handle])[0]
+  def controller_getcommandnames(self, handle, option = "", deadline = None):
+    return self._send_and_recv(16, [handle, option], deadline)[0]
 
-  def task_gethelp(self, handle):
-    return self._send_and_recv(93, [handle])[0]
+  def controller_execute(self, handle, command, param = None, deadline = None):
+    return self._send_and_recv(17, [handle, command, param], deadline)[0]
 
-  def task_getname(self, handle):
-    return self._send_and_recv(94, [handle])[0]
+  def controller_getmessage(self, handle, deadline = None):
+    return self._send_and_recv(18, [handle], deadline)[0]
 
-  def task_gettag(self, handle):
-    return self._send_and_recv(95, [handle])[0]
+  def controller_getattribute(self, handle, deadline = None):
+    return self._send_and_recv(19, [handle], deadline)[0]
 
-  def task_puttag(self, handle, newval):
-    self._send_and_recv(96, [handle, newval])
+  def controller_gethelp(self, handle, deadline = None):
+    return self._send_and_recv(20, [handle], deadline)[0]
 
-  def task_getid(self, handle):
-    return self._send_and_recv(97, [handle])[0]
+  def controller_getname(self, handle, deadline = None):
+    return self._send_and_recv(21, [handle], deadline)[0]
 
-  def task_putid(self, handle, newval):
-    self._send_and_recv(98, [handle, newval])
+  def controller_gettag(self, handle, deadline = None):
+    return self._send_and_recv(22, [handle], deadline)[0]
 
-  def task_release(self, handle):
-    self._send_and_recv(99, [handle])
+  def controller_puttag(self, handle, newval, deadline = None):
+    self._send_and_recv(23, [handle, newval], deadline)
 
-  def variable_getdatetime(self, handle):
-    return self._send_and_recv(100, [handle])[0]
+  def controller_getid(self, handle, deadline = None):
+    return self._send_and_recv(24, [handle], deadline)[0]
 
-  def variable_getvalue(self, handle):
-    return self._send_and_recv(101, [handle])[0]
+  def controller_putid(self, handle, newval, deadline = None):
+    self._send_and_recv(25, [handle, newval], deadline)
 
-  def variable_putvalue(self, handle, newval):
-    self._send_and_recv(102, [handle, newval])
+  def extension_getvariable(self, handle, name, option = "", deadline = None):
+    return self._send_and_recv(26, [handle, name, option], deadline)[0]
 
-  def variable_getattribute(self, handle):
-    return self._send_and_recv(103, [handle])[0]
+  def extension_getvariablenames(self, handle, option = "", deadline = None):
+    return self._send_and_recv(27, [handle, option], deadline)[0]
 
-  def variable_gethelp(self, handle):
-    return self._send_and_recv(104, [handle])[0]
+  def extension_execute(self, handle, command, param = None, deadline = None):
+    return self._send_and_recv(28, [handle, command, param], deadline)[0]
 
-  def variable_getname(self, handle):
-    return self._send_and_recv(105, [handle])[0]
+  def extension_getattribute(self, handle, deadline = None):
+    return self._send_and_recv(29, [handle], deadline)[0]
 
-  def variable_gettag(self, handle):
-    return self._send_and_recv(106, [handle])[0]
+  def extension_gethelp(self, handle, deadline = None):
+    return self._send_and_recv(30, [handle], deadline)[0]
 
-  def variable_puttag(self, handle, newval):
-    self._send_and_recv(107, [handle, newval])
+  def extension_getname(self, handle, deadline = None):
+    return self._send_and_recv(31, [handle], deadline)[0]
 
-  def variable_getid(self, handle):
-    return self._send_and_recv(108, [handle])[0]
+  def extension_gettag(self, handle, deadline = None):
+    return self._send_and_recv(32, [handle], deadline)[0]
 
-  def variable_putid(self, handle, newval):
-    self._send_and_recv(109, [handle, newval])
+  def extension_puttag(self, handle, newval, deadline = None):
+    self._send_and_recv(33, [handle, newval], deadline)
 
-  def variable_getmicrosecond(self, handle):
-    return self._send_and_recv(110, [handle])[0]
+  def extension_getid(self, handle, deadline = None):
+    return self._send_and_recv(34, [handle], deadline)[0]
 
-  def variable_release(self, handle):
-    self._send_and_recv(111, [handle])
+  def extension_putid(self, handle, newval, deadline = None):
+    self._send_and_recv(35, [handle, newval], deadline)
 
-  def command_execute(self, handle, mode):
-    self._send_and_recv(112, [handle, mode])
+  def extension_release(self, handle, deadline = None):
+    self._send_and_recv(36, [handle], deadline)
 
-  def command_cancel(self, handle):
-    self._send_and_recv(113, [handle])
+  def file_getfile(self, handle, name, option = "", deadline = None):
+    return self._send_and_recv(37, [handle, name, option], deadline)[0]
 
-  def command_gettimeout(self, handle):
-    return self._send_and_recv(114, [handle])[0]
+  def file_getvariable(self, handle, name, option = "", deadline = None):
+    return self._send_and_recv(38, [handle, name, option], deadline)[0]
 
-  def command_puttimeout(self, handle, newval):
-    self._send_and_recv(115, [handle, newval])
+  def file_getfilenames(self, handle, option = "", deadline = None):
+    return self._send_and_recv(39, [handle, option], deadline)[0]
 
-  def command_getstate(self, handle):
-    return self._send_and_recv(116, [handle])[0]
+  def file_getvariablenames(self, handle, option = "", deadline = None):
+    return self._send_and_recv(40, [handle, option], deadline)[0]
 
-  def command_getparameters(self, handle):
-    return self._send_and_recv(117, [handle])[0]
+  def file_execute(self, handle, command, param = None, deadline = None):
+    return self._send_and_recv(41, [handle, command, param], deadline)[0]
 
-  def command_putparameters(self, handle, newval):
-    self._send_and_recv(118, [handle, newval])
+  def file_copy(self, handle, name, option = "", deadline = None):
+    self._send_and_recv(42, [handle, name, option], deadline)
 
-  def command_getresult(self, handle):
-    return self._send_and_recv(119, [handle])[0]
+  def file_delete(self, handle, option = "", deadline = None):
+    self._send_and_recv(43, [handle, option], deadline)
 
-  def command_getattribute(self, handle):
-    return self._send_and_recv(120, [handle])[0]
+  def file_move(self, handle, name, option = "", deadline = None):
+    self._send_and_recv(44, [handle, name, option], deadline)
 
-  def command_gethelp(self, handle):
-    return self._send_and_recv(121, [handle])[0]
+  def file_run(self, handle, option = "", deadline = None):
+    return self._send_and_recv(45, [handle, option], deadline)[0]
 
-  def command_getname(self, handle):
-    return self._send_and_recv(122, [handle])[0]
+  def file_getdatecreated(self, handle, deadline = None):
+    return self._send_and_recv(46, [handle], deadline)[0]
 
-  def command_gettag(self, handle):
-    return self._send_and_recv(123, [handle])[0]
+  def file_getdatelastaccessed(self, handle, deadline = None):
+    return self._send_and_recv(47, [handle], deadline)[0]
 
-  def command_puttag(self, handle, newval):
-    self._send_and_recv(124, [handle, newval])
+  def file_getdatelastmodified(self, handle, deadline = None):
+    return self._send_and_recv(48, [handle], deadline)[0]
 
-  def command_getid(self, handle):
-    return self._send_and_recv(125, [handle])[0]
+  def file_getpath(self, handle, deadline = None):
+    return self._send_and_recv(49, [handle], deadline)[0]
 
-  def command_putid(self, handle, newval):
-    self._send_and_recv(126, [handle, newval])
+  def file_getsize(self, handle, deadline = None):
+    return self._send_and_recv(50, [handle], deadline)[0]
 
-  def command_release(self, handle):
-    self._send_and_recv(127, [handle])
+  def file_gettype(self, handle, deadline = None):
+    return self._send_and_recv(51, [handle], deadline)[0]
 
-  def message_reply(self, handle, data):
-    self._send_and_recv(128, [handle, data])
+  def file_getvalue(self, handle, deadline = None):
+    return self._send_and_recv(52, [handle], deadline)[0]
 
-  def message_clear(self, handle):
-    self._send_and_recv(129, [handle])
+  def file_putvalue(self, handle, newval, deadline = None):
+    self._send_and_recv(53, [handle, newval], deadline)
 
-  def message_getdatetime(self, handle):
-    return self._send_and_recv(130, [handle])[0]
+  def file_getattribute(self, handle, deadline = None):
+    return self._send_and_recv(54, [handle], deadline)[0]
 
-  def message_getdescription(self, handle):
-    return self._send_and_recv(131, [handle])[0]
+  def file_gethelp(self, handle, deadline = None):
+    return self._send_and_recv(55, [handle], deadline)[0]
 
-  def message_getdestination(self, handle):
-    return self._send_and_recv(132, [handle])[0]
+  def file_getname(self, handle, deadline = None):
+    return self._send_and_recv(56, [handle], deadline)[0]
 
-  def message_getnumber(self, handle):
-    return self._send_and_recv(133, [handle])[0]
+  def file_gettag(self, handle, deadline = None):
+    return self._send_and_recv(57, [handle], deadline)[0]
 
-  def message_getserialnumber(self, handle):
-    return self._send_and_recv(134, [handle])[0]
+  def file_puttag(self, handle, newval, deadline = None):
+    self._send_and_recv(58, [handle, newval], deadline)
 
-  def message_getsource(self, handle):
-    return self._send_and_recv(135, [handle])[0]
+  def file_getid(self, handle, deadline = None):
+    return self._send_and_recv(59, [handle], deadline)[0]
 
-  def message_getvalue(self, handle):
-    return self._send_and_recv(136, [handle])[0]
+  def file_putid(self, handle, newval, deadline = None):
+    self._send_and_recv(60, [handle, newval], deadline)
 
-  def message_release(self, handle):
-    self._send_and_recv(137, [handle])
+  def file_release(self, handle, deadline = None):
+    self._send_and_recv(61, [handle], deadline)
 
-  def _send_and_recv(self, funcid, args):
-    with self._lock:
-      self._bcap_send(self._serial, self._version, funcid, args)
-      (serial, version, hresult, retvals) = self._bcap_recv()
+  def robot_getvariable(self, handle, name, option = "", deadline = None):
+    return self._send_and_recv(62, [handle, name, option], deadline)[0]
 
-      if self._serial >= 0xFFFF:
-        self._serial  = 1
-      else:
-        self._serial += 1
+  def robot_getvariablenames(self, handle, option = "", deadline = None):
+    return self._send_and_recv(63, [handle, option], deadline)[0]
 
-      if HResult.failed(hresult):
-        raise ORiNException(hresult)
+  def robot_execute(self, handle, command, param = None, deadline = None):
+    return self._send_and_recv(64, [handle, command, param], deadline)[0]
 
-    if len(retvals) == 0:
-      retvals.append(None)
-      
-    return retvals
+  def robot_accelerate(self, handle, axis, accel, decel, deadline = None):
+    self._send_and_recv(65, [handle, axis, c_float(accel), c_float(decel)], deadline)
 
-  def _bcap_send(self, serial, version, funcid, args):
-    buf = self._serialize(serial, version, funcid, args)
-    flags = 0
-    if hasattr(socket, 'MSG_NOSIGNAL'):
-      flags |= socket.MSG_NOSIGNAL
-    self._sock.sendall(buf, flags)
+  def robot_change(self, handle, name, deadline = None):
+    self._send_and_recv(66, [handle, name], deadline)
 
-  def _serialize(self, serial, version, funcid, args):
-    format = "<bIHhiH"
-    packet_data = [BCAPClient._BCAP_SOH, 0, serial, version, funcid, len(args)]
+  def robot_chuck(self, handle, option = "", deadline = None):
+    self._send_and_recv(67, [handle, option], deadline)
 
-    packed_args = self._serialize_args(args, True)
+  def robot_drive(self, handle, axis, mov, option = "", deadline = None):
+    self._send_and_recv(68, [handle, axis, c_float(mov), option], deadline)
 
-    format += "%ds" % len(packed_args)
-    packet_data.append(packed_args)
+  def robot_gohome(self, handle, deadline = None):
+    self._send_and_recv(69, [handle], deadline)
 
-    format += "b"
-    packet_data.append(BCAPClient._BCAP_EOT)
+  def robot_halt(self, handle, option = "", deadline = None):
+    self._send_and_recv(70, [handle, option], deadline)
 
-    buf = struct.pack(format, *packet_data)
-    buf = buf.replace(b'\0\0\0\0', struct.pack("<I", len(buf)), 1)
+  def robot_hold(self, handle, option = "", deadline = None):
+    self._send_and_recv(71, [handle, option], deadline)
 
-    return buf
+  def robot_move(self, handle, comp, pose, option = "", deadline = None):
+    self._send_and_recv(72, [handle, comp, pose, option], deadline)
 
-  def _serialize_args(self, args, first = False):
-    format = "<"
-    packet_data = []
-    offset = 0
+  def robot_rotate(self, handle, rotsuf, deg, pivot, option = "", deadline = None):
+    self._send_and_recv(73, [handle, rotsuf, c_float(deg), pivot, option], deadline)
 
-    for arg in args:
-      if first:
-        format += "I"
-        packet_data.append(0)
+  def robot_speed(self, handle, axis, speed, deadline = None):
+    self._send_and_recv(74, [handle, axis, c_float(speed)], deadline)
 
-      packed_arg = self._serialize_arg(arg)
-      len_arg = len(packed_arg)
-      format += "%ds" % len_arg
-      packet_data.append(packed_arg)
+  def robot_unchuck(self, handle, option = "", deadline = None):
+    self._send_and_recv(75, [handle, option], deadline)
 
-      if first:
-        packet_data[2*offset] = len_arg
+  def robot_unhold(self, handle, option = "", deadline = None):
+    self._send_and_recv(76, [handle, option], deadline)
 
-      offset += 1
+  def robot_getattribute(self, handle, deadline = None):
+    return self._send_and_recv(77, [handle], deadline)[0]
 
-    if len(packet_data) > 0:
-      return struct.pack(format, *packet_data)
-    else:
-      return b''
+  def robot_gethelp(self, handle, deadline = None):
+    return self._send_and_recv(78, [handle], deadline)[0]
 
-  def _serialize_arg(self, arg):
-    format = "<HI"
-    packet_data = []
+  def robot_getname(self, handle, deadline = None):
+    return self._send_and_recv(79, [handle], deadline)[0]
 
-    if arg is None:
-      packet_data = [VarType.VT_EMPTY, 1]
+  def robot_gettag(self, handle, deadline = None):
+    return self._send_and_recv(80, [handle], deadline)[0]
 
-    elif isinstance(arg, (list, tuple)):
-      len_arg = len(arg)
+  def robot_puttag(self, handle, newval, deadline = None):
+    self._send_and_recv(81, [handle, newval], deadline)
 
-      if len_arg <= 0:
-        packet_data = [VarType.VT_EMPTY, 1]
-      else:
-        is_vntary = False
-        type_o0 = type(arg[0])
-        for o in arg:
-          if type_o0 != type(o):
-            is_vntary = True
-            break
+  def robot_getid(self, handle, deadline = None):
+    return self._send_and_recv(82, [handle], deadline)[0]
 
-        if is_vntary:
-          packed_args = self._serialize_args(arg)
-          format += "%ds" % len(packed_args)
-          packet_data += [VarType.VT_VARIANT | VarType.VT_ARRAY, len_arg, packed_args]        
+  def robot_putid(self, handle, newval, deadline = None):
+    self._send_and_recv(83, [handle, newval], deadline)
 
-        else:
-          if type_o0 in BCAPClient._DICT_TYPE2VT:
-            (vt, fmt, is_ctype) = BCAPClient._DICT_TYPE2VT[type_o0]
+  def robot_release(self, handle, deadline = None):
+    self._send_and_recv(84, [handle], deadline)
 
-            if vt == VarType.VT_DATE:
-              format += fmt * len_arg
-              packet_data += [vt | VarType.VT_ARRAY, len_arg]
-              for o in arg:
-                packet_data.append(BCAPClient.datetime2vntdate(o))
+  def task_getvariable(self, handle, name, option = "", deadline = None):
+    return self._send_and_recv(85, [handle, name, option], deadline)[0]
 
-            elif vt == VarType.VT_BSTR:
-              packet_data += [vt | VarType.VT_ARRAY, len_arg]
-              for o in arg:
-                if is_ctype:
-                  str_tmp = o.value.encode("utf-16le")
-                else:
-                  str_tmp = o.encode("utf-16le")
-                len_str = len(str_tmp)
-                format += fmt % len_str
-                packet_data += [len_str, str_tmp]
+  def task_getvariablenames(self, handle, option = "", deadline = None):
+    return self._send_and_recv(86, [handle, option], deadline)[0]
 
-            elif vt == VarType.VT_BOOL:
-              format += fmt * len_arg
-              packet_data += [vt | VarType.VT_ARRAY, len_arg]
-              for o in arg:
-                if o:
-                  packet_data.append(-1)
-                else:
-                  packet_data.append(0)
+  def task_execute(self, handle, command, param = None, deadline = None):
+    return self._send_and_recv(87, [handle, command, param], deadline)[0]
 
-            else:
-              format += fmt * len_arg
-              packet_data += [vt | VarType.VT_ARRAY, len_arg]
-              if is_ctype:
-                for o in arg:
-                  packet_data.append(o.value)
-              else:
-                packet_data += arg
+  def task_start(self, handle, mode, option = "", deadline = None):
+    self._send_and_recv(88, [handle, mode, option], deadline)
 
-          else:
-            raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
+  def task_stop(self, handle, mode, option = "", deadline = None):
+    self._send_and_recv(89, [handle, mode, option], deadline)
 
-    elif isinstance(arg, (bytes, bytearray)):
-      len_arg = len(arg)
-      format += "%ds" % len_arg
-      packet_data += [VarType.VT_ARRAY | VarType.VT_UI1, len_arg, arg]
+  def task_delete(self, handle, option = "", deadline = None):
+    self._send_and_recv(90, [handle, option], deadline)
 
-    else:
-      type_arg = type(arg)
-      if type_arg in BCAPClient._DICT_TYPE2VT:
-        (vt, fmt, is_ctype) = BCAPClient._DICT_TYPE2VT[type_arg]
+  def task_getfilename(self, handle, deadline = None):
+    return self._send_and_recv(91, [handle], deadline)[0]
 
-        if vt == VarType.VT_DATE:
-          format += fmt
-          date_tmp = BCAPClient.datetime2vntdate(arg)
-          packet_data += [vt, 1, date_tmp]
+  def task_getattribute(self, handle, deadline = None):
+    return self._send_and_recv(92, [handle], deadline)[0]
 
-        elif vt == VarType.VT_BSTR:
-          if is_ctype:
-            str_tmp = arg.value.encode("utf-16le")
-          else:
-            str_tmp = arg.encode("utf-16le")
-          len_str = len(str_tmp)
-          format += fmt % len_str
-          packet_data += [vt, 1, len_str, str_tmp]
+  def task_gethelp(self, handle, deadline = None):
+    return self._send_and_recv(93, [handle], deadline)[0]
 
-        elif vt == VarType.VT_BOOL:
-          format += fmt
-          if arg:
-            packet_data += [vt, 1, -1]
-          else:
-            packet_data += [vt, 1,  0]
+  def task_getname(self, handle, deadline = None):
+    return self._send_and_recv(94, [handle], deadline)[0]
 
-        else:
-          format += fmt
-          if is_ctype:
-            packet_data += [vt, 1, arg.value]
-          else:
-            packet_data += [vt, 1, arg]
+  def task_gettag(self, handle, deadline = None):
+    return self._send_and_recv(95, [handle], deadline)[0]
 
-      else:
-        raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
+  def task_puttag(self, handle, newval, deadline = None):
+    self._send_and_recv(96, [handle, newval], deadline)
 
-    return struct.pack(format, *packet_data)
+  def task_getid(self, handle, deadline = None):
+    return self._send_and_recv(97, [handle], deadline)[0]
 
-  def _bcap_recv(self):
-    while True:
-      buf_all = b''
+  def task_putid(self, handle, newval, deadline = None):
+    self._send_and_recv(98, [handle, newval], deadline)
 
-      buf_tmp = self._recv_with_select(1)
-      buf_all = b''.join([buf_all, buf_tmp])
+  def task_release(self, handle, deadline = None):
+    self._send_and_recv(99, [handle], deadline)
 
-      buf_tmp  = self._recv_with_select(4)
-      len_recv = struct.unpack("<I", buf_tmp)
-      buf_all  = b''.join([buf_all, buf_tmp])
+  def variable_getdatetime(self, handle, deadline = None):
+    return self._send_and_recv(100, [handle], deadline)[0]
 
-      buf_tmp = self._recv_with_select(len_recv[0] - 5)
-      buf_all = b''.join([buf_all, buf_tmp])
+  def variable_getvalue(self, handle, deadline = None):
+    return self._send_and_recv(101, [handle], deadline)[0]
 
-      (serial, version, hresult, retvals) = self._deserialize(buf_all)
+  def variable_putvalue(self, handle, newval, deadline = None):
+    self._send_and_recv(102, [handle, newval], deadline)
 
-      if (self._serial == serial) and (hresult != HResult.S_EXECUTING):
-        break
+  def variable_getattribute(self, handle, deadline = None):
+    return self._send_and_recv(103, [handle], deadline)[0]
 
-    return (serial, version, hresult, retvals)
+  def variable_gethelp(self, handle, deadline = None):
+    return self._send_and_recv(104, [handle], deadline)[0]
 
-  def _recv_with_select(self, len_recv):
-    buf_recv = b''
-    while True:
-      (reads, writes, errors) = select.select(
-        [self._sock], [], [], self._timeout)
+  def variable_getname(self, handle, deadline = None):
+    return self._send_and_recv(105, [handle], deadline)[0]
 
-      if len(reads) == 0:
-        raise ORiNException(HResult.E_TIMEOUT)
+  def variable_gettag(self, handle, deadline = None):
+    return self._send_and_recv(106, [handle], deadline)[0]
 
-      buf_recv = b''.join([buf_recv,
-        self._sock.recv(len_recv)])
+  def variable_puttag(self, handle, newval, deadline = None):
+    self._send_and_recv(107, [handle, newval], deadline)
 
-      if len(buf_recv) >= len_recv:
-        break
+  def variable_getid(self, handle, deadline = None):
+    return self._send_and_recv(108, [handle], deadline)[0]
 
-    return buf_recv
+  def variable_putid(self, handle, newval, deadline = None):
+    self._send_and_recv(109, [handle, newval], deadline)
 
-  def _deserialize(self, buf):
-    format = "<bIHhiH%dsb" % (len(buf) - 16)
-    (soh, len_buf, serial, version, hresult, len_args, buf_args, eot) \
-      = struct.unpack(format, buf)
+  def variable_getmicrosecond(self, handle, deadline = None):
+    return self._send_and_recv(110, [handle], deadline)[0]
 
-    if (soh != BCAPClient._BCAP_SOH) or (eot != BCAPClient._BCAP_EOT):
-      raise ORiNException(HResult.E_INVALIDPACKET)
+  def variable_release(self, handle, deadline = None):
+    self._send_and_recv(111, [handle], deadline)
 
-    (retvals, buf_args) = self._deserialize_args(buf_args, len_args, True)
+  def command_execute(self, handle, mode, deadline = None):
+    self._send_and_recv(112, [handle, mode], deadline)
 
-    return (serial, version, hresult, retvals)
+  def command_cancel(self, handle, deadline = None):
+    self._send_and_recv(113, [handle], deadline)
 
-  def _deserialize_args(self, buf, len_args, first = False):
-    retvals = []
+  def command_gettimeout(self, handle, deadline = None):
+    return self._send_and_recv(114, [handle], deadline)[0]
 
-    for i in range(len_args):
-      if first:
-        buf = buf[4:]
-      (retval, buf) = self._deserialize_arg(buf)
-      retvals.append(retval)
+  def command_puttimeout(self, handle, newval, deadline = None):
+    self._send_and_recv(115, [handle, newval], deadline)
 
-    return (retvals, buf)
+  def command_getstate(self, handle, deadline = None):
+    return self._send_and_recv(116, [handle], deadline)[0]
 
-  def _deserialize_arg(self, buf):
-    retval = None
+  def command_getparameters(self, handle, deadline = None):
+    return self._send_and_recv(117, [handle], deadline)[0]
 
-    format = "<HI%ds" % (len(buf) - 6)
-    (vt, len_arg, buf) = struct.unpack(format, buf)
+  def command_putparameters(self, handle, newval, deadline = None):
+    self._send_and_recv(118, [handle, newval], deadline)
 
-    if (vt & VarType.VT_ARRAY) != 0:
-      vt = vt ^ VarType.VT_ARRAY
-      if vt == VarType.VT_VARIANT:
-        (retval, buf) = self._deserialize_args(buf, len_arg)
+  def command_getresult(self, handle, deadline = None):
+    return self._send_and_recv(119, [handle], deadline)[0]
 
-      elif vt == VarType.VT_UI1:
-        format = "<%ds%ds" % (len_arg, len(buf) - len_arg)
-        (retval, buf) = struct.unpack(format, buf)
+  def command_getattribute(self, handle, deadline = None):
+    return self._send_and_recv(120, [handle], deadline)[0]
 
-      elif vt in BCAPClient._DICT_VT2TYPE:
-        (fmt, len_val) = BCAPClient._DICT_VT2TYPE[vt]
+  def command_gethelp(self, handle, deadline = None):
+    return self._send_and_recv(121, [handle], deadline)[0]
 
-        if vt == VarType.VT_BSTR:
-          retval = []
-          for i in range(len_arg):
-            format = "<I%ds" % (len(buf) - 4)
-            (len_str, buf) = struct.unpack(format, buf)
-            format = "<%ds%ds" % (len_str, len(buf) - len_str)
-            (ret_tmp, buf) = struct.unpack(format, buf)
-            retval.append(ret_tmp.decode("utf-16le"))
+  def command_getname(self, handle, deadline = None):
+    return self._send_and_recv(122, [handle], deadline)[0]
+
+  def command_gettag(self, handle, deadline = None):
+    return self._send_and_recv(123, [handle], deadline)[0]
+
+  def command_puttag(self, handle, newval, deadline = None):
+    self._send_and_recv(124, [handle, newval], deadline)
+
+  def command_getid(self, handle, deadline = None):
+    return self._send_and_recv(125, [handle], deadline)[0]
+
+  def command_putid(self, handle, newval, deadline = None):
+    self._send_and_recv(126, [handle, newval], deadline)
+
+  def command_release(self, handle, deadline = None):
+    self._send_and_recv(127, [handle], deadline)
+
+  def message_reply(self, handle, data, deadline = None):
+    self._send_and_recv(128, [handle, data], deadline)
+
+  def message_clear(self, handle, deadline = None):
+    self._send_and_recv(129, [handle], deadline)
+
+  def message_getdatetime(self, handle, deadline = None):
+    return self._send_and_recv(130, [handle], deadline)[0]
 
+  def message_getdescription(self, handle, deadline = None):
+    return self._send_and_recv(131, [handle], deadline)[0]
+
+  def message_getdestination(self, handle, deadline = None):
+    return self._send_and_recv(132, [handle], deadline)[0]
+
+  def message_getnumber(self, handle, deadline = None):
+    return self._send_and_recv(133, [handle], deadline)[0]
+
+  def message_getserialnumber(self, handle, deadline = None):
+    return self._send_and_recv(134, [handle], deadline)[0]
+
+  def message_getsource(self, handle, deadline = None):
+    return self._send_and_recv(135, [handle], deadline)[0]
+
+  def message_getvalue(self, handle, deadline = None):
+    return self._send_and_recv(136, [handle], deadline)[0]
+
+  def message_release(self, handle, deadline = None):
+    self._send_and_recv(137, [handle], deadline)
+
+  def start_pipeline(self, window = 8):
+    with self._lock:
+      if not (self._reader is None):
+        return
+      self._window       = Semaphore(window)
+      with self._pending_lock:
+        self._pending      = {}
+        self._reader_stop  = False
+        self._reader_error = None
+      self._reader = Thread(target = self._reader_loop,
+        name = "bcap-reader", daemon = True)
+      self._reader.start()
+
+  def stop_pipeline(self):
+    with self._lock:
+      reader = self._reader
+      if reader is None:
+        return
+      with self._pending_lock:
+        self._reader_stop = True
+    reader.join()
+    self._fail_pending(ORiNException(HResult.E_ABORT))
+    with self._lock:
+      self._reader = None
+
+  def is_pipelined(self):
+    return not (self._reader is None)
+
+  def submit(self, funcid, args, deadline = None):
+    deadline = self._call_deadline(deadline)
+    if self._reader is None:
+      future = Future()
+      try:
+        future.set_result(self._send_and_recv(funcid, args, deadline))
+      except Exception as e:
+        future.set_exception(e)
+      return future
+
+    window_deadline = self._make_deadline(deadline)
+    if window_deadline is None:
+      self._window.acquire()
+    elif not self._window.acquire(timeout = min(max(0.0, window_deadline - time.monotonic()), TIMEOUT_MAX)):
+      self._raise_timeout(deadline)
+    if not (deadline is None) and (deadline <= time.monotonic()):
+      self._window.release()
+      raise DeadlineExceeded("b-CAP call deadline exceeded before the request was sent")
+
+    stats = self._stats
+    if not (stats is None):
+      t_call = time.perf_counter()
+    future = Future()
+    serial = None
+    try:
+      with self._lock:
+        if not (stats is None):
+          t_locked = time.perf_counter()
+          self._tx_last = None
+
+        entry = [future, self._make_deadline(deadline), deadline]
+        if not (stats is None):
+          entry.extend((stats, funcid, t_call, t_locked, None))
+        with self._pending_lock:
+          # checked together with the insert: once the reader has failed or
+          # stop_pipeline() was called, _fail_pending() may already have
+          # run and nothing would resolve a new entry
+          if not (self._reader_error is None):
+            raise self._reader_error
+          if self._reader_stop:
+            self._window.release()
+            future.set_exception(ORiNException(HResult.E_ABORT))
+            return future
+
+          serial = self._serial
+          while serial in self._pending:
+            serial = 1 if serial >= 0xFFFF else serial + 1
+          self._serial = 1 if serial >= 0xFFFF else serial + 1
+          self._pending[serial] = entry
+        self._bcap_send(serial, self._version, funcid, args, entry)
+    except BaseException:
+      if serial is None:
+        self._window.release()
+      else:
+        self._pop_pending(serial)
+      raise
+
+    return future
+
+  def call_many(self, calls, window = 16, deadline = None):
+    # Sends a list of (funcid, args) requests with up to `window` requests
+    # in flight and returns one entry per call: the retvals list (like
+    # _send_and_recv) or the exception of that call, i.e. the ORiNException
+    # of the response or the encoding error of arguments that do not fit
+    # their VARIANT (such a request is not sent). Transport errors and
+    # DeadlineExceeded are raised for the whole batch.
+    deadline = self._call_deadline(deadline)
+    if not (self._reader is None):
+      futures = []
+      for (funcid, args) in calls:
+        try:
+          futures.append(self.submit(funcid, args, deadline))
+        except _ENCODE_ERRORS as e:
+          if e is self._reader_error:
+            raise
+          futures.append(e)
+      results = []
+      for future in futures:
+        if isinstance(future, BaseException):
+          results.append(future)
+          continue
+        try:
+          results.append(future.result())
+        except ORiNException as e:
+          results.append(e)
+      return results
+
+    results = [None] * len(calls)
+    stats = self._stats
+    # serial -> (funcid, t_call, _tx_last) while statistics are enabled
+    timing = {}
+    self._lock_until(deadline)
+    try:
+      pending = {}
+      next_call = 0
+      frame_deadline = None
+      while (next_call < len(calls)) or (len(pending) > 0):
+        while (next_call < len(calls)) and (len(pending) < window):
+          (funcid, args) = calls[next_call]
+          serial = self._serial
+          self._serial = 1 if serial >= 0xFFFF else serial + 1
+          t_call = time.perf_counter() if not (stats is None) else None
+          self._tx_last = None
+          try:
+            self._bcap_send(serial, self._version, funcid, args)
+          except _ENCODE_ERRORS as e:
+            # the frame is encoded before anything is written: only this
+            # request fails, the stream stays in sync
+            results[next_call] = e
+            next_call += 1
+            continue
+          if not (stats is None):
+            timing[serial] = (funcid, t_call, self._tx_last)
+          pending[serial] = next_call
+          next_call += 1
+          frame_deadline = self._make_deadline(deadline)
+        if len(pending) == 0:
+          continue
+
+        (serial, version, hresult, retvals) = \
+          self._recv_frame_until(frame_deadline, deadline)
+        frame_deadline = self._make_deadline(deadline)
+
+        index = pending.get(serial)
+        if (index is None) or (hresult == HResult.S_EXECUTING):
+          continue
+        del pending[serial]
+
+        failed = HResult.failed(hresult)
+        if not (stats is None):
+          (funcid, t_call, tx) = timing.pop(serial)
+          self._record_call(stats, funcid, t_call, t_call, tx, self._rx_last, failed)
+
+        if failed:
+          results[index] = ORiNException(hresult)
+        else:
+          if len(retvals) == 0:
+            retvals.append(None)
+          results[index] = retvals
+    except BaseException:
+      for (funcid, t_call, tx) in timing.values():
+        self._record_call(stats, funcid, t_call, t_call, tx, None, True)
+      raise
+    finally:
+      self._lock.release()
+
+    return results
+
+  def _pop_pending(self, serial):
+    with self._pending_lock:
+      entry = self._pending.pop(serial, None)
+    if not (entry is None):
+      self._window.release()
+    return entry
+
+  def _fail_pending(self, exc):
+    with self._pending_lock:
+      serials = list(self._pending.keys())
+    for serial in serials:
+      entry = self._pop_pending(serial)
+      if not (entry is None):
+        self._record_entry(entry, None, True)
+        entry[0].set_exception(exc)
+
+  def _expire_pending(self):
+    now = time.monotonic()
+    with self._pending_lock:
+      serials = [serial for (serial, entry) in self._pending.items()
+                 if not (entry[1] is None) and entry[1] <= now]
+    for serial in serials:
+      entry = self._pop_pending(serial)
+      if not (entry is None):
+        self._record_entry(entry, None, True)
+        if not (entry[2] is None) and entry[2] <= now:
+          entry[0].set_exception(DeadlineExceeded("b-CAP call deadline exceeded"))
         else:
-          format = "<%s%ds" % (fmt * len_arg, len(buf) - (len_val * len_arg))
-          unpacked_arg = struct.unpack(format, buf)
-          retval   = list(unpacked_arg[:-1])
-          buf      = unpacked_arg[-1]
+          entry[0].set_exception(ORiNException(HResult.E_TIMEOUT))
 
-          if vt == VarType.VT_DATE:
-            for i in range(len(retval)):
-              retval[i] = BCAPClient.vntdate2datetime(retval[i])
+  def _reader_loop(self):
+    while not self._reader_stop:
+      self._expire_pending()
+      try:
+        (serial, version, hresult, retvals) = \
+          self._recv_frame(time.monotonic() + BCAPClient._READER_TICK)
+      except ORiNException as e:
+        if e.hresult == HResult.E_TIMEOUT:
+          continue
+        self._reader_error = e
+        break
+      except Exception as e:
+        self._reader_error = e
+        break
 
-          elif vt == VarType.VT_BOOL:
-            for i in range(len(retval)):
-              retval[i] = (retval[i] != 0)
+      if hresult == HResult.S_EXECUTING:
+        with self._pending_lock:
+          entry = self._pending.get(serial)
+          if not (entry is None):
+            entry[1] = self._make_deadline(entry[2])
+        continue
+
+      entry = self._pop_pending(serial)
+      if entry is None:
+        continue
+      self._record_entry(entry, self._rx_last, HResult.failed(hresult))
 
+      if HResult.failed(hresult):
+        entry[0].set_exception(ORiNException(hresult))
       else:
-        raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
+        if len(retvals) == 0:
+          retvals.append(None)
+        entry[0].set_result(retvals)
 
-    else:
-      if vt in [ VarType.VT_EMPTY, VarType.VT_NULL ]:
-        pass
-      elif vt in BCAPClient._DICT_VT2TYPE:
-        (fmt, len_val) = BCAPClient._DICT_VT2TYPE[vt]
-        
-        if vt == VarType.VT_BSTR:
-          format = "<I%ds" % (len(buf) - 4)
-          (len_str, buf) = struct.unpack(format, buf)
-          format = "<%ds%ds" % (len_str, len(buf) - len_str)
-          (retval , buf) = struct.unpack(format, buf)
-          retval = retval.decode("utf-16le")
+    if not (self._reader_error is None):
+      self._fail_pending(self._reader_error)
 
+  def _send_and_recv(self, funcid, args, deadline = None):
+    deadline = self._call_deadline(deadline)
+    if not (self._reader is None):
+      return self.submit(funcid, args, deadline).result()
+    if not (self._stats is None):
+      return self._measured_send_and_recv(funcid, args, deadline)
+
+    self._lock_until(deadline)
+    try:
+      self._bcap_send(self._serial, self._version, funcid, args)
+      try:
+        (serial, version, hresult, retvals) = self._bcap_recv(deadline)
+      finally:
+        # also after a timeout: a late response must not match the next request
+        if self._serial >= 0xFFFF:
+          self._serial  = 1
         else:
-          format = "<%s%ds" % (fmt, (len(buf) - len_val))
-          (retval, buf) = struct.unpack(format, buf)
+          self._serial += 1
 
-          if vt == VarType.VT_DATE:
-            retval = BCAPClient.vntdate2datetime(retval)
+      if HResult.failed(hresult):
+        raise ORiNException(hresult)
+    finally:
+      self._lock.release()
 
-          elif vt == VarType.VT_BOOL:
-            retval = (retval != 0)
+    if len(retvals) == 0:
+      retvals.append(None)
+      
+    return retvals
+
+  def _measured_send_and_recv(self, funcid, args, deadline):
+    # _send_and_recv with statistics: _bcap_send/_recv_frame leave their
+    # sizes and codec times in _tx_last/_rx_last while self._lock is held
+    stats = self._stats
+    t_call = time.perf_counter()
+    t_locked = None
+    tx = None
+    rx = None
+    failed = True
+    try:
+      self._lock_until(deadline)
+      try:
+        t_locked = time.perf_counter()
+        self._tx_last = None
+        self._rx_last = None
+        self._bcap_send(self._serial, self._version, funcid, args)
+        tx = self._tx_last
+        try:
+          (serial, version, hresult, retvals) = self._bcap_recv(deadline)
+        finally:
+          if self._serial >= 0xFFFF:
+            self._serial  = 1
+          else:
+            self._serial += 1
+          rx = self._rx_last
+
+        if HResult.failed(hresult):
+          raise ORiNException(hresult)
+      finally:
+        self._lock.release()
+      failed = False
+    finally:
+      self._record_call(stats, funcid, t_call, t_locked, tx, rx, failed)
+
+    if len(retvals) == 0:
+      retvals.append(None)
+
+    return retvals
 
+  def _record_call(self, stats, funcid, t_call, t_locked, tx, rx, failed):
+    # tx = (bytes, encode_s, t_sent), rx = (bytes, decode_s, t_received)
+    t_end = time.perf_counter()
+    if t_locked is None:
+      t_locked = t_end
+    (sent, encode_s, t_sent) = (0, 0.0, None) if (tx is None) else tx
+    (received, decode_s, t_received) = (0, 0.0, None) if (rx is None) else rx
+    rtt_s = None
+    if not (t_sent is None) and not (t_received is None):
+      rtt_s = t_received - t_sent
+    stats.record(funcid, t_end - t_call, rtt_s, t_locked - t_call,
+      encode_s, decode_s, sent, received, failed)
+
+  def _record_entry(self, entry, rx, failed):
+    # pipelined request: [future, deadline, call_deadline,
+    #                     stats, funcid, t_call, t_locked, tx]
+    if len(entry) > 3:
+      (stats, funcid, t_call, t_locked, tx) = entry[3:]
+      self._record_call(stats, funcid, t_call, t_locked, tx, rx, failed)
+
+  def _bcap_send(self, serial, version, funcid, args, entry = None):
+    # entry: pending request that gets tx before the frame is on the wire
+    # (the reader thread may record the response before sendall() returns)
+    stats = self._stats
+    if not (stats is None):
+      t_encode = time.perf_counter()
+    buf = self._template_frame(serial, version, funcid, args)
+    if buf is None:
+      buf = self._serialize(serial, version, funcid, args)
+    flags = 0
+    if hasattr(socket, 'MSG_NOSIGNAL'):
+      flags |= socket.MSG_NOSIGNAL
+    if stats is None:
+      self._sock.sendall(buf, flags)
+    else:
+      t_sent = time.perf_counter()
+      self._tx_last = (len(buf), t_sent - t_encode, t_sent)
+      if not (entry is None) and len(entry) > 3:
+        entry[7] = self._tx_last
+      self._sock.sendall(buf, flags)
+
+  def _template_frame(self, serial, version, funcid, args):
+    # Requests with only scalar int/float/None and string arguments
+    # (variable_getvalue, variable_release, controller_getvariable, ...)
+    # have a fixed layout: keep the encoded frame per funcid and signature
+    # and only patch serial, version and the numeric values in place.
+    # A signature is compiled the second time it is seen, so one-off names
+    # (bulk reads) stay on the plain _serialize path and do not evict the
+    # templates of the recurring calls. Returns None if the caller has to
+    # serialize itself.
+    # Must be called with self._lock held; the frame is reused by the next call.
+    key = [funcid]
+    for arg in args:
+      type_arg = type(arg)
+      if (type_arg is int) or (type_arg is float):
+        key.append(type_arg)
+      elif (type_arg is str) or (arg is None):
+        key.append(arg)
       else:
-        raise ORiNException(HResult.E_CAO_VARIANT_TYPE_NOSUPPORT)
+        return None
+    key = tuple(key)
+
+    entry = self._templates.get(key)
+    if entry is None:
+      seen = self._template_seen
+      if seen.pop(key, None) is None:
+        seen[key] = True
+        if len(seen) > BCAPClient._TEMPLATE_CACHE_SIZE:
+          seen.popitem(last = False)
+        return None
+      entry = self._compile_template(self._serialize(serial, version, funcid, args), args)
+      self._templates[key] = entry
+      if len(self._templates) > BCAPClient._TEMPLATE_CACHE_SIZE:
+        self._templates.popitem(last = False)
+      return entry[0]
+
+    self._templates.move_to_end(key)
+    (buf, patches) = entry
+    BCAPClient._PATCH_SERIAL.pack_into(buf, 5, serial, version)
+    for (index, offset, packer) in patches:
+      packer.pack_into(buf, offset, args[index])
+
+    return buf
+
+  def _compile_template(self, frame, args):
+    # patch offsets come from the argument length prefixes of the frame
+    buf = bytearray(frame)
+    patches = []
+    offset = BCAPClient._HEADER.size
+    for (index, arg) in enumerate(args):
+      packer = BCAPClient._PATCH_TYPES.get(type(arg))
+      if not (packer is None):
+        # 4 bytes argument length, 2 bytes vt, 4 bytes element count
+        patches.append((index, offset + 10, packer))
+      offset += 4 + BCAPClient._PATCH_LEN.unpack_from(buf, offset)[0]
+
+    return (buf, patches)
+
+  def _bcap_recv(self, call_deadline = None):
+    deadline = self._make_deadline(call_deadline)
+    while True:
+      (serial, version, hresult, retvals) = \
+        self._recv_frame_until(deadline, call_deadline)
+
+      if self._serial == serial:
+        if hresult != HResult.S_EXECUTING:
+          break
+        # controller is still executing the request -> restart the timeout
+        # (never beyond the caller's deadline)
+        deadline = self._make_deadline(call_deadline)
+
+    return (serial, version, hresult, retvals)
+
+  def _call_deadline(self, deadline):
+    # earlier of the deadline argument and the thread's call_deadline() scope
+    scope = getattr(_deadline_scope, "deadline", None)
+    if (deadline is None) or (not (scope is None) and (scope < deadline)):
+      deadline = scope
+    return deadline
+
+  def _make_deadline(self, call_deadline = None):
+    # timeout for the next frame, capped by the caller's deadline
+    if self._timeout is None:
+      return call_deadline
+    deadline = time.monotonic() + self._timeout
+    if not (call_deadline is None) and (call_deadline < deadline):
+      deadline = call_deadline
+    return deadline
+
+  def _raise_timeout(self, call_deadline):
+    if not (call_deadline is None) and (call_deadline <= time.monotonic()):
+      raise DeadlineExceeded("b-CAP call deadline exceeded")
+    raise ORiNException(HResult.E_TIMEOUT)
+
+  def _lock_until(self, deadline):
+    # Waiting for the connection counts against the caller's deadline; an
+    # expired deadline never sends the request.
+    if deadline is None:
+      self._lock.acquire()
+      return
+    if self._lock.acquire(timeout = min(max(0.0, deadline - time.monotonic()), TIMEOUT_MAX)):
+      if deadline > time.monotonic():
+        return
+      self._lock.release()
+    raise DeadlineExceeded("b-CAP call deadline exceeded before the request was sent")
+
+  def _recv_frame_until(self, deadline, call_deadline):
+    try:
+      return self._recv_frame(deadline)
+    except ORiNException as e:
+      if e.hresult == HResult.E_TIMEOUT:
+        self._raise_timeout(call_deadline)
+      raise
+
+  def _recv_frame(self, deadline):
+    while True:
+      start = self._rbuf_start
+      len_avail = self._rbuf_end - start
+
+      if len_avail >= 5:
+        (soh, len_frame) = struct.unpack_from("<bI", self._rbuf, start)
+        if (soh != BCAPCodec._BCAP_SOH) \
+           or (len_frame < BCAPClient._HEADER.size + 1) \
+           or (len_frame > BCAPCodec._MAX_FRAME_SIZE):
+          raise ORiNException(HResult.E_INVALIDPACKET)
+
+        if len_avail >= len_frame:
+          self._rbuf_start += len_frame
+          try:
+            with memoryview(self._rbuf) as view:
+              if self._stats is None:
+                return self._deserialize(view[start:start + len_frame])
+              t_received = time.perf_counter()
+              frame = self._deserialize(view[start:start + len_frame])
+              self._rx_last = (len_frame, time.perf_counter() - t_received, t_received)
+              return frame
+          finally:
+            if self._rbuf_start == self._rbuf_end:
+              self._rbuf_start = 0
+              self._rbuf_end   = 0
+              if len(self._rbuf) > BCAPClient._RECV_BUF_SIZE:
+                self._rbuf = bytearray(BCAPClient._RECV_BUF_SIZE)
+
+        self._recv_into_buffer(len_frame, deadline)
+      else:
+        self._recv_into_buffer(5, deadline)
+
+  def _recv_into_buffer(self, len_need, deadline):
+    # make room for len_need bytes from _rbuf_start on
+    if self._rbuf_start + len_need > len(self._rbuf):
+      len_avail = self._rbuf_end - self._rbuf_start
+      if len_need > len(self._rbuf):
+        rbuf = bytearray(len_need)
+      else:
+        rbuf = self._rbuf
+      rbuf[:len_avail] = self._rbuf[self._rbuf_start:self._rbuf_end]
+      self._rbuf       = rbuf
+      self._rbuf_start = 0
+      self._rbuf_end   = len_avail
+
+    while self._rbuf_end - self._rbuf_start < len_need:
+      if deadline is None:
+        timeout = None
+      else:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+          raise ORiNException(HResult.E_TIMEOUT)
+
+      (reads, writes, errors) = select.select(
+        [self._sock], [], [], timeout)
+
+      if len(reads) == 0:
+        raise ORiNException(HResult.E_TIMEOUT)
+
+      with memoryview(self._rbuf) as view:
+        len_recv = self._sock.recv_into(view[self._rbuf_end:])
+
+      if len_recv == 0:
+        raise ConnectionError("b-CAP connection closed by peer")
 
-    return (retval, buf)
+      self._rbuf_end += len_recv
\ No newline at end of file
@@ -0,0 +1,196 @@
+﻿'''
+Per-function-ID call statistics for BCAPClient (enable_stats()).
+
+Times are taken with time.perf_counter() and split into
+  lock wait  waiting for the connection (another caller is on the wire),
+  encode     building the request frame (Python codec),
+  rtt        request sent -> response frame complete (network + controller),
+  decode     parsing the response frame (Python codec),
+so a slow call can be attributed to contention, the codec or the wire.
+'''
+
+# -*- coding:utf-8 -*-
+from threading import Lock
+
+# b-CAP function IDs as used by the BCAPClient methods
+FUNC_NAMES = {
+  1: "service_start", 2: "service_stop", 3: "controller_connect",
+  4: "controller_disconnect", 5: "controller_getextension", 6: "controller_getfile",
+  7: "controller_getrobot", 8: "controller_gettask", 9: "controller_getvariable",
+  10: "controller_getcommand", 11: "controller_getextensionnames",
+  12: "controller_getfilenames", 13: "controller_getrobotnames",
+  14: "controller_gettasknames", 15: "controller_getvariablenames",
+  16: "controller_getcommandnames", 17: "controller_execute",
+  18: "controller_getmessage", 19: "controller_getattribute",
+  20: "controller_gethelp", 21: "controller_getname", 22: "controller_gettag",
+  23: "controller_puttag", 24: "controller_getid", 25: "controller_putid",
+  26: "extension_getvariable", 27: "extension_getvariablenames",
+  28: "extension_execute", 29: "extension_getattribute", 30: "extension_gethelp",
+  31: "extension_getname", 32: "extension_gettag", 33: "extension_puttag",
+  34: "extension_getid", 35: "extension_putid", 36: "extension_release",
+  37: "file_getfile", 38: "file_getvariable", 39: "file_getfilenames",
+  40: "file_getvariablenames", 41: "file_execute", 42: "file_copy", 43: "file_delete",
+  44: "file_move", 45: "file_run", 46: "file_getdatecreated",
+  47: "file_getdatelastaccessed", 48: "file_getdatelastmodified", 49: "file_getpath",
+  50: "file_getsize", 51: "file_gettype", 52: "file_getvalue", 53: "file_putvalue",
+  54: "file_getattribute", 55: "file_gethelp", 56: "file_getname", 57: "file_gettag",
+  58: "file_puttag", 59: "file_getid", 60: "file_putid", 61: "file_release",
+  62: "robot_getvariable", 63: "robot_getvariablenames", 64: "robot_execute",
+  65: "robot_accelerate", 66: "robot_change", 67: "robot_chuck", 68: "robot_drive",
+  69: "robot_gohome", 70: "robot_halt", 71: "robot_hold", 72: "robot_move",
+  73: "robot_rotate", 74: "robot_speed", 75: "robot_unchuck", 76: "robot_unhold",
+  77: "robot_getattribute", 78: "robot_gethelp", 79: "robot_getname",
+  80: "robot_gettag", 81: "robot_puttag", 82: "robot_getid", 83: "robot_putid",
+  84: "robot_release", 85: "task_getvariable", 86: "task_getvariablenames",
+  87: "task_execute", 88: "task_start", 89: "task_stop", 90: "task_delete",
+  91: "task_getfilename", 92: "task_getattribute", 93: "task_gethelp",
+  94: "task_getname", 95: "task_gettag", 96: "task_puttag", 97: "task_getid",
+  98: "task_putid", 99: "task_release", 100: "variable_getdatetime",
+  101: "variable_getvalue", 102: "variable_putvalue", 103: "variable_getattribute",
+  104: "variable_gethelp", 105: "variable_getname", 106: "variable_gettag",
+  107: "variable_puttag", 108: "variable_getid", 109: "variable_putid",
+  110: "variable_getmicrosecond", 111: "variable_release", 112: "command_execute",
+  113: "command_cancel", 114: "command_gettimeout", 115: "command_puttimeout",
+  116: "command_getstate", 117: "command_getparameters", 118: "command_putparameters",
+  119: "command_getresult", 120: "command_getattribute", 121: "command_gethelp",
+  122: "command_getname", 123: "command_gettag", 124: "command_puttag",
+  125: "command_getid", 126: "command_putid", 127: "command_release",
+  128: "message_reply", 129: "message_clear", 130: "message_getdatetime",
+  131: "message_getdescription", 132: "message_getdestination",
+  133: "message_getnumber", 134: "message_getserialnumber", 135: "message_getsource",
+  136: "message_getvalue", 137: "message_release",
+}
+
+def func_name(funcid):
+  return FUNC_NAMES.get(funcid, "func_%d" % funcid)
+
+class LatencyHistogram:
+  # HDR-style log-linear histogram over integer microseconds: exact below
+  # 128 us, above that 64 buckets per power of two (relative error < 1.6 %).
+  # Buckets are kept sparse, so the size only grows with the value range.
+
+  def __init__(self):
+    self.counts = {}
+    self.count = 0
+    self.total_us = 0
+    self.max_us = 0
+
+  @staticmethod
+  def _index(us):
+    if us < 128:
+      return us
+    shift = us.bit_length() - 7
+    return (shift << 6) + (us >> shift)
+
+  @staticmethod
+  def _highest(index):
+    # highest value that falls into bucket `index`
+    if index < 128:
+      return index
+    shift = (index >> 6) - 1
+    return ((index - (shift << 6) + 1) << shift) - 1
+
+  def record(self, seconds):
+    us = int(seconds * 1e6)
+    if us < 0:
+      us = 0
+    index = LatencyHistogram._index(us)
+    self.counts[index] = self.counts.get(index, 0) + 1
+    self.count += 1
+    self.total_us += us
+    if us > self.max_us:
+      self.max_us = us
+
+  def percentile(self, q):
+    # value in microseconds below which a fraction q of the samples lies
+    if self.count == 0:
+      return 0
+    rank = max(1, int(q * self.count + 0.999999))
+    seen = 0
+    for index in sorted(self.counts):
+      seen += self.counts[index]
+      if seen >= rank:
+        return min(LatencyHistogram._highest(index), self.max_us)
+    return self.max_us
+
+  def summary_ms(self):
+    if self.count == 0:
+      return {"count" : 0}
+    return {
+      "count"   : self.count,
+      "mean_ms" : self.total_us / self.count / 1e3,
+      "p50_ms"  : self.percentile(0.50) / 1e3,
+      "p90_ms"  : self.percentile(0.90) / 1e3,
+      "p99_ms"  : self.percentile(0.99) / 1e3,
+      "max_ms"  : self.max_us / 1e3,
+    }
+
+class _FuncStats:
+  __slots__ = ("count", "errors", "bytes_sent", "bytes_received",
+    "latency", "rtt", "lock_wait_s", "encode_s", "decode_s")
+
+  def __init__(self):
+    self.count          = 0
+    self.errors         = 0
+    self.bytes_sent     = 0
+    self.bytes_received = 0
+    self.latency        = LatencyHistogram()
+    self.rtt            = LatencyHistogram()
+    self.lock_wait_s    = 0.0
+    self.encode_s       = 0.0
+    self.decode_s       = 0.0
+
+class BCAPCallStats:
+  # Thread-safe; one instance can be shared by several BCAPClient objects
+  # (e.g. all sessions of a pool).
+
+  def __init__(self):
+    self._lock  = Lock()
+    self._funcs = {}
+
+  def record(self, funcid, latency_s, rtt_s = None, lock_wait_s = 0.0,
+             encode_s = 0.0, decode_s = 0.0, sent = 0, received = 0,
+             error = False):
+    with self._lock:
+      entry = self._funcs.get(funcid)
+      if entry is None:
+        entry = self._funcs[funcid] = _FuncStats()
+      entry.count += 1
+      if error:
+        entry.errors += 1
+      entry.bytes_sent     += sent
+      entry.bytes_received += received
+      entry.latency.record(latency_s)
+      if not (rtt_s is None):
+        entry.rtt.record(rtt_s)
+      entry.lock_wait_s += lock_wait_s
+      entry.encode_s    += encode_s
+      entry.decode_s    += decode_s
+
+  def snapshot(self, reset = False):
+    # {funcid: {name, count, errors, bytes_sent, bytes_received,
+    #           latency_ms: {count, mean_ms, p50_ms, p90_ms, p99_ms, max_ms},
+    #           rtt_ms: {...}, lock_wait_ms, encode_ms, decode_ms}}
+    with self._lock:
+      funcs = self._funcs
+      if reset:
+        self._funcs = {}
+      result = {}
+      for (funcid, entry) in sorted(funcs.items()):
+        result[funcid] = {
+          "name"           : func_name(funcid),
+          "count"          : entry.count,
+          "errors"         : entry.errors,
+          "bytes_sent"     : entry.bytes_sent,
+          "bytes_received" : entry.bytes_received,
+          "latency_ms"     : entry.latency.summary_ms(),
+          "rtt_ms"         : entry.rtt.summary_ms(),
+          "lock_wait_ms"   : entry.lock_wait_s * 1e3,
+          "encode_ms"      : entry.encode_s * 1e3,
+          "decode_ms"      : entry.decode_s * 1e3,
+        }
+    return result
+
+  def reset(self):
+    with self._lock:
+      self._funcs = {}
@@ -0,0 +1,314 @@
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .denso_rc8_controller import DensoRC8Controller
+
+# b-CAP Funktions-ID für Variable_GetValue (BCAPClient.call_many)
+_FUNC_VARIABLE_GETVALUE = 101
+
+STATUS_RUNNING = 3
+
+
+class TaskStatusHub:
+    """
+    Gemeinsamer @STATUS-Poller für alle Beobachter.
+
+    Ein Thread liest pro Zyklus das @STATUS jedes bekannten Tasks genau einmal
+    (alle Tasks gesammelt/pipelined über BCAPClient.call_many) und verteilt die Werte:
+    - wait_for() blockiert auf einer Condition bis zum nächsten Messwert,
+    - Listener werden nach jedem Messwert aufgerufen (z. B. STATUS-Property),
+    - Change-Listener einmal pro Zyklus mit den geänderten Tasks (TaskStatuses).
+    Die Last am Controller hängt damit nur von der Anzahl der Tasks ab,
+    nicht von der Anzahl wartender Clients.
+
+    Bekannt sind alle Tasks aus controller.task_status_vars (also aus get_program()).
+
+    Adaptives Intervall:
+    - nach kick() (Task gestartet/gestoppt) und nach jeder Statusänderung wird
+      fast_cycles Zyklen lang mit fast_interval gepollt (schnelle Bestätigung
+      von Endzuständen),
+    - ohne Änderung verdoppelt sich das Intervall bis busy_interval (mind. ein
+      Task läuft) bzw. idle_interval (kein Task läuft),
+    - request_interval() setzt eine Obergrenze, solange der Aufrufer sie hält.
+    Pro erkannter Änderung wird der Abstand zum vorherigen Messwert dieses Tasks
+    als Erkennungslatenz (obere Schranke) gespeichert.
+    """
+
+    _LATENCY_SAMPLES = 1000
+
+    def __init__(
+        self,
+        controller: "DensoRC8Controller",
+        fast_interval: float = 0.02,
+        busy_interval: float = 0.1,
+        idle_interval: float = 1.0,
+        backoff: float = 2.0,
+        fast_cycles: int = 3,
+    ):
+        self.controller = controller
+        self.fast_interval = fast_interval
+        self.busy_interval = busy_interval
+        self.idle_interval = idle_interval
+        self.backoff = backoff
+        self.fast_cycles = fast_cycles
+        # aktuelles Intervall (adaptiv, ohne Overrides) + verbleibende schnelle Zyklen
+        self.interval = fast_interval
+        self._fast_left = fast_cycles
+
+        self._cond = threading.Condition()
+        # Task -> (Messwert-Nummer, @STATUS)
+        self._samples: Dict[str, Tuple[int, int]] = {}
+        # Task -> Zeitpunkt (monotonic) des letzten Messwerts
+        self._sample_times: Dict[str, float] = {}
+        self._listeners: List[Callable[[str, int], None]] = []
+        self._change_listeners: List[Callable[[Dict[str, int]], None]] = []
+
+        # Token -> max. Intervall [s] (request_interval)
+        self._overrides: Dict[int, float] = {}
+        self._tokens = itertools.count(1)
+        # Erkennungslatenz [s] der letzten Statusänderungen
+        self._latencies: Deque[float] = deque(maxlen=self._LATENCY_SAMPLES)
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+        # Anzahl Poll-Zyklen mit mind. einem gelesenen Task (Diagnose)
+        self.cycles = 0
+        # Zeitpunkt (monotonic) des letzten Poll-Zyklus
+        self.last_poll_at: Optional[float] = None
+
+    # ---------------------- Lifecycle ----------------------
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="TaskStatusHub", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=max(1.0, self.idle_interval * 2))
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            changed = False
+            try:
+                changed = self.poll_once()
+            except Exception as e:
+                logging.debug("Task status poll failed: %r", e)
+                self.controller.note_failure(e)
+            self._wake.wait(self._next_interval(changed))
+            self._wake.clear()
+
+    # ---------------------- Intervall ----------------------
+
+    def _next_interval(self, changed: bool) -> float:
+        if changed:
+            self.interval = self.fast_interval
+            self._fast_left = self.fast_cycles
+        elif self._fast_left > 0:
+            self._fast_left -= 1
+        else:
+            with self._cond:
+                running = any(status == STATUS_RUNNING for _, status in self._samples.values())
+            cap = self.busy_interval if running else self.idle_interval
+            self.interval = min(self.interval * self.backoff, cap)
+        return self.effective_interval()
+
+    def effective_interval(self) -> float:
+        with self._cond:
+            override = min(self._overrides.values(), default=None)
+        return self.interval if override is None else min(self.interval, override)
+
+    def kick(self):
+        """Sofort pollen und wieder schnell werden (nach Task-Start/-Stop)."""
+        self.interval = self.fast_interval
+        self._fast_left = self.fast_cycles
+        self._wake.set()
+
+    def request_interval(self, seconds: float) -> int:
+        """
+        Max. Poll-Intervall vorgeben, bis release_interval(token) aufgerufen wird.
+        Nie schneller als fast_interval, damit die Last am Controller begrenzt bleibt.
+        """
+        with self._cond:
+            token = next(self._tokens)
+            self._overrides[token] = max(self.fast_interval, float(seconds))
+        self._wake.set()
+        return token
+
+    def release_interval(self, token: int):
+        with self._cond:
+            self._overrides.pop(token, None)
+
+    # ---------------------- Beobachter ----------------------
+
+    def add_listener(self, callback: Callable[[str, int], None]):
+        """callback(task_name, status) nach jedem Messwert (im Hub-Thread, kurz halten)."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, int], None]):
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def add_change_listener(self, callback: Callable[[Dict[str, int]], None]):
+        """callback({task_name: status}) einmal pro Zyklus, nur mit geänderten Tasks."""
+        self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[Dict[str, int]], None]):
+        try:
+            self._change_listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def statuses(self) -> Dict[str, int]:
+        """Letzter @STATUS aller aktuell bekannten Tasks (controller.task_status_vars)."""
+        known = set(self.controller.task_status_vars)
+        with self._cond:
+            return {name: status for name, (_, status) in self._samples.items() if name in known}
+
+    def latest(self, program_name: str) -> Tuple[int, Optional[int]]:
+        """(Messwert-Nummer, letzter @STATUS oder None)."""
+        with self._cond:
+            seq, status = self._samples.get(program_name, (0, None))
+            return seq, status
+
+    def wait_for(
+        self,
+        program_name: str,
+        after_seq: int,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Wartet auf den ersten Messwert mit einer Nummer > after_seq.
+        Liefert (Messwert-Nummer, @STATUS) oder None bei Timeout bzw. wenn
+        `cancel` gesetzt ist (der Setzende ruft danach wake_waiters() auf).
+        """
+        with self._cond:
+            ok = self._cond.wait_for(
+                lambda: (cancel is not None and cancel.is_set())
+                or self._samples.get(program_name, (0, None))[0] > after_seq,
+                timeout=timeout,
+            )
+            if not ok or (cancel is not None and cancel.is_set()):
+                return None
+            return self._samples[program_name]
+
+    def wake_waiters(self):
+        """Alle wait_for()-Aufrufe ihre Bedingung sofort neu prüfen lassen (z. B. nach Cancel)."""
+        with self._cond:
+            self._cond.notify_all()
+
+    # ---------------------- Polling ----------------------
+
+    def _tracked(self) -> List[Tuple[str, Any]]:
+        return [(name, handle) for name, handle in list(self.controller.task_status_vars.items()) if handle]
+
+    def poll_once(self) -> bool:
+        """Ein Zyklus: jedes bekannte @STATUS einmal lesen und verteilen. True, wenn sich etwas geändert hat."""
+        pool = self.controller.pool
+        tracked = self._tracked()
+        if pool is None or not pool.sessions or not tracked or self.controller.reconnecting:
+            return False
+
+        # @STATUS-Handles gehören zur primären Session; Erfolg/Fehler meldet der Hub unten selbst
+        with pool.acquire(pool.primary, report=False) as session:
+            results = session.bcap.call_many([(_FUNC_VARIABLE_GETVALUE, [handle]) for _, handle in tracked])
+        now = time.monotonic()
+        self.cycles += 1
+        self.last_poll_at = now
+
+        updates = []
+        changed: Dict[str, int] = {}
+        failure: Optional[Exception] = None
+        with self._cond:
+            for (name, _), result in zip(tracked, results):
+                if isinstance(result, Exception):
+                    logging.debug("@STATUS read for '%s' failed: %r", name, result)
+                    failure = result
+                    continue
+                try:
+                    status = int(result[0])
+                except (TypeError, ValueError, IndexError):
+                    continue
+                seq, previous = self._samples.get(name, (0, None))
+                self._samples[name] = (seq + 1, status)
+                last_time = self._sample_times.get(name)
+                self._sample_times[name] = now
+                updates.append((name, status))
+                if status != previous:
+                    changed[name] = status
+                    if previous is not None and last_time is not None:
+                        self._latencies.append(now - last_time)
+            if updates:
+                self._cond.notify_all()
+
+        # Lebenszeichen / Transportfehler für den Circuit Breaker des Controllers
+        if updates:
+            self.controller.note_success()
+        elif failure is not None:
+            self.controller.note_failure(failure)
+
+        for name, status in updates:
+            for callback in list(self._listeners):
+                try:
+                    callback(name, status)
+                except Exception as e:
+                    logging.debug("Task status listener failed: %r", e)
+        if changed:
+            for callback in list(self._change_listeners):
+                try:
+                    callback(changed)
+                except Exception as e:
+                    logging.debug("Task status change listener failed: %r", e)
+        return bool(changed)
+
+    # ---------------------- Erkennungslatenz ----------------------
+
+    def poll_lag(self) -> float:
+        """
+        Verspätung des Pollers [s]: Zeit seit dem letzten Poll-Zyklus abzüglich des
+        erwarteten Intervalls. 0 ohne beobachtete Tasks; wächst, wenn der Read hängt
+        oder während eines Reconnects nicht gepollt wird.
+        """
+        last = self.last_poll_at
+        if last is None or not self._tracked():
+            return 0.0
+        return max(0.0, time.monotonic() - last - self.effective_interval())
+
+    def detection_latency_stats(self) -> Dict[str, float]:
+        """
+        Erkennungslatenz der letzten Statusänderungen in Millisekunden
+        (count, last_ms, p50_ms, p99_ms, max_ms) und das aktuelle Poll-Intervall.
+        Gemessen wird der Abstand zwischen dem Messwert mit der Änderung und dem
+        vorherigen Messwert desselben Tasks (obere Schranke der Latenz).
+        """
+        with self._cond:
+            recorded = list(self._latencies)
+        if not recorded:
+            return {"count": 0, "interval_ms": self.effective_interval() * 1e3}
+        samples = sorted(recorded)
+
+        def _pct(p: float) -> float:
+            return samples[min(len(samples) - 1, int(p * len(samples)))] * 1e3
+
+        return {
+            "count": len(samples),
+            "last_ms": recorded[-1] * 1e3,
+            "p50_ms": _pct(0.50),
+            "p99_ms": _pct(0.99),
+            "max_ms": samples[-1] * 1e3,
+            "interval_ms": self.effective_interval() * 1e3,
+        }
@@ -3,27 +3,49 @@ from .densorc8control_base import DensoRC8ControlBase
 from .densorc8control_client import DensoRC8ControlClient
 from .densorc8control_feature import DensoRC8ControlFeature
 from .densorc8control_types import (
+    BatchOperation,
+    BatchResult,
+    CancelProgram_Responses,
     ClearError_Responses,
     ConfigureConnection_Responses,
+    ExecuteBatch_Responses,
+    GetErrorDetails_Responses,
     GetFValue_Responses,
+    GetFValues_Responses,
     GetIOValue_Responses,
+    GetIOValues_Responses,
     GetIValue_Responses,
+    GetIValues_Responses,
     GetJValue_Responses,
+    GetJValues_Responses,
     GetPosValue_Responses,
     GetPValue_Responses,
+    GetPValues_Responses,
     GetSValue_Responses,
+    GetSValues_Responses,
     GetTaskNames_Responses,
     GetVValue_Responses,
+    GetVValues_Responses,
+    RealVector,
     SetFValue_Responses,
+    SetFValues_Responses,
     SetIOValue_Responses,
+    SetIOValues_Responses,
     SetIValue_Responses,
+    SetIValues_Responses,
     SetJValue_Responses,
+    SetJValues_Responses,
     SetPValue_Responses,
+    SetPValues_Responses,
     SetSValue_Responses,
+    SetStatusPollInterval_Responses,
+    SetSValues_Responses,
     SetVValue_Responses,
+    SetVValues_Responses,
     Start_Responses,
     StartProgram_Responses,
     StopProgram_Responses,
+    TaskStatus,
 )
 
 __all__ = [
@@ -48,7 +70,29 @@ __all__ = [
     "GetJValue_Responses",
     "SetVValue_Responses",
     "GetVValue_Responses",
+    "GetIValues_Responses",
+    "GetFValues_Responses",
+    "GetSValues_Responses",
+    "GetIOValues_Responses",
+    "GetPValues_Responses",
+    "GetJValues_Responses",
+    "GetVValues_Responses",
+    "SetIValues_Responses",
+    "SetFValues_Responses",
+    "SetSValues_Responses",
+    "SetIOValues_Responses",
+    "SetPValues_Responses",
+    "SetJValues_Responses",
+    "SetVValues_Responses",
+    "ExecuteBatch_Responses",
     "GetPosValue_Responses",
     "StopProgram_Responses",
+    "CancelProgram_Responses",
+    "GetErrorDetails_Responses",
+    "SetStatusPollInterval_Responses",
     "StartProgram_Responses",
+    "RealVector",
+    "BatchOperation",
+    "BatchResult",
+    "TaskStatus",
 ]
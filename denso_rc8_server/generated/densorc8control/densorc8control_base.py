@@ -9,27 +9,48 @@ from typing import TYPE_CHECKING, List, Optional, Union
 from sila2.server import FeatureImplementationBase, MetadataDict, ObservableCommandInstance
 
 from .densorc8control_types import (
+    BatchOperation,
+    CancelProgram_Responses,
     ClearError_Responses,
     ConfigureConnection_Responses,
+    ExecuteBatch_Responses,
+    GetErrorDetails_Responses,
     GetFValue_Responses,
+    GetFValues_Responses,
     GetIOValue_Responses,
+    GetIOValues_Responses,
     GetIValue_Responses,
+    GetIValues_Responses,
     GetJValue_Responses,
+    GetJValues_Responses,
     GetPosValue_Responses,
     GetPValue_Responses,
+    GetPValues_Responses,
     GetSValue_Responses,
+    GetSValues_Responses,
     GetTaskNames_Responses,
     GetVValue_Responses,
+    GetVValues_Responses,
+    RealVector,
     SetFValue_Responses,
+    SetFValues_Responses,
     SetIOValue_Responses,
+    SetIOValues_Responses,
     SetIValue_Responses,
+    SetIValues_Responses,
     SetJValue_Responses,
+    SetJValues_Responses,
     SetPValue_Responses,
+    SetPValues_Responses,
     SetSValue_Responses,
+    SetStatusPollInterval_Responses,
+    SetSValues_Responses,
     SetVValue_Responses,
+    SetVValues_Responses,
     Start_Responses,
     StartProgram_Responses,
     StopProgram_Responses,
+    TaskStatus,
 )
 
 if TYPE_CHECKING:
@@ -43,6 +64,9 @@ class DensoRC8ControlBase(FeatureImplementationBase, ABC):
     _STATUS_producer_queue: Queue[Union[int, Exception]]
     _STATUS_current_value: int
 
+    _TaskStatuses_producer_queue: Queue[Union[List[TaskStatus], Exception]]
+    _TaskStatuses_current_value: List[TaskStatus]
+
     StartProgram_default_lifetime_of_execution: Optional[timedelta]
 
     def __init__(self, parent_server: Server):
@@ -53,6 +77,8 @@ class DensoRC8ControlBase(FeatureImplementationBase, ABC):
 
         self._STATUS_producer_queue = Queue()
 
+        self._TaskStatuses_producer_queue = Queue()
+
         self.StartProgram_default_lifetime_of_execution = None
 
     def update_STATUS(self, STATUS: int, queue: Optional[Queue[int]] = None) -> None:
@@ -100,6 +126,55 @@ class DensoRC8ControlBase(FeatureImplementationBase, ABC):
         except AttributeError:
             raise AttributeError("Observable property STATUS has never been set")
 
+    def update_TaskStatuses(
+        self, TaskStatuses: List[TaskStatus], queue: Optional[Queue[List[TaskStatus]]] = None
+    ) -> None:
+        """
+        State of every resolved task (0=NON_EXISTENT, 1=Hold-stopped, 2=Stopped, 3=Running, 4=Step-stopped). A new value is published when at least one task changed.
+
+        This method updates the observable property 'TaskStatuses'.
+
+        :param queue: The queue to send updates to. If None, the default Queue will be used.
+        """
+        if queue is None:
+            queue = self._TaskStatuses_producer_queue
+            self._TaskStatuses_current_value = TaskStatuses
+        queue.put(TaskStatuses)
+
+    def TaskStatuses_on_subscription(self, *, metadata: MetadataDict) -> Optional[Queue[List[TaskStatus]]]:
+        """
+        State of every resolved task (0=NON_EXISTENT, 1=Hold-stopped, 2=Stopped, 3=Running, 4=Step-stopped). A new value is published when at least one task changed.
+
+        This method is called when a client subscribes to the observable property 'TaskStatuses'
+
+        :param metadata: The SiLA Client Metadata attached to the call
+        :return: Optional `Queue` that should be used for updating this property.
+            If None, the default Queue will be used.
+        """
+
+    def abort_TaskStatuses_subscriptions(
+        self, error: Exception, queue: Optional[Queue[List[TaskStatus]]] = None
+    ) -> None:
+        """
+        State of every resolved task (0=NON_EXISTENT, 1=Hold-stopped, 2=Stopped, 3=Running, 4=Step-stopped). A new value is published when at least one task changed.
+
+        This method aborts subscriptions to the observable property 'TaskStatuses'.
+
+        :param error: The Exception to be sent to the subscribing client.
+            If it is no DefinedExecutionError or UndefinedExecutionError, it will be wrapped in an UndefinedExecutionError.
+        :param queue: The queue to abort. If None, the default Queue will be used.
+        """
+        if queue is None:
+            queue = self._TaskStatuses_producer_queue
+        queue.put(error)
+
+    @property
+    def current_TaskStatuses(self) -> List[TaskStatus]:
+        try:
+            return self._TaskStatuses_current_value
+        except AttributeError:
+            raise AttributeError("Observable property TaskStatuses has never been set")
+
     @abstractmethod
     def ConfigureConnection(
         self, IPAddress: str, Port: int, Timeout: int, *, metadata: MetadataDict
@@ -372,6 +447,299 @@ class DensoRC8ControlBase(FeatureImplementationBase, ABC):
 
         """
 
+    @abstractmethod
+    def GetIValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetIValues_Responses:
+        """
+        Read Count consecutive global Integer variables starting at StartIndex in one call.
+
+
+        :param StartIndex: First index of the I variable range
+
+        :param Count: Number of consecutive I variables to read
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Values: Current values of I[StartIndex] .. I[StartIndex + Count - 1]
+
+
+        """
+
+    @abstractmethod
+    def GetFValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetFValues_Responses:
+        """
+        Read Count consecutive global Float variables starting at StartIndex in one call.
+
+
+        :param StartIndex: First index of the F variable range
+
+        :param Count: Number of consecutive F variables to read
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Values: Current values of F[StartIndex] .. F[StartIndex + Count - 1]
+
+
+        """
+
+    @abstractmethod
+    def GetSValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetSValues_Responses:
+        """
+        Read Count consecutive global String variables starting at StartIndex in one call.
+
+
+        :param StartIndex: First index of the S variable range
+
+        :param Count: Number of consecutive S variables to read
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Values: Current values of S[StartIndex] .. S[StartIndex + Count - 1]
+
+
+        """
+
+    @abstractmethod
+    def GetIOValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetIOValues_Responses:
+        """
+        Read Count consecutive IO variables starting at StartIndex in one call.
+
+
+        :param StartIndex: First index of the IO variable range
+
+        :param Count: Number of consecutive IO variables to read
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Values: Current values of IO[StartIndex] .. IO[StartIndex + Count - 1]
+
+
+        """
+
+    @abstractmethod
+    def GetPValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetPValues_Responses:
+        """
+        Read Count consecutive Position variables starting at StartIndex in one call.
+
+
+        :param StartIndex: First index of the P variable range
+
+        :param Count: Number of consecutive P variables to read
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Values: Current values of P[StartIndex] .. P[StartIndex + Count - 1]
+
+
+        """
+
+    @abstractmethod
+    def GetJValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetJValues_Responses:
+        """
+        Read Count consecutive Joint variables starting at StartIndex in one call.
+
+
+        :param StartIndex: First index of the J variable range
+
+        :param Count: Number of consecutive J variables to read
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Values: Current values of J[StartIndex] .. J[StartIndex + Count - 1]
+
+
+        """
+
+    @abstractmethod
+    def GetVValues(self, StartIndex: int, Count: int, *, metadata: MetadataDict) -> GetVValues_Responses:
+        """
+        Read Count consecutive Vector variables starting at StartIndex in one call.
+
+
+        :param StartIndex: First index of the V variable range
+
+        :param Count: Number of consecutive V variables to read
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Values: Current values of V[StartIndex] .. V[StartIndex + Count - 1]
+
+
+        """
+
+    @abstractmethod
+    def SetIValues(self, Indices: List[int], Values: List[int], *, metadata: MetadataDict) -> SetIValues_Responses:
+        """
+        Write several global Integer variables in one call. Failing elements are reported in Errors and do not stop the others.
+
+
+        :param Indices: Indices of the I variables to write
+
+        :param Values: Values to write, same length and order as Indices
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Errors: One entry per index: empty if the write succeeded, otherwise the error message
+
+
+        """
+
+    @abstractmethod
+    def SetFValues(self, Indices: List[int], Values: List[float], *, metadata: MetadataDict) -> SetFValues_Responses:
+        """
+        Write several global Float variables in one call. Failing elements are reported in Errors and do not stop the others.
+
+
+        :param Indices: Indices of the F variables to write
+
+        :param Values: Values to write, same length and order as Indices
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Errors: One entry per index: empty if the write succeeded, otherwise the error message
+
+
+        """
+
+    @abstractmethod
+    def SetSValues(self, Indices: List[int], Values: List[str], *, metadata: MetadataDict) -> SetSValues_Responses:
+        """
+        Write several global String variables in one call. Failing elements are reported in Errors and do not stop the others.
+
+
+        :param Indices: Indices of the S variables to write
+
+        :param Values: Values to write, same length and order as Indices
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Errors: One entry per index: empty if the write succeeded, otherwise the error message
+
+
+        """
+
+    @abstractmethod
+    def SetIOValues(self, Indices: List[int], Values: List[int], *, metadata: MetadataDict) -> SetIOValues_Responses:
+        """
+        Write several IO variables in one call. Failing elements are reported in Errors and do not stop the others.
+
+
+        :param Indices: Indices of the IO variables to write
+
+        :param Values: Values to write, same length and order as Indices
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Errors: One entry per index: empty if the write succeeded, otherwise the error message
+
+
+        """
+
+    @abstractmethod
+    def SetPValues(
+        self, Indices: List[int], Values: List[RealVector], *, metadata: MetadataDict
+    ) -> SetPValues_Responses:
+        """
+        Write several Position variables in one call. Failing elements are reported in Errors and do not stop the others.
+
+
+        :param Indices: Indices of the P variables to write
+
+        :param Values: Values to write, same length and order as Indices
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Errors: One entry per index: empty if the write succeeded, otherwise the error message
+
+
+        """
+
+    @abstractmethod
+    def SetJValues(
+        self, Indices: List[int], Values: List[RealVector], *, metadata: MetadataDict
+    ) -> SetJValues_Responses:
+        """
+        Write several Joint variables in one call. Failing elements are reported in Errors and do not stop the others.
+
+
+        :param Indices: Indices of the J variables to write
+
+        :param Values: Values to write, same length and order as Indices
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Errors: One entry per index: empty if the write succeeded, otherwise the error message
+
+
+        """
+
+    @abstractmethod
+    def SetVValues(
+        self, Indices: List[int], Values: List[RealVector], *, metadata: MetadataDict
+    ) -> SetVValues_Responses:
+        """
+        Write several Vector variables in one call. Failing elements are reported in Errors and do not stop the others.
+
+
+        :param Indices: Indices of the V variables to write
+
+        :param Values: Values to write, same length and order as Indices
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Errors: One entry per index: empty if the write succeeded, otherwise the error message
+
+
+        """
+
+    @abstractmethod
+    def ExecuteBatch(
+        self, Operations: List[BatchOperation], StopOnError: bool, *, metadata: MetadataDict
+    ) -> ExecuteBatch_Responses:
+        """
+        Run an ordered list of operations server-side in one call and return all results together.
+
+
+        :param Operations: Operations in execution order
+
+        :param StopOnError: If true, stop at the first failing operation; otherwise run all operations
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Results: One result per executed operation, in the same order
+
+
+        """
+
     @abstractmethod
     def GetPosValue(self, *, metadata: MetadataDict) -> GetPosValue_Responses:
         """
@@ -401,6 +769,54 @@ class DensoRC8ControlBase(FeatureImplementationBase, ABC):
 
         """
 
+    @abstractmethod
+    def CancelProgram(self, ProgramName: str, *, metadata: MetadataDict) -> CancelProgram_Responses:
+        """
+        Cancel all running StartProgram executions of a program. The monitoring loops wake up immediately and stop the task (default_stop) through the stop lane. Returns after the task was stopped.
+
+
+        :param ProgramName: Name of the program whose StartProgram executions are cancelled (e.g., Pro1)
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - CancelledExecutions: Number of StartProgram executions that were cancelled
+
+            - StopLatency: Time from the cancel request until task_stop returned, in milliseconds (0 if nothing was cancelled)
+
+
+        """
+
+    @abstractmethod
+    def GetErrorDetails(self, ErrorId: int, *, metadata: MetadataDict) -> GetErrorDetails_Responses:
+        """
+        Full description of a failed call, including the RC8 error stack read after the failure. The ErrorId is part of the error message of the failed call. Waits up to about one second for the error stack.
+
+
+        :param ErrorId: Error id from the message of the failed call
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        :return:
+
+            - Details: Error message with HRESULT text and RC8 error stack
+
+
+        """
+
+    @abstractmethod
+    def SetStatusPollInterval(self, Interval: int, *, metadata: MetadataDict) -> SetStatusPollInterval_Responses:
+        """
+        Set the maximum @STATUS poll interval in milliseconds used while StartProgram executions are running (applies to StartProgram calls started afterwards, for all clients). 0 restores the adaptive default (fast after start and status changes, exponential back-off while idle). Values below the fast poll interval of the server are raised to it.
+
+
+        :param Interval: Maximum poll interval in milliseconds, 0 = adaptive
+
+        :param metadata: The SiLA Client Metadata attached to the call
+
+        """
+
     @abstractmethod
     def StartProgram(
         self, ProgramName: str, Mode: str, *, metadata: MetadataDict, instance: ObservableCommandInstance
@@ -13,30 +13,50 @@ if TYPE_CHECKING:
     from typing import Iterable, List, Optional
 
     from densorc8control_types import (
+        CancelProgram_Responses,
         ClearError_Responses,
         ConfigureConnection_Responses,
+        ExecuteBatch_Responses,
+        GetErrorDetails_Responses,
         GetFValue_Responses,
+        GetFValues_Responses,
         GetIOValue_Responses,
+        GetIOValues_Responses,
         GetIValue_Responses,
+        GetIValues_Responses,
         GetJValue_Responses,
+        GetJValues_Responses,
         GetPosValue_Responses,
         GetPValue_Responses,
+        GetPValues_Responses,
         GetSValue_Responses,
+        GetSValues_Responses,
         GetTaskNames_Responses,
         GetVValue_Responses,
+        GetVValues_Responses,
         SetFValue_Responses,
+        SetFValues_Responses,
         SetIOValue_Responses,
+        SetIOValues_Responses,
         SetIValue_Responses,
+        SetIValues_Responses,
         SetJValue_Responses,
+        SetJValues_Responses,
         SetPValue_Responses,
+        SetPValues_Responses,
         SetSValue_Responses,
+        SetStatusPollInterval_Responses,
+        SetSValues_Responses,
         SetVValue_Responses,
+        SetVValues_Responses,
         Start_Responses,
         StartProgram_Responses,
         StopProgram_Responses,
     )
     from sila2.client import ClientMetadataInstance, ClientObservableCommandInstance, ClientObservableProperty
 
+    from .densorc8control_types import BatchOperation, RealVector, TaskStatus
+
 
 class DensoRC8ControlClient:
     """
@@ -48,6 +68,11 @@ class DensoRC8ControlClient:
     State of task execution: 0=NON_EXISTENT, 1=Hold-stopped, 2=Stopped, 3=Running, 4=Step-stopped
     """
 
+    TaskStatuses: ClientObservableProperty[List[TaskStatus]]
+    """
+    State of every resolved task (0=NON_EXISTENT, 1=Hold-stopped, 2=Stopped, 3=Running, 4=Step-stopped). A new value is published when at least one task changed.
+    """
+
     def ConfigureConnection(
         self, IPAddress: str, Port: int, Timeout: int, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
     ) -> ConfigureConnection_Responses:
@@ -188,6 +213,142 @@ class DensoRC8ControlClient:
         """
         ...
 
+    def GetIValues(
+        self, StartIndex: int, Count: int, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> GetIValues_Responses:
+        """
+        Read Count consecutive global Integer variables starting at StartIndex in one call.
+        """
+        ...
+
+    def GetFValues(
+        self, StartIndex: int, Count: int, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> GetFValues_Responses:
+        """
+        Read Count consecutive global Float variables starting at StartIndex in one call.
+        """
+        ...
+
+    def GetSValues(
+        self, StartIndex: int, Count: int, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> GetSValues_Responses:
+        """
+        Read Count consecutive global String variables starting at StartIndex in one call.
+        """
+        ...
+
+    def GetIOValues(
+        self, StartIndex: int, Count: int, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> GetIOValues_Responses:
+        """
+        Read Count consecutive IO variables starting at StartIndex in one call.
+        """
+        ...
+
+    def GetPValues(
+        self, StartIndex: int, Count: int, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> GetPValues_Responses:
+        """
+        Read Count consecutive Position variables starting at StartIndex in one call.
+        """
+        ...
+
+    def GetJValues(
+        self, StartIndex: int, Count: int, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> GetJValues_Responses:
+        """
+        Read Count consecutive Joint variables starting at StartIndex in one call.
+        """
+        ...
+
+    def GetVValues(
+        self, StartIndex: int, Count: int, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> GetVValues_Responses:
+        """
+        Read Count consecutive Vector variables starting at StartIndex in one call.
+        """
+        ...
+
+    def SetIValues(
+        self, Indices: List[int], Values: List[int], *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> SetIValues_Responses:
+        """
+        Write several global Integer variables in one call. Failing elements are reported in Errors and do not stop the others.
+        """
+        ...
+
+    def SetFValues(
+        self, Indices: List[int], Values: List[float], *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> SetFValues_Responses:
+        """
+        Write several global Float variables in one call. Failing elements are reported in Errors and do not stop the others.
+        """
+        ...
+
+    def SetSValues(
+        self, Indices: List[int], Values: List[str], *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> SetSValues_Responses:
+        """
+        Write several global String variables in one call. Failing elements are reported in Errors and do not stop the others.
+        """
+        ...
+
+    def SetIOValues(
+        self, Indices: List[int], Values: List[int], *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> SetIOValues_Responses:
+        """
+        Write several IO variables in one call. Failing elements are reported in Errors and do not stop the others.
+        """
+        ...
+
+    def SetPValues(
+        self,
+        Indices: List[int],
+        Values: List[RealVector],
+        *,
+        metadata: Optional[Iterable[ClientMetadataInstance]] = None,
+    ) -> SetPValues_Responses:
+        """
+        Write several Position variables in one call. Failing elements are reported in Errors and do not stop the others.
+        """
+        ...
+
+    def SetJValues(
+        self,
+        Indices: List[int],
+        Values: List[RealVector],
+        *,
+        metadata: Optional[Iterable[ClientMetadataInstance]] = None,
+    ) -> SetJValues_Responses:
+        """
+        Write several Joint variables in one call. Failing elements are reported in Errors and do not stop the others.
+        """
+        ...
+
+    def SetVValues(
+        self,
+        Indices: List[int],
+        Values: List[RealVector],
+        *,
+        metadata: Optional[Iterable[ClientMetadataInstance]] = None,
+    ) -> SetVValues_Responses:
+        """
+        Write several Vector variables in one call. Failing elements are reported in Errors and do not stop the others.
+        """
+        ...
+
+    def ExecuteBatch(
+        self,
+        Operations: List[BatchOperation],
+        StopOnError: bool,
+        *,
+        metadata: Optional[Iterable[ClientMetadataInstance]] = None,
+    ) -> ExecuteBatch_Responses:
+        """
+        Run an ordered list of operations server-side in one call and return all results together.
+        """
+        ...
+
     def GetPosValue(self, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None) -> GetPosValue_Responses:
         """
         Read the current position from the Robot
@@ -202,6 +363,30 @@ class DensoRC8ControlClient:
         """
         ...
 
+    def CancelProgram(
+        self, ProgramName: str, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> CancelProgram_Responses:
+        """
+        Cancel all running StartProgram executions of a program. The monitoring loops wake up immediately and stop the task (default_stop) through the stop lane. Returns after the task was stopped.
+        """
+        ...
+
+    def GetErrorDetails(
+        self, ErrorId: int, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> GetErrorDetails_Responses:
+        """
+        Full description of a failed call, including the RC8 error stack read after the failure. The ErrorId is part of the error message of the failed call. Waits up to about one second for the error stack.
+        """
+        ...
+
+    def SetStatusPollInterval(
+        self, Interval: int, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
+    ) -> SetStatusPollInterval_Responses:
+        """
+        Set the maximum @STATUS poll interval in milliseconds used while StartProgram executions are running (applies to StartProgram calls started afterwards, for all clients). 0 restores the adaptive default (fast after start and status changes, exponential back-off while idle). Values below the fast poll interval of the server are raised to it.
+        """
+        ...
+
     def StartProgram(
         self, ProgramName: str, Mode: str, *, metadata: Optional[Iterable[ClientMetadataInstance]] = None
     ) -> ClientObservableCommandInstance[StartProgram_Responses]:
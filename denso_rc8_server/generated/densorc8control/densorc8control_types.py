@@ -1,7 +1,7 @@
 # Generated by sila2.code_generator; sila2.__version__: 0.13.0
 from __future__ import annotations
 
-from typing import List, NamedTuple
+from typing import Any, List, NamedTuple
 
 
 class ConfigureConnection_Responses(NamedTuple):
@@ -118,6 +118,126 @@ class GetVValue_Responses(NamedTuple):
     """
 
 
+class GetIValues_Responses(NamedTuple):
+
+    Values: List[int]
+    """
+    Current values of I[StartIndex] .. I[StartIndex + Count - 1]
+    """
+
+
+class GetFValues_Responses(NamedTuple):
+
+    Values: List[float]
+    """
+    Current values of F[StartIndex] .. F[StartIndex + Count - 1]
+    """
+
+
+class GetSValues_Responses(NamedTuple):
+
+    Values: List[str]
+    """
+    Current values of S[StartIndex] .. S[StartIndex + Count - 1]
+    """
+
+
+class GetIOValues_Responses(NamedTuple):
+
+    Values: List[int]
+    """
+    Current values of IO[StartIndex] .. IO[StartIndex + Count - 1]
+    """
+
+
+class GetPValues_Responses(NamedTuple):
+
+    Values: List[RealVector]
+    """
+    Current values of P[StartIndex] .. P[StartIndex + Count - 1]
+    """
+
+
+class GetJValues_Responses(NamedTuple):
+
+    Values: List[RealVector]
+    """
+    Current values of J[StartIndex] .. J[StartIndex + Count - 1]
+    """
+
+
+class GetVValues_Responses(NamedTuple):
+
+    Values: List[RealVector]
+    """
+    Current values of V[StartIndex] .. V[StartIndex + Count - 1]
+    """
+
+
+class SetIValues_Responses(NamedTuple):
+
+    Errors: List[str]
+    """
+    One entry per index: empty if the write succeeded, otherwise the error message
+    """
+
+
+class SetFValues_Responses(NamedTuple):
+
+    Errors: List[str]
+    """
+    One entry per index: empty if the write succeeded, otherwise the error message
+    """
+
+
+class SetSValues_Responses(NamedTuple):
+
+    Errors: List[str]
+    """
+    One entry per index: empty if the write succeeded, otherwise the error message
+    """
+
+
+class SetIOValues_Responses(NamedTuple):
+
+    Errors: List[str]
+    """
+    One entry per index: empty if the write succeeded, otherwise the error message
+    """
+
+
+class SetPValues_Responses(NamedTuple):
+
+    Errors: List[str]
+    """
+    One entry per index: empty if the write succeeded, otherwise the error message
+    """
+
+
+class SetJValues_Responses(NamedTuple):
+
+    Errors: List[str]
+    """
+    One entry per index: empty if the write succeeded, otherwise the error message
+    """
+
+
+class SetVValues_Responses(NamedTuple):
+
+    Errors: List[str]
+    """
+    One entry per index: empty if the write succeeded, otherwise the error message
+    """
+
+
+class ExecuteBatch_Responses(NamedTuple):
+
+    Results: List[BatchResult]
+    """
+    One result per executed operation, in the same order
+    """
+
+
 class GetPosValue_Responses(NamedTuple):
 
     Value: List[float]
@@ -131,9 +251,44 @@ class StopProgram_Responses(NamedTuple):
     pass
 
 
+class CancelProgram_Responses(NamedTuple):
+
+    CancelledExecutions: int
+    """
+    Number of StartProgram executions that were cancelled
+    """
+
+    StopLatency: float
+    """
+    Time from the cancel request until task_stop returned, in milliseconds (0 if nothing was cancelled)
+    """
+
+
+class GetErrorDetails_Responses(NamedTuple):
+
+    Details: str
+    """
+    Error message with HRESULT text and RC8 error stack
+    """
+
+
+class SetStatusPollInterval_Responses(NamedTuple):
+
+    pass
+
+
 class StartProgram_Responses(NamedTuple):
 
     Status: str
     """
     Program execution status: Running, Completed, Error
     """
+
+
+RealVector = Any
+
+BatchOperation = Any
+
+BatchResult = Any
+
+TaskStatus = Any
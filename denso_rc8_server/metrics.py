@@ -0,0 +1,272 @@
+"""
+Prometheus-Metriken des SiLA-Servers (Textformat 0.0.4, ohne zusätzliche Abhängigkeit).
+
+- CommandMetrics zählt jeden SiLA-Aufruf (catch_orin): Anzahl, Fehler, Dauer als Histogramm.
+- render_metrics() setzt daraus, der b-CAP Aufrufstatistik des Controllers
+  (RTT, Wartezeit auf BCAPClient._lock), dem Status-Poller, den laufenden
+  StartProgram-Instanzen und dem Reconnect/Circuit Breaker den Export zusammen.
+- MetricsExporter liefert ihn per HTTP (GET /metrics) oder schreibt ihn
+  periodisch als Datei für den Textfile-Collector des node_exporter.
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .feature_implementations.densorc8control_impl import DensoRC8ControlImpl
+
+logger = logging.getLogger(__name__)
+
+_PREFIX = "denso_rc8"
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class CommandMetrics:
+    """Anzahl, Fehler und Dauer-Histogramm je SiLA-Command/Property (thread-safe)."""
+
+    # Bucket-Grenzen [s]; StartProgram läuft bis zum Programmende
+    BUCKETS: Tuple[float, ...] = (
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Command -> [count, errors, sum_s, Zähler je Bucket (letzter = +Inf)]
+        self._commands: Dict[str, List[Any]] = {}
+
+    def record(self, command: str, seconds: float, failed: bool = False):
+        index = bisect.bisect_left(self.BUCKETS, seconds)
+        with self._lock:
+            entry = self._commands.get(command)
+            if entry is None:
+                entry = self._commands[command] = [0, 0, 0.0, [0] * (len(self.BUCKETS) + 1)]
+            entry[0] += 1
+            if failed:
+                entry[1] += 1
+            entry[2] += seconds
+            entry[3][index] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """{command: {count, errors, sum_s, buckets: kumulierte Zähler je BUCKETS + +Inf}}"""
+        with self._lock:
+            commands = {name: (c, e, s, list(b)) for name, (c, e, s, b) in self._commands.items()}
+        result = {}
+        for name, (count, errors, sum_s, buckets) in sorted(commands.items()):
+            cumulative, total = [], 0
+            for n in buckets:
+                total += n
+                cumulative.append(total)
+            result[name] = {"count": count, "errors": errors, "sum_s": sum_s, "buckets": cumulative}
+        return result
+
+
+class _Writer:
+    """Sammelt Zeilen im Prometheus-Textformat; HELP/TYPE einmal je Metrik."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def header(self, name: str, kind: str, help_text: str):
+        self.lines.append(f"# HELP {_PREFIX}_{name} {help_text}")
+        self.lines.append(f"# TYPE {_PREFIX}_{name} {kind}")
+
+    def sample(self, name: str, value: float, **labels: Any):
+        if labels:
+            text = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+            self.lines.append(f"{_PREFIX}_{name}{{{text}}} {_number(value)}")
+        else:
+            self.lines.append(f"{_PREFIX}_{name} {_number(value)}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _write_commands(w: _Writer, commands: Dict[str, Dict[str, Any]]):
+    w.header("sila_command_duration_seconds", "histogram", "Duration of SiLA command and property calls.")
+    for name, c in commands.items():
+        for bound, count in zip(CommandMetrics.BUCKETS + (float("inf"),), c["buckets"]):
+            w.sample("sila_command_duration_seconds_bucket", count, command=name, le=_number(bound))
+        w.sample("sila_command_duration_seconds_sum", c["sum_s"], command=name)
+        w.sample("sila_command_duration_seconds_count", c["count"], command=name)
+    w.header("sila_command_errors_total", "counter", "SiLA calls that ended with an error.")
+    for name, c in commands.items():
+        w.sample("sila_command_errors_total", c["errors"], command=name)
+
+
+def _write_bcap(w: _Writer, calls: Dict[int, Dict[str, Any]]):
+    rows = sorted(calls.values(), key=lambda r: r["name"])
+    w.header("bcap_calls_total", "counter", "b-CAP calls per function.")
+    for r in rows:
+        w.sample("bcap_calls_total", r["count"], function=r["name"])
+    w.header("bcap_call_errors_total", "counter", "b-CAP calls that failed (error HRESULT, timeout, connection).")
+    for r in rows:
+        w.sample("bcap_call_errors_total", r["errors"], function=r["name"])
+    w.header("bcap_sent_bytes_total", "counter", "b-CAP request bytes per function.")
+    for r in rows:
+        w.sample("bcap_sent_bytes_total", r["bytes_sent"], function=r["name"])
+    w.header("bcap_received_bytes_total", "counter", "b-CAP response bytes per function.")
+    for r in rows:
+        w.sample("bcap_received_bytes_total", r["bytes_received"], function=r["name"])
+    for metric, key, help_text in (
+        ("bcap_call_duration_seconds", "latency_ms", "b-CAP call duration including lock wait and codec."),
+        ("bcap_rtt_seconds", "rtt_ms", "b-CAP round trip: request sent until response received."),
+    ):
+        w.header(metric, "summary", help_text)
+        for r in rows:
+            s = r[key]
+            for quantile in ("0.5", "0.9", "0.99"):
+                pct = s.get(f"p{int(float(quantile) * 100)}_ms", 0.0)
+                w.sample(metric, pct / 1e3, function=r["name"], quantile=quantile)
+            w.sample(f"{metric}_sum", s.get("mean_ms", 0.0) * s["count"] / 1e3, function=r["name"])
+            w.sample(f"{metric}_count", s["count"], function=r["name"])
+    w.header("bcap_lock_wait_seconds_total", "counter", "Time spent waiting for BCAPClient._lock.")
+    for r in rows:
+        w.sample("bcap_lock_wait_seconds_total", r["lock_wait_ms"] / 1e3, function=r["name"])
+    w.header("bcap_codec_seconds_total", "counter", "Time spent encoding requests and decoding responses.")
+    for r in rows:
+        w.sample("bcap_codec_seconds_total", r["encode_ms"] / 1e3, function=r["name"], stage="encode")
+        w.sample("bcap_codec_seconds_total", r["decode_ms"] / 1e3, function=r["name"], stage="decode")
+
+
+def render_metrics(impl: "DensoRC8ControlImpl") -> str:
+    """Alle Metriken des Servers im Prometheus-Textformat."""
+    controller = impl.controller
+    hub = controller.status_hub
+    w = _Writer()
+
+    _write_commands(w, impl.command_metrics.snapshot())
+    _write_bcap(w, controller.call_stats_snapshot())
+
+    w.header("status_poll_lag_seconds", "gauge", "Delay of the @STATUS poller beyond its interval.")
+    w.sample("status_poll_lag_seconds", hub.poll_lag())
+    w.header("status_poll_interval_seconds", "gauge", "Current @STATUS poll interval.")
+    w.sample("status_poll_interval_seconds", hub.effective_interval())
+    w.header("status_poll_cycles_total", "counter", "@STATUS poll cycles.")
+    w.sample("status_poll_cycles_total", hub.cycles)
+    latency = hub.detection_latency_stats()
+    w.header("status_detection_latency_seconds", "gauge", "Upper bound of status change detection latency.")
+    for quantile, key in (("0.5", "p50_ms"), ("0.99", "p99_ms"), ("1", "max_ms")):
+        if key in latency:
+            w.sample("status_detection_latency_seconds", latency[key] / 1e3, quantile=quantile)
+
+    w.header("observable_instances", "gauge", "Running StartProgram executions.")
+    w.sample("observable_instances", impl.active_program_runs())
+
+    reconnect = controller.reconnect_stats()
+    w.header("connected", "gauge", "1 while the b-CAP connection is usable (circuit closed).")
+    w.sample("connected", 0 if reconnect["reconnecting"] else 1)
+    w.header("reconnects_total", "counter", "Successful reconnects to the controller.")
+    w.sample("reconnects_total", reconnect["reconnects"])
+    w.header("reconnect_attempts_total", "counter", "Reconnect attempts to the controller.")
+    w.sample("reconnect_attempts_total", reconnect["attempts"])
+    w.header("circuit_breaker_trips_total", "counter", "Times the circuit breaker opened.")
+    w.sample("circuit_breaker_trips_total", reconnect["trips"])
+    return w.text()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    impl: "DensoRC8ControlImpl"
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        try:
+            body = render_metrics(self.impl).encode("utf-8")
+        except Exception as e:
+            logger.exception("Rendering metrics failed")
+            self.send_error(500, repr(e))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", _CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("metrics: " + format, *args)
+
+
+class MetricsExporter:
+    """
+    Export der Metriken über HTTP (port) und/oder als Datei (textfile, alle `interval` s).
+    start() schaltet die b-CAP Aufrufstatistik des Controllers ein.
+    """
+
+    def __init__(
+        self,
+        impl: "DensoRC8ControlImpl",
+        address: str = "127.0.0.1",
+        port: Optional[int] = None,
+        textfile: Optional[str] = None,
+        interval: float = 15.0,
+    ):
+        self.impl = impl
+        self.address = address
+        self.port = port
+        self.textfile = textfile
+        self.interval = interval
+        self._http: Optional[ThreadingHTTPServer] = None
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+
+    def start(self):
+        self.impl.controller.enable_call_stats()
+        self._stop_event.clear()
+        if self.port is not None:
+            handler = type("_BoundHandler", (_Handler,), {"impl": self.impl})
+            self._http = ThreadingHTTPServer((self.address, self.port), handler)
+            self._http.daemon_threads = True
+            # tatsächlicher Port (bei --metrics-port 0)
+            self.port = self._http.server_address[1]
+            self._spawn(self._http.serve_forever, "MetricsHTTP")
+            logger.info(f"Serving metrics on http://{self.address}:{self.port}/metrics")
+        if self.textfile is not None:
+            self._spawn(self._textfile_loop, "MetricsTextfile")
+            logger.info(f"Writing metrics to '{self.textfile}' every {self.interval:g} s")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+            self._http = None
+        for thread in self._threads:
+            thread.join(timeout=5.0)
+        self._threads = []
+
+    def _spawn(self, target, name: str):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def write_textfile(self):
+        # atomar ersetzen, damit der Collector nie eine halbe Datei liest
+        tmp = f"{self.textfile}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            fp.write(render_metrics(self.impl))
+        os.replace(tmp, self.textfile)
+
+    def _textfile_loop(self):
+        while True:
+            started = time.monotonic()
+            try:
+                self.write_textfile()
+            except Exception as e:
+                logger.warning(f"Writing metrics to '{self.textfile}' failed: {e!r}")
+            if self._stop_event.wait(max(0.0, self.interval - (time.monotonic() - started))):
+                return
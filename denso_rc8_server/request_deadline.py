@@ -0,0 +1,74 @@
+"""
+gRPC-Deadline des laufenden SiLA-Aufrufs für die Feature-Implementierung.
+
+sila2 reicht den grpc.ServicerContext nicht an die Implementierung durch und
+der grpc.Server des SilaServer wird ohne Interceptors erzeugt. DeadlineCapturingServer
+umhüllt deshalb diesen grpc.Server: jeder unäre Handler merkt sich vor dem
+sila2-Handler die Deadline des Clients (context.time_remaining()) im Worker-Thread,
+request_deadline() liefert sie dort wieder.
+"""
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+import grpc
+
+_local = threading.local()
+# ohne Client-Deadline meldet gRPC eine "unendliche" Restzeit
+_NO_DEADLINE_S = 365 * 24 * 3600.0
+
+
+def request_deadline() -> Optional[float]:
+    """Deadline (time.monotonic()) des SiLA-Aufrufs dieses Threads; None = keine Deadline."""
+    return getattr(_local, "deadline", None)
+
+
+def _capture(behavior: Callable[[Any, grpc.ServicerContext], Any]) -> Callable[[Any, grpc.ServicerContext], Any]:
+    @wraps(behavior)
+    def wrapper(request, context: grpc.ServicerContext):
+        remaining = context.time_remaining()
+        outer = getattr(_local, "deadline", None)
+        if remaining is None or remaining >= _NO_DEADLINE_S:
+            _local.deadline = None
+        else:
+            _local.deadline = time.monotonic() + remaining
+        try:
+            return behavior(request, context)
+        finally:
+            _local.deadline = outer
+
+    return wrapper
+
+
+def _wrap_handler(handler: Optional[grpc.RpcMethodHandler]) -> Optional[grpc.RpcMethodHandler]:
+    # nur unär: Streams (Subscriptions, Observable-Command-Infos) laufen nicht im Aufrufer-Thread zu Ende
+    if handler is None or getattr(handler, "unary_unary", None) is None:
+        return handler
+    return handler._replace(unary_unary=_capture(handler.unary_unary))
+
+
+class _DeadlineGenericHandler(grpc.GenericRpcHandler):
+    def __init__(self, inner: grpc.GenericRpcHandler):
+        self._inner = inner
+
+    def service(self, handler_call_details):
+        return _wrap_handler(self._inner.service(handler_call_details))
+
+
+class DeadlineCapturingServer:
+    """Proxy für grpc.Server; alles außer dem Registrieren von Handlern wird durchgereicht."""
+
+    def __init__(self, server: grpc.Server):
+        self._server = server
+
+    def add_generic_rpc_handlers(self, generic_rpc_handlers):
+        self._server.add_generic_rpc_handlers(tuple(_DeadlineGenericHandler(h) for h in generic_rpc_handlers))
+
+    def add_registered_method_handlers(self, service_name: str, method_handlers: Dict[str, Any]):
+        self._server.add_registered_method_handlers(
+            service_name, {name: _wrap_handler(handler) for name, handler in method_handlers.items()}
+        )
+
+    def __getattr__(self, name: str):
+        return getattr(self._server, name)
@@ -6,6 +6,7 @@ from uuid import UUID
 from sila2.server import SilaServer
 
 from .feature_implementations.densorc8control_impl import DensoRC8ControlImpl
+from .request_deadline import DeadlineCapturingServer
 from .generated.densorc8control import DensoRC8ControlFeature
 
 
@@ -15,6 +16,7 @@ class Server(SilaServer):
         server_uuid: Optional[UUID] = None,
         name: Optional[str] = None,
         description: Optional[str] = None,
+        bcap_sessions: int = 1,
     ):
         # Defaults gemäß vorherigem Setup
         if name is None:
@@ -34,6 +36,9 @@ class Server(SilaServer):
             server_uuid=server_uuid,
         )
 
+        # Client-Deadline pro Aufruf mitschreiben (request_deadline() in der Implementierung)
+        self.grpc_server = DeadlineCapturingServer(self.grpc_server)
+
         # Feature registrieren
-        self.densorc8control = DensoRC8ControlImpl(self)
+        self.densorc8control = DensoRC8ControlImpl(self, bcap_sessions=bcap_sessions)
         self.set_feature_implementation(DensoRC8ControlFeature, self.densorc8control)
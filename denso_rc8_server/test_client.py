@@ -105,6 +105,7 @@ def main():
     ap.add_argument("--cmd-timeout", type=float, default=300.0)
     ap.add_argument("--alt-interval", type=float, default=0.2)
     ap.add_argument("--status-timeout", type=float, default=3.0)
+    ap.add_argument("--poll-interval", type=int, default=0, help="SetStatusPollInterval [ms], 0 = adaptive")
     args = ap.parse_args()
 
     # --- TLS / insecure ---
@@ -137,6 +138,10 @@ def main():
         t_status = threading.Thread(target=subscribe_global_status, args=(client, stop_evt, latest), daemon=False)
         t_status.start()
 
+        if args.poll_interval > 0:
+            print(f"⏲️  SetStatusPollInterval({args.poll_interval} ms) …")
+            client.DensoRC8Control.SetStatusPollInterval(Interval=args.poll_interval)
+
         print(f"🎬 StartProgram A: '{progA}', mode='{args.mode}' …")
         instA = client.DensoRC8Control.StartProgram(ProgramName=progA, Mode=args.mode)
 